@@ -5,46 +5,64 @@ from rich.console import Console
 
 from core.interfaces import StorageInterface, RAGInterface, AIInterface
 from core.errors import StorageError, RAGError, AIError
-from core.integrations.memory_injector import Vessels, Router, Formatter
+from core.integrations.memory_injector import MemoryRegistry
+from utils.spans import SPANS
 
 console = Console()
 
 class ConversationAdapter:
     """Orchestrates conversation flow with error handling"""
 
-    def __init__(self, storage: StorageInterface, rag: RAGInterface, ai: AIInterface):
+    def __init__(self, storage: StorageInterface, rag: RAGInterface, ai: AIInterface,
+                 memory: MemoryRegistry = None, extractor=None):
         self.storage = storage
         self.rag = rag
         self.ai = ai
-        self.vessels = Vessels()
-        self.router = Router(self.vessels)
-        self.formatter = Formatter()
+        self.memory = memory or MemoryRegistry()
+        self.extractor = extractor  # FactExtractor fed with every saved LLM turn, paused during turns
 
     def chat(self, user_input: str) -> Dict[str, Any]:
         """Handle complete chat interaction"""
+        if self.extractor is None:
+            yield from self._chat(user_input)
+            return
+
+        # Background extraction shares the model - keep it off while a turn runs
+        self.extractor.pause()
+        try:
+            yield from self._chat(user_input)
+        finally:
+            self.extractor.resume()
+
+    def _chat(self, user_input: str) -> Dict[str, Any]:
         start_time = time.time()
 
         # ROUTER: Check if this is a simple fact question
-        fact_key, fact_data = self.router.route(user_input)
+        with SPANS.span('route'):
+            fact_key, fact_data = self.memory.route(user_input)
         
         if fact_key and fact_data:
             # Direct fact retrieval - bypass AI entirely
-            response = self.formatter.format_response(fact_key, fact_data)
+            response = self.memory.format_response(fact_key, fact_data)
             elapsed = time.time() - start_time
+            SPANS.record('turn.fact', elapsed)
             
             try:
-                self.storage.save_turn(user_input, response, {'elapsed': elapsed})
+                with SPANS.span('storage.save_turn'):
+                    self.storage.save_turn(user_input, response, {'elapsed': elapsed})
             except StorageError as e:
                 print(f"\n⚠️  Storage failed: {e}")
             
             console.print(response)
             yield ""
-            yield f"\n\n⏱️  {elapsed:.2f}s\n"
+            tier = self.memory.last_route.get('tier')
+            yield f"\n\n⏱️  {elapsed:.2f}s" + (f" | {tier} route" if tier else "") + "\n"
             return
 
         # Complex question - use AI with RAG
         try:
-            context = self.rag.retrieve(user_input, self.storage, limit=6)
+            with SPANS.span('rag.retrieve'):
+                context = self.rag.retrieve(user_input, self.storage, limit=6)
         except RAGError as e:
             print(f"⚠️  RAG failed, using simple retrieval: {e}")
             context = self.storage.get_recent(5)
@@ -52,26 +70,82 @@ class ConversationAdapter:
             print(f"⚠️  Retrieval error: {e}")
             context = []
 
+        response_chunks = []
+        generation_start = time.time()
+        first_token_at = None
+        finished = False
         try:
-            response_chunks = []
             for chunk in self.ai.generate(user_input, context):
+                if first_token_at is None and chunk:
+                    first_token_at = time.time()
                 response_chunks.append(chunk)
                 yield chunk
 
+            finished = True
             response = ''.join(response_chunks)
-            elapsed = time.time() - start_time
+            metadata = self._generation_metrics(response, start_time, generation_start, first_token_at)
+            if first_token_at is not None:
+                SPANS.record('llm.first_token', first_token_at - generation_start)
+            SPANS.record('llm.complete', time.time() - generation_start)
 
             try:
-                self.storage.save_turn(user_input, response, {'elapsed': elapsed})
+                with SPANS.span('storage.save_turn'):
+                    self.storage.save_turn(user_input, response, metadata)
             except StorageError as e:
                 print(f"\n⚠️  Storage failed: {e}")
+            SPANS.record('turn.llm', time.time() - start_time)
+            if self.extractor is not None:
+                self.extractor.submit(user_input, response)
 
-            yield f"\n\n⏱️  {elapsed:.2f}s\n"
+            stats = getattr(self.ai, 'last_stats', None) or {}
+            if stats.get('cache_hit'):
+                timing = f"⏱️  {metadata['elapsed']:.2f}s | ⚡ cached answer"
+            else:
+                timing = (
+                    f"⏱️  {metadata['elapsed']:.2f}s | TTFT {metadata['ttft']:.2f}s"
+                    f" | {metadata['tokens_per_sec']:.1f} tok/s"
+                )
+            prefill = stats.get('prompt_eval_duration')
+            if prefill:
+                timing += f" | prefill {prefill:.2f}s"
+            if (getattr(self.rag, 'last_timings', None) or {}).get('semantic_timed_out'):
+                timing += " | recent-only (search timed out)"
+            yield f"\n\n{timing}\n"
 
         except AIError as e:
             yield f"\n❌ AI Error: {e}\n"
         except Exception as e:
             yield f"\n❌ Unexpected error: {e}\n"
+        finally:
+            # Ctrl-C / abandoned stream: keep whatever was generated so far
+            if not finished and response_chunks:
+                response = ''.join(response_chunks)
+                metadata = self._generation_metrics(response, start_time, generation_start, first_token_at)
+                try:
+                    self.storage.save_turn(user_input, response, metadata)
+                except StorageError as e:
+                    print(f"\n⚠️  Storage failed: {e}")
+
+    def _generation_metrics(self, response: str, start_time: float,
+                            generation_start: float, first_token_at) -> Dict[str, Any]:
+        """Per-turn timing fields stored alongside the turn"""
+        now = time.time()
+        stats = getattr(self.ai, 'last_stats', None) or {}
+        if stats.get('cache_hit'):
+            # Nothing was generated - keep cache hits out of the generation percentiles
+            return {'elapsed': now - start_time, 'ttft': 0.0, 'generation_time': 0.0,
+                    'tokens': 0, 'tokens_per_sec': 0.0}
+
+        generation_time = now - generation_start
+        # Prefer the engine's own token count; ~4 chars/token otherwise
+        tokens = stats.get('eval_count') or max(1, len(response) // 4)
+        return {
+            'elapsed': now - start_time,
+            'ttft': (first_token_at or now) - start_time,
+            'generation_time': generation_time,
+            'tokens': tokens,
+            'tokens_per_sec': tokens / generation_time if generation_time > 0 else 0.0
+        }
 
     def search_history(self, query: str, limit: int = 5) -> list:
         """Search conversation history"""
@@ -81,6 +155,31 @@ class ConversationAdapter:
             print(f"⚠️  Search failed: {e}")
             return []
 
+    def get_perf_stats(self, all_history: bool = False) -> list:
+        """p50/p95/p99 of per-turn timings"""
+        try:
+            from utils.perf_stats import summarize
+            return summarize(self.storage.get_perf_metrics(all_history))
+        except Exception as e:
+            print(f"⚠️  Perf stats failed: {e}")
+            return []
+
+    def get_span_stats(self) -> list:
+        """Per-stage latency histograms collected this session"""
+        return SPANS.summary()
+
+    def get_staged_facts(self) -> dict:
+        """Extracted facts waiting for review (KEY -> value)"""
+        return self.memory.staged_facts()
+
+    def accept_fact(self, key: str):
+        """Promote a staged fact into memory.txt; its value, or None if KEY isn't staged"""
+        try:
+            return self.memory.accept_fact(key)
+        except OSError as e:
+            print(f"⚠️  Accepting fact failed: {e}")
+            return None
+
     def get_recent_turns(self, limit: int = 10) -> list:
         """Get recent conversation history"""
         try:
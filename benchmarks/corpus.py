@@ -0,0 +1,136 @@
+"""Synthetic conversation corpora + storage seeding shared by the benchmarks"""
+import os
+import json
+import random
+import uuid
+import zlib
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional
+
+import numpy as np
+
+WORDS = (
+    "memory vector storage gpu project winter lance embedding model ollama query "
+    "conversation history search turn summary python terminal file code test "
+    "fast slow cache index disk latency recall weather music coffee travel rust "
+    "garden snow bike camera book movie dinner friend work deadline budget plan"
+).split()
+
+class StubEmbedder:
+    """Deterministic hashed bag-of-words vectors - shares words, shares direction
+
+    Stands in for the SentenceTransformer (same encode() contract) so
+    storage can be benchmarked without torch or model weights.
+    """
+
+    def __init__(self, dims: int = 1024):
+        self.dims = dims
+
+    def _one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dims, dtype=np.float32)
+        for word in text.lower().split():
+            h = zlib.crc32(word.encode('utf-8'))
+            vector[h % self.dims] += 1.0 if h & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            return self._one(texts)
+        return np.stack([self._one(t) for t in texts]) if texts else np.zeros((0, self.dims), np.float32)
+
+def sentence(rnd: random.Random, words: int) -> str:
+    return " ".join(rnd.choices(WORDS, k=max(1, words)))
+
+def make_turns(conversations: int, turns_per_conversation: int, user_words: int = 12,
+               assistant_words: int = 60, seed: int = 0, start: float = 1.7e9) -> Iterator[Dict[str, Any]]:
+    """Turns in the storage row format, oldest conversation first"""
+    from core.context_packer import count_turn_tokens
+
+    rnd = random.Random(seed)
+    timestamp = start
+    for c in range(conversations):
+        conversation_id = str(uuid.UUID(int=rnd.getrandbits(128)))
+        title = None
+        for n in range(turns_per_conversation):
+            user = sentence(rnd, rnd.randint(user_words // 2, user_words * 3 // 2))
+            assistant = sentence(rnd, rnd.randint(assistant_words // 2, assistant_words * 3 // 2))
+            title = title or user[:50]
+            timestamp += rnd.uniform(5, 120)
+            yield {
+                "conversation_id": conversation_id,
+                "title": title,
+                "timestamp": timestamp,
+                "datetime": datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %I:%M %p PT"),
+                "session": int(start) + c,
+                "project": "default",
+                "turn_number": n,
+                "user": user,
+                "assistant": assistant,
+                "elapsed": 0.0,
+                "ttft": 0.0,
+                "generation_time": 0.0,
+                "tokens": 0,
+                "tokens_per_sec": 0.0,
+                "context_tokens": count_turn_tokens(user, assistant),
+            }
+
+def seed_lancedb(config, turns: Iterator[Dict[str, Any]], embedder, batch_rows: int = 10000) -> int:
+    """Bulk-load turns into the active LanceDB table (bypassing save_turn)"""
+    import lancedb
+    import pyarrow as pa
+    from storage.lancedb_storage import turn_schema
+    from storage.migration import read_active_table
+    from storage.vector_profile import VectorProfile
+
+    profile = VectorProfile.from_config(config)
+    schema = turn_schema(profile)
+    scalar = pa.schema([f for f in schema if f.name != 'vector'])
+
+    os.makedirs(config.storage_path, exist_ok=True)
+    db = lancedb.connect(config.storage_path)
+    table = db.create_table(read_active_table(config.storage_path)['table'], schema=schema)
+
+    total = 0
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        texts = [f"user: {t['user']} | assistant: {t['assistant']}" for t in batch]
+        vectors = profile.apply(embedder.encode(texts))
+        table.add(pa.Table.from_pylist(batch, schema=scalar).append_column(schema.field('vector'), profile.to_arrow(vectors)))
+
+    for turn in turns:
+        batch.append(turn)
+        if len(batch) >= batch_rows:
+            flush()
+            total += len(batch)
+            batch = []
+    if batch:
+        flush()
+        total += len(batch)
+    return total
+
+def seed_jsonl(config, turns: Iterator[Dict[str, Any]]) -> int:
+    """Write turns straight to the JSONL fallback file (the offset index builds on open)"""
+    os.makedirs(config.conv_history_path, exist_ok=True)
+    total = 0
+    with open(os.path.join(config.conv_history_path, "all_conversations.jsonl"), 'w') as f:
+        for turn in turns:
+            f.write(json.dumps(turn) + '\n')
+            total += 1
+    return total
+
+def open_storage(backend: str, config, embedder=None):
+    """LanceDBStorage (with `embedder` if given) or JSONLStorage"""
+    if backend == 'lancedb':
+        from storage.lancedb_storage import LanceDBStorage
+        return LanceDBStorage(config, model_loader=(lambda: embedder) if embedder is not None else None)
+    from storage.fallback_storage import JSONLStorage
+    return JSONLStorage(config)
+
+def make_embedder(kind: str, config) -> Optional[object]:
+    """'stub' -> StubEmbedder, 'real' -> config.embedding_model"""
+    if kind == 'stub':
+        return StubEmbedder(config.vector_dims)
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(config.embedding_model, local_files_only=True)
@@ -0,0 +1,170 @@
+"""End-to-end turn latency - real storage/RAG/engine/adapter against the mock Ollama server
+
+Seeds a synthetic history of each size into a temp directory, opens it
+the way main.py does, and drives a scripted conversation through
+ConversationAdapter over HTTP to benchmarks/mock_ollama.py. No GPU,
+model weights or running Ollama needed.
+
+    python -m benchmarks.e2e
+    python -m benchmarks.e2e --sizes 1000 10000 --backends lancedb --out e2e.json
+"""
+import argparse
+import contextlib
+import json
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+from benchmarks.corpus import StubEmbedder, make_turns, seed_lancedb, seed_jsonl, open_storage
+from benchmarks.mock_ollama import MockOllama, MockOllamaServer, connect
+from core.config import Config
+from utils.spans import SPANS
+
+FACT_QUESTIONS = ["what gpu do I have?", "what's my name?", "where do I live?"]
+
+def script(turns: int) -> List[str]:
+    """Every 5th turn is a fact question (router path), the rest go to the LLM"""
+    out = []
+    for i in range(turns):
+        if i % 5 == 4:
+            out.append(FACT_QUESTIONS[(i // 5) % len(FACT_QUESTIONS)])
+        else:
+            out.append(f"tell me more about the lance cache and disk latency, part {i}")
+    return out
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {'count': 0, 'p50': 0.0, 'p95': 0.0}
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'p50': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+    }
+
+def run(backend: str, size: int, args) -> Dict[str, Any]:
+    from core.ai_engine import OllamaAI
+    from core.integrations.memory_injector import MemoryRegistry
+    from retrieval.hybrid_rag import HybridRAG
+    from adapters.conversation_adapter import ConversationAdapter
+
+    with tempfile.TemporaryDirectory(prefix="winter-e2e-") as tmp:
+        config = Config(storage_path=f"{tmp}/storage", conv_history_path=f"{tmp}/conversations",
+                        vector_dims=args.dims, fact_extraction=False)
+        embedder = StubEmbedder(args.dims)
+        conversations = max(1, size // args.turns_per_conversation)
+        turns = make_turns(conversations, args.turns_per_conversation, seed=args.seed)
+
+        start = time.perf_counter()
+        if backend == 'lancedb':
+            seed_lancedb(config, turns, embedder)
+        else:
+            seed_jsonl(config, turns)
+        seed_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        storage = open_storage(backend, config, embedder)
+        open_seconds = time.perf_counter() - start
+
+        # Continue the most recent conversation, like picking it in the selector
+        latest = storage.list_all_conversations()[0]
+        start = time.perf_counter()
+        storage.load_conversation(latest['conversation_id'])
+        load_seconds = time.perf_counter() - start
+
+        memory = MemoryRegistry()
+        if config.semantic_routing and getattr(storage, 'embedder', None) is not None:
+            memory.enable_semantic(storage.embedder.encode, config.semantic_route_threshold,
+                                   config.semantic_route_margin)
+        adapter = ConversationAdapter(storage, HybridRAG(config), OllamaAI(config, memory=memory), memory=memory)
+
+        SPANS.reset()
+        turn_ms, ttft_ms, prefill_ms, fact_ms = [], [], [], []
+        for text in script(args.turns):
+            is_fact = memory.route(text)[0] is not None
+            start = time.perf_counter()
+            first = None
+            for chunk in adapter.chat(text):
+                if first is None and chunk:
+                    first = time.perf_counter()
+            elapsed = (time.perf_counter() - start) * 1000
+            if is_fact:
+                fact_ms.append(elapsed)
+            else:
+                turn_ms.append(elapsed)
+                if first is not None:
+                    ttft_ms.append((first - start) * 1000)
+                prefill_ms.append((adapter.ai.last_stats.get('prompt_eval_duration') or 0.0) * 1000)
+
+        start = time.perf_counter()
+        storage.flush()
+        flush_seconds = time.perf_counter() - start
+        storage.close()
+        adapter.rag.pool.shutdown(wait=False)
+        spans = {s['span']: {k: round(v * 1000, 3) if k != 'count' else v for k, v in s.items() if k != 'span'}
+                 for s in SPANS.summary()}
+
+    return {
+        'backend': backend,
+        'history_turns': conversations * args.turns_per_conversation,
+        'seed_seconds': seed_seconds,
+        'open_seconds': open_seconds,
+        'load_seconds': load_seconds,
+        'flush_seconds': flush_seconds,
+        'turn_ms': percentiles(turn_ms),
+        'ttft_ms': percentiles(ttft_ms),
+        'prefill_ms': percentiles(prefill_ms),
+        'fact_turn_ms': percentiles(fact_ms),
+        'spans_ms': spans,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end turn latency against a mock Ollama server")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="history turns")
+    parser.add_argument('--backends', nargs='+', default=['lancedb', 'jsonl'], choices=['lancedb', 'jsonl'])
+    parser.add_argument('--turns', type=int, default=30, help="scripted turns per run")
+    parser.add_argument('--turns-per-conversation', type=int, default=50)
+    parser.add_argument('--dims', type=int, default=1024, help="stub embedding dimensions")
+    parser.add_argument('--prefill-delay', type=float, default=0.0005)
+    parser.add_argument('--token-delay', type=float, default=0.02)
+    parser.add_argument('--reply-tokens', type=int, default=40)
+    parser.add_argument('--chunk-tokens', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="also write the JSON report here")
+    args = parser.parse_args()
+
+    mock = MockOllama(args.prefill_delay, args.token_delay, args.reply_tokens, chunk_tokens=args.chunk_tokens)
+    server = MockOllamaServer(mock).start()
+    connect(server.url)
+
+    results = []
+    try:
+        for backend in args.backends:
+            for size in args.sizes:
+                print(f"▶ {backend} @ {size:,} turns", file=sys.stderr)
+                # The app prints status/answers as it goes; keep stdout for the report
+                with contextlib.redirect_stdout(sys.stderr):
+                    results.append(run(backend, size, args))
+    finally:
+        server.stop()
+
+    report = {
+        'mock': {
+            'prefill_delay': args.prefill_delay,
+            'token_delay': args.token_delay,
+            'reply_tokens': args.reply_tokens,
+            'chunk_tokens': args.chunk_tokens,
+        },
+        'turns': args.turns,
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Mock Ollama - deterministic stand-in with a prefix-reusing KV cache model
+
+Timing model (per request):
+    prefill = uncached prompt tokens * prefill_delay
+    decode  = generated tokens * token_delay
+
+Like Ollama, the cache holds the previous request's prompt plus its
+generated reply; a new request only pays prefill for the tokens after
+the longest common prefix.
+
+In-process (patches the ollama module) or as a local HTTP server that
+speaks /api/chat, /api/generate and /api/tags:
+
+    python -m benchmarks.mock_ollama --port 11435 --token-delay 0.02
+    OLLAMA_HOST=http://127.0.0.1:11435 python main.py
+"""
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Any, Iterator, Optional
+
+CHARS_PER_TOKEN = 4
+
+def render(messages: List[Dict[str, str]]) -> str:
+    """Flatten messages the way a chat template would (stable, role-tagged)"""
+    return "".join(f"<|{m['role']}|>\n{m['content']}<|end|>\n" for m in messages) + "<|assistant|>\n"
+
+def common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+class MockOllama:
+    """Speaks the ollama.chat() / ollama.list() subset used by core/llm_ollama.py"""
+
+    def __init__(self, prefill_delay: float = 0.0005, token_delay: float = 0.02,
+                 reply_tokens: int = 40, sleep: bool = True, chunk_tokens: int = 1):
+        self.prefill_delay = prefill_delay
+        self.token_delay = token_delay
+        self.reply_tokens = reply_tokens
+        self.sleep = sleep  # False = report simulated durations without waiting
+        self.chunk_tokens = max(1, chunk_tokens)  # tokens per streamed message
+        self.cached = ""
+        self.requests = []
+        self._lock = threading.Lock()  # one model, one KV cache: requests run one at a time, like Ollama
+
+    def list(self) -> Dict[str, Any]:
+        return {'models': [{'model': 'mock'}]}
+
+    def _wait(self, seconds: float):
+        if self.sleep and seconds > 0:
+            time.sleep(seconds)
+
+    def reply_for(self, messages: List[Dict[str, str]]) -> List[str]:
+        """Deterministic reply: echo words of the last user message"""
+        words = (messages[-1]['content'].split() or ["ok"]) if messages else ["ok"]
+        return [f" {words[i % len(words)]}" for i in range(self.reply_tokens)]
+
+    def chat(self, model: str = '', messages: Optional[List[Dict[str, str]]] = None,
+             options: Optional[Dict[str, Any]] = None, stream: bool = False,
+             keep_alive=None, **kwargs):
+        messages = list(messages or [])
+        prompt = render(messages)
+        reused = common_prefix(prompt, self.cached)
+        prompt_tokens = max(1, len(prompt) // CHARS_PER_TOKEN)
+        prefill_tokens = max(1, (len(prompt) - reused) // CHARS_PER_TOKEN)
+        prefill = prefill_tokens * self.prefill_delay
+
+        reply = self.reply_for(messages)
+        max_tokens = (options or {}).get('num_predict')
+        if max_tokens:
+            reply = reply[:max_tokens]
+
+        self.requests.append({
+            'prompt_tokens': prompt_tokens,
+            'prefill_tokens': prefill_tokens,
+            'reused_tokens': reused // CHARS_PER_TOKEN,
+            'prefill_seconds': prefill,
+        })
+
+        def final(content: str) -> Dict[str, Any]:
+            return {
+                'model': model,
+                'message': {'role': 'assistant', 'content': content},
+                'done': True,
+                'prompt_eval_count': prefill_tokens,
+                'prompt_eval_duration': int(prefill * 1e9),
+                'eval_count': len(reply),
+                'eval_duration': int(len(reply) * self.token_delay * 1e9),
+                'load_duration': 0,
+            }
+
+        def parts() -> Iterator[Dict[str, Any]]:
+            with self._lock:
+                self._wait(prefill)
+                for start in range(0, len(reply), self.chunk_tokens):
+                    chunk = reply[start:start + self.chunk_tokens]
+                    self._wait(self.token_delay * len(chunk))
+                    yield {'model': model, 'message': {'role': 'assistant', 'content': "".join(chunk)}, 'done': False}
+                self.cached = prompt + "".join(reply)
+            yield final('')
+
+        if stream:
+            return parts()
+
+        for _ in parts():
+            pass
+        return final("".join(reply))
+
+    def generate(self, model: str = '', prompt: str = '', options: Optional[Dict[str, Any]] = None,
+                 stream: bool = False, keep_alive=None, **kwargs):
+        """/api/generate - an empty prompt just "loads" the model (warm-up)"""
+        if not prompt:
+            return {'model': model, 'response': '', 'done': True, 'done_reason': 'load'}
+        result = self.chat(model=model, messages=[{'role': 'user', 'content': prompt}],
+                           options=options, stream=False, keep_alive=keep_alive)
+        result = dict(result)
+        result['response'] = result.pop('message')['content']
+        return result
+
+def install(mock: MockOllama) -> None:
+    """Route the ollama module's chat/list through the mock (in-process)"""
+    import ollama
+    ollama.chat = mock.chat
+    ollama.list = mock.list
+    ollama.generate = mock.generate
+
+def connect(host: str) -> None:
+    """Point the ollama module's chat/list/generate at `host` (e.g. a MockOllamaServer)"""
+    import ollama
+    client = ollama.Client(host=host)
+    ollama.chat = client.chat
+    ollama.list = client.list
+    ollama.generate = client.generate
+
+def _stamp(part: Dict[str, Any]) -> Dict[str, Any]:
+    return {'created_at': datetime.now(timezone.utc).isoformat(), **part}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # else small token writes get batched ~40ms by delayed ACKs
+    mock: MockOllama = None
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, body: Dict[str, Any], status: int = 200) -> None:
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, parts) -> None:
+        """NDJSON over chunked transfer encoding, flushed per part"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for part in parts:
+                line = (json.dumps(_stamp(part)) + '\n').encode('utf-8')
+                self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            parts.close()  # Client closed the stream (cancelled) - stop "generating"
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/api/tags':
+            self._json(self.mock.list())
+        else:
+            self._json({'error': f'not found: {self.path}'}, 404)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+        stream = body.pop('stream', True)  # Ollama streams unless told not to
+        path = self.path.rstrip('/')
+
+        if path == '/api/chat':
+            result = self.mock.chat(stream=stream, **body)
+        elif path == '/api/generate':
+            result = self.mock.generate(**body)
+            stream = False
+        else:
+            self._json({'error': f'not found: {self.path}'}, 404)
+            return
+
+        if stream:
+            self._stream(result)
+        else:
+            self._json(_stamp(result))
+
+class MockOllamaServer:
+    """MockOllama behind a local HTTP server (threaded, one daemon thread)"""
+
+    def __init__(self, mock: MockOllama, host: str = "127.0.0.1", port: int = 0):
+        handler = type('Handler', (_Handler,), {'mock': mock})
+        self.mock = mock
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="mock-ollama")
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockOllamaServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock Ollama API (chat/generate/tags)")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=11435)
+    parser.add_argument('--prefill-delay', type=float, default=0.0005, help="seconds per uncached prompt token")
+    parser.add_argument('--token-delay', type=float, default=0.02, help="seconds per generated token")
+    parser.add_argument('--reply-tokens', type=int, default=40)
+    parser.add_argument('--chunk-tokens', type=int, default=1, help="tokens per streamed message")
+    args = parser.parse_args()
+
+    mock = MockOllama(args.prefill_delay, args.token_delay, args.reply_tokens, chunk_tokens=args.chunk_tokens)
+    server = MockOllamaServer(mock, args.host, args.port)
+    print(f"🧪 Mock Ollama on {server.url} (Ctrl-C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Router micro-benchmark - routes/sec as the number of routable vessels grows
+
+    python -m benchmarks.router
+    python -m benchmarks.router --keys 10 100 1000 5000 --json
+"""
+import argparse
+import json
+import random
+import re
+import time
+from typing import Dict, Any, List
+
+from core.integrations.memory_injector.router import Router, is_question
+
+class SyntheticVessels:
+    """Vessels/system facts stand-in with `count` keys and 3 patterns each"""
+
+    def __init__(self, count: int):
+        self.patterns = {
+            f"FACT_{i}": [rf"\bthing{i}\b", rf"what.*widget{i}", rf"my gadget{i}"]
+            for i in range(count)
+        }
+        keys = list(self.patterns)
+        self.vessels = {k: {'value': k, 'number': str(i), 'type': 'vessel'} for i, k in enumerate(keys[::2])}
+        self.system_facts = {k: {'value': k, 'number': str(i), 'type': 'system'} for i, k in enumerate(keys[1::2])}
+
+def legacy_route(router: Router, user_input: str):
+    """The previous per-key, per-pattern re.search loop (reference)"""
+    if not is_question(user_input):
+        return None, None
+    user_lower = user_input.lower()
+    for facts in (router.vessels, router.system_facts):
+        for key, patterns in router.patterns.items():
+            if key in facts:
+                for pattern in patterns:
+                    if re.search(pattern, user_lower):
+                        return key, facts[key]
+    return None, None
+
+def queries(count: int, n: int, seed: int) -> List[str]:
+    """Half hits spread across all keys, half misses (the common case: go to the LLM)"""
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        if i % 2:
+            out.append(f"what about the widget{rnd.randrange(count)} again?")
+        else:
+            out.append(f"what do you think about {rnd.choice(['rust', 'snow', 'coffee'])} today?")
+    return out
+
+def rate(fn, inputs: List[str], min_seconds: float) -> float:
+    """Calls/sec, repeating the input list until min_seconds have passed"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for text in inputs:
+            fn(text)
+        calls += len(inputs)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls / elapsed
+
+def run(count: int, n: int, seed: int, min_seconds: float, legacy_n: int) -> Dict[str, Any]:
+    vessels = SyntheticVessels(count)
+    start = time.perf_counter()
+    router = Router(vessels, patterns=vessels.patterns)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    inputs = queries(count, n, seed)
+    # The legacy loop re-parses patterns once they overflow re's cache,
+    # so it only gets a slice of the queries at large key counts
+    legacy_inputs = inputs[:legacy_n]
+    for text in legacy_inputs:
+        assert router.route(text) == legacy_route(router, text), text
+
+    return {
+        'keys': count,
+        'compile_ms': compile_ms,
+        'compiled_routes_per_sec': rate(router.route, inputs, min_seconds),
+        'legacy_routes_per_sec': rate(lambda t: legacy_route(router, t), legacy_inputs, min_seconds),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Router routes/sec vs number of vessels")
+    parser.add_argument('--keys', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--legacy-queries', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-seconds', type=float, default=0.5)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    results = [run(count, args.queries, args.seed, args.min_seconds, args.legacy_queries) for count in args.keys]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 Router throughput - {args.queries} queries (half hits, half misses)\n")
+    print(f"{'keys':>6}{'compile ms':>12}{'compiled/s':>14}{'legacy/s':>12}{'speedup':>9}")
+    for r in results:
+        print(f"{r['keys']:>6}{r['compile_ms']:>12.1f}{r['compiled_routes_per_sec']:>14,.0f}"
+              f"{r['legacy_routes_per_sec']:>12,.0f}"
+              f"{r['compiled_routes_per_sec'] / r['legacy_routes_per_sec']:>8.1f}x")
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Semantic routing calibration - pick semantic_route_threshold / _margin for an embedding model
+
+Held-out paraphrases (should route to their fact) and near-miss
+questions (should go to the LLM) are scored once against the router's
+examples; every threshold x margin pair is then evaluated offline.
+
+    python -m benchmarks.semantic_routing --embedder real   # config.embedding_model
+    python -m benchmarks.semantic_routing --json            # stub embedder (CI smoke run)
+
+A false accept replaces the LLM's answer with a canned fact, so the
+recommendation is the highest-recall setting with zero false accepts.
+"""
+import argparse
+import json
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.config import Config
+from benchmarks.corpus import make_embedder
+from core.integrations.memory_injector.semantic_router import SemanticRouter, EXAMPLES
+
+# Phrasings not in EXAMPLES
+PARAPHRASES = {
+    'USER_NAME': ["can you tell me my name", "what name did I give you", "remind me what I'm called"],
+    'PROJECT': ["what's the project I'm on", "what have I been building lately", "which project is mine"],
+    'GPU': ["what graphics card do I have", "which gpu is in my computer", "how much video memory do I have"],
+    'LOCATION': ["which city am I in", "where do I live", "what town am I based in"],
+    'AI_NAME': ["what are you called", "do you have a name", "what's your name again"],
+    'AI_MODEL': ["which model are you running", "what llm powers you", "what ai model is this"],
+    'AI_PURPOSE': ["what are you meant to do", "what's your job", "why do you exist"],
+    'AI_STORAGE': ["where do you keep our chats", "how is our history stored", "what do you save conversations in"],
+    'AI_EMBEDDING': ["what model makes your embeddings", "how are my messages embedded", "which embedding model is used"],
+}
+
+# Questions that mention the same topics but need a real answer
+NEAR_MISSES = [
+    "what gpu should I buy for gaming",
+    "how much vram does llama 70b need",
+    "what is the capital of france",
+    "where is the nearest coffee shop",
+    "what's a good name for a cat",
+    "who are the founders of nvidia",
+    "how do neural networks store memories",
+    "what database is best for time series",
+    "what project management tool should I use",
+    "which embedding model is best for code search",
+    "what is the purpose of a kv cache",
+    "how do I move to a new city",
+]
+
+def score_all(router: SemanticRouter, texts: List[str]) -> List[Dict[str, float]]:
+    return [router.scores(text) for text in texts]
+
+def decide(best: Dict[str, float], threshold: float, margin: float) -> Optional[str]:
+    """SemanticRouter's rule with every fact loaded"""
+    return SemanticRouter.pick(best, EXAMPLES, threshold, margin)[0]
+
+def evaluate(positives: List[Tuple[str, Dict[str, float]]], negatives: List[Dict[str, float]],
+             threshold: float, margin: float) -> Dict[str, Any]:
+    correct = wrong = 0
+    for expected, best in positives:
+        key = decide(best, threshold, margin)
+        if key == expected:
+            correct += 1
+        elif key is not None:
+            wrong += 1
+    false_accepts = sum(1 for best in negatives if decide(best, threshold, margin) is not None)
+    return {
+        'threshold': threshold,
+        'margin': margin,
+        'recall': correct / len(positives) if positives else 0.0,
+        'wrong_key': wrong,
+        'false_accepts': false_accepts,
+    }
+
+def run(encode) -> Dict[str, Any]:
+    """Score every threshold x margin pair; recommended = best recall with no wrong/false routes"""
+    router = SemanticRouter(encode, examples=EXAMPLES)
+    if not router.wait():
+        raise SystemExit(f"❌ Could not embed examples: {router.error}")
+
+    labelled = [(key, text) for key, texts in PARAPHRASES.items() for text in texts]
+    positives = list(zip([key for key, _ in labelled], score_all(router, [text for _, text in labelled])))
+    negatives = score_all(router, NEAR_MISSES)
+
+    grid = [
+        evaluate(positives, negatives, threshold / 100, margin / 100)
+        for threshold in range(50, 100, 5)
+        for margin in (0, 2, 5, 10)
+    ]
+    safe = [g for g in grid if g['false_accepts'] == 0 and g['wrong_key'] == 0 and g['recall'] > 0]
+    best = max(safe, key=lambda g: (g['recall'], -g['threshold'], -g['margin'])) if safe else None
+    return {'paraphrases': len(positives), 'near_misses': len(negatives), 'grid': grid, 'recommended': best}
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate semantic routing threshold/margin")
+    parser.add_argument('--embedder', default='stub', choices=['stub', 'real'],
+                        help="real = config.embedding_model via sentence-transformers")
+    parser.add_argument('--dims', type=int, default=1024, help="stub embedder dimensions")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    config = Config.load()
+    config.vector_dims = args.dims
+    result = run(make_embedder(args.embedder, config).encode)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    grid, best = result['grid'], result['recommended']
+    print(f"\n🎯 Semantic routing - {result['paraphrases']} paraphrases, {result['near_misses']} near misses\n")
+    print(f"{'threshold':>10}{'margin':>8}{'recall':>8}{'wrong':>7}{'false+':>8}")
+    for g in grid:
+        print(f"{g['threshold']:>10.2f}{g['margin']:>8.2f}{g['recall']:>8.0%}{g['wrong_key']:>7}{g['false_accepts']:>8}")
+    if best:
+        print(f"\n✅ Recommended: semantic_route_threshold={best['threshold']:.2f} "
+              f"semantic_route_margin={best['margin']:.2f} (recall {best['recall']:.0%}, no false accepts)\n")
+    else:
+        print("\n⚠️  No setting routes paraphrases without false accepts - leave semantic_routing off for this model\n")
+
+if __name__ == "__main__":
+    main()
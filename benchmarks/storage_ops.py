@@ -0,0 +1,213 @@
+"""Storage micro-benchmark - every StorageInterface method vs history size, both backends
+
+Each (backend, size) case runs in a fresh process so peak RSS
+(ru_maxrss) belongs to that case alone. Latencies exclude one warm-up
+call per method, reported separately as cold_ms.
+
+    python -m benchmarks.storage_ops
+    python -m benchmarks.storage_ops --sizes 1000 10000 --backends jsonl --json
+    python -m benchmarks.storage_ops --save-baseline        # record this machine's numbers
+    python -m benchmarks.storage_ops --threshold 0.25       # exit 1 on >25% p50/RSS regression
+
+Baselines are machine-specific: re-record after changing hardware.
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List, Callable
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline_storage.json")
+OPS = ['save_turn', 'get_recent', 'get_all_turns', 'search', 'load_conversation', 'list_all_conversations']
+
+def peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def measure(fn: Callable[[int], Any], repeat: int) -> Dict[str, float]:
+    """One cold call (reported as cold_ms), then `repeat` timed calls"""
+    start = time.perf_counter()
+    fn(0)
+    cold = time.perf_counter() - start
+
+    samples = []
+    for i in range(1, repeat + 1):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    ordered = sorted(samples)
+
+    def pct(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] * 1000
+
+    return {
+        'ops_per_sec': len(samples) / sum(samples) if sum(samples) else 0.0,
+        'cold_ms': cold * 1000,
+        'p50_ms': statistics.median(ordered) * 1000,
+        'p95_ms': pct(0.95),
+        'p99_ms': pct(0.99),
+    }
+
+def run_case(backend: str, size: int, opts: Dict[str, Any]) -> Dict[str, Any]:
+    """Seed a corpus of `size` turns, open it, and time each storage method"""
+    from benchmarks.corpus import make_turns, seed_lancedb, seed_jsonl, open_storage, make_embedder, sentence
+    from core.config import Config
+
+    with contextlib.redirect_stdout(sys.stderr), tempfile.TemporaryDirectory(prefix="winter-bench-") as tmp:
+        config = Config(storage_path=f"{tmp}/storage", conv_history_path=f"{tmp}/conversations",
+                        vector_dims=opts['dims'])
+        embedder = make_embedder(opts['embedder'], config) if backend == 'lancedb' else None
+        per_conversation = opts['turns_per_conversation']
+        conversations = max(1, size // per_conversation)
+        turns = make_turns(conversations, per_conversation, opts['user_words'], opts['assistant_words'], opts['seed'])
+
+        start = time.perf_counter()
+        if backend == 'lancedb':
+            seed_lancedb(config, turns, embedder)
+        else:
+            seed_jsonl(config, turns)
+        seed_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        storage = open_storage(backend, config, embedder)
+        open_seconds = time.perf_counter() - start
+
+        ids = [c['conversation_id'] for c in storage.list_all_conversations()]
+        rnd = random.Random(opts['seed'])
+        queries = [sentence(rnd, 2) for _ in range(opts['repeat'] + 1)]
+        repeat = opts['repeat']
+
+        ops = {}
+        storage.load_conversation(ids[0])
+        ops['save_turn'] = measure(lambda i: storage.save_turn(
+            sentence(rnd, opts['user_words']), sentence(rnd, opts['assistant_words']), {}), repeat)
+        # save_turn may only enqueue (write-behind); flush is the time to drain it to disk
+        start = time.perf_counter()
+        if hasattr(storage, 'flush'):
+            storage.flush()
+        flush_seconds = time.perf_counter() - start
+        ops['get_recent'] = measure(lambda i: storage.get_recent(6), repeat)
+        ops['get_all_turns'] = measure(lambda i: storage.get_all_turns(), repeat)
+        ops['search'] = measure(lambda i: storage.search(queries[i], 5), repeat)
+        ops['load_conversation'] = measure(lambda i: storage.load_conversation(ids[i % len(ids)]), repeat)
+        ops['list_all_conversations'] = measure(lambda i: storage.list_all_conversations(), repeat)
+
+        if hasattr(storage, 'close'):
+            storage.close()
+
+        return {
+            'backend': backend,
+            'history_turns': conversations * per_conversation,
+            'conversations': conversations,
+            'seed_seconds': seed_seconds,
+            'open_seconds': open_seconds,
+            'flush_seconds': flush_seconds,
+            'peak_rss_mb': peak_rss_mb(),
+            'ops': ops,
+        }
+
+def case_key(result: Dict[str, Any]) -> str:
+    return f"{result['backend']}/{result['history_turns']}"
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float,
+            min_ms: float = 0.05) -> List[str]:
+    """Regressions: p50 latency or peak RSS more than `threshold` (fraction) above baseline
+
+    Latency changes smaller than `min_ms` are ignored - microsecond-scale
+    cache hits would otherwise flap on timer noise.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(case_key(result))
+        if base is None:
+            continue
+        for name, stats in result['ops'].items():
+            before = base['ops'].get(name, {}).get('p50_ms')
+            if before and stats['p50_ms'] > before * (1 + threshold) and stats['p50_ms'] - before > min_ms:
+                regressions.append(f"{case_key(result)} {name}: p50 {before:.3f}ms -> {stats['p50_ms']:.3f}ms")
+        before = base.get('peak_rss_mb')
+        if before and result['peak_rss_mb'] > before * (1 + threshold):
+            regressions.append(f"{case_key(result)} peak RSS: {before:.0f}MB -> {result['peak_rss_mb']:.0f}MB")
+    return regressions
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    for r in results:
+        print(f"\n📊 {r['backend']} - {r['history_turns']:,} turns / {r['conversations']:,} conversations"
+              f" | seed {r['seed_seconds']:.1f}s | open {r['open_seconds'] * 1000:.0f}ms"
+              f" | flush {r['flush_seconds'] * 1000:.0f}ms"
+              f" | peak RSS {r['peak_rss_mb']:.0f}MB\n")
+        print(f"{'op':<24}{'ops/s':>10}{'cold ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name in OPS:
+            s = r['ops'].get(name)
+            if s:
+                print(f"{name:<24}{s['ops_per_sec']:>10,.0f}{s['cold_ms']:>10.2f}{s['p50_ms']:>10.2f}"
+                      f"{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage method latency/throughput vs history size")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help="history turns")
+    parser.add_argument('--backends', nargs='+', default=['lancedb', 'jsonl'], choices=['lancedb', 'jsonl'])
+    parser.add_argument('--turns-per-conversation', type=int, default=50)
+    parser.add_argument('--user-words', type=int, default=12)
+    parser.add_argument('--assistant-words', type=int, default=60)
+    parser.add_argument('--embedder', default='stub', choices=['stub', 'real'],
+                        help="real = config.embedding_model via sentence-transformers")
+    parser.add_argument('--dims', type=int, default=1024)
+    parser.add_argument('--repeat', type=int, default=50, help="timed calls per method")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="write results to --baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument('--min-ms', type=float, default=0.05, help="ignore p50 changes smaller than this")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    opts = {k: getattr(args, k) for k in
+            ('turns_per_conversation', 'user_words', 'assistant_words', 'embedder', 'dims', 'repeat', 'seed')}
+
+    # Fresh process per case: clean peak RSS and no caches carried between cases
+    results = []
+    spawn = multiprocessing.get_context('spawn')
+    for backend in args.backends:
+        for size in args.sizes:
+            print(f"▶ {backend} @ {size:,} turns", file=sys.stderr)
+            with spawn.Pool(1) as pool:
+                results.append(pool.apply(run_case, (backend, size, opts)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({case_key(r): r for r in results}, f, indent=2)
+            f.write('\n')
+        print(f"💾 Baseline saved to {args.baseline}", file=sys.stderr)
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"💡 No baseline at {args.baseline}; run with --save-baseline to record one", file=sys.stderr)
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.min_ms)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) over {args.threshold:.0%}:", file=sys.stderr)
+        for line in regressions:
+            print(f"   {line}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ Within {args.threshold:.0%} of baseline", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
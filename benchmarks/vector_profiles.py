@@ -0,0 +1,148 @@
+"""Vector profile benchmark - disk size, scan latency and recall@k per profile
+
+    python -m benchmarks.vector_profiles                 # synthetic Matryoshka-like vectors
+    python -m benchmarks.vector_profiles --model         # real config.embedding_model
+    python -m benchmarks.vector_profiles --rows 20000 --json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import List, Dict, Any, Optional
+
+import lancedb
+import numpy as np
+import pyarrow as pa
+
+from core.config import Config
+from storage.vector_profile import VectorProfile
+
+# (dims, dtype, index) - the first entry is the full-precision baseline
+PROFILES = [
+    (1024, 'float32', None),
+    (1024, 'float16', None),
+    (512, 'float32', None),
+    (512, 'float16', None),
+    (256, 'float32', None),
+    (256, 'float16', None),
+    (1024, 'float32', 'IVF_SQ'),
+    (256, 'float16', 'IVF_SQ'),
+]
+
+WORDS = (
+    "memory vector storage gpu project winter lance embedding model ollama query "
+    "conversation history search turn summary python terminal file code test "
+    "fast slow cache index disk latency recall weather music coffee travel"
+).split()
+
+def synthetic_vectors(rows: int, dims: int, seed: int = 0) -> np.ndarray:
+    """Clustered vectors whose energy decays across dims, like Matryoshka output"""
+    rng = np.random.default_rng(seed)
+    scale = 1.0 / np.sqrt(1.0 + np.arange(dims) / 32.0)
+    centers = rng.standard_normal((max(1, rows // 50), dims)) * scale
+    vectors = centers[rng.integers(0, len(centers), rows)] + 0.5 * rng.standard_normal((rows, dims)) * scale
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def model_vectors(rows: int, model_name: str, seed: int = 0) -> np.ndarray:
+    """Embed synthetic sentences with the real model"""
+    from sentence_transformers import SentenceTransformer
+    rnd = random.Random(seed)
+    texts = [" ".join(rnd.choices(WORDS, k=rnd.randint(6, 24))) for _ in range(rows)]
+    model = SentenceTransformer(model_name, local_files_only=True)
+    vectors = model.encode(texts, batch_size=64, normalize_embeddings=True)
+    return np.asarray(vectors, dtype=np.float32)
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    """Ground truth: exact cosine neighbours at full precision"""
+    scores = queries @ corpus.T
+    return [set(np.argsort(-row)[:k].tolist()) for row in scores]
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(pct / 100 * len(ordered))) - 1)]
+
+def bench_profile(corpus: np.ndarray, queries: np.ndarray, truth: List[set],
+                  dims: int, dtype: str, index: Optional[str], k: int, workdir: str) -> Dict[str, Any]:
+    profile = VectorProfile(dims, dtype)
+    name = f"{profile}" + (f"+{index}" if index else "")
+    path = os.path.join(workdir, name.replace('/', '_').replace('+', '_'))
+
+    db = lancedb.connect(path)
+    data = pa.table({
+        'id': pa.array(np.arange(len(corpus)), pa.int64()),
+        'vector': profile.to_arrow(profile.apply(corpus)),
+    })
+    table = db.create_table('vectors', data)
+    if index:
+        table.create_index(metric='cosine', index_type=index,
+                           num_partitions=max(1, int(math.sqrt(len(corpus)))))
+
+    latencies = []
+    recalls = []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        result = table.search(profile.query(query)).distance_type('cosine') \
+            .select(['id']).limit(k).to_arrow()
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len(expected & set(result['id'].to_pylist())) / k)
+
+    return {
+        'profile': name,
+        'disk_mb': dir_size(path) / 1024 / 1024,
+        'scan_p50_ms': percentile(latencies, 50),
+        'scan_p95_ms': percentile(latencies, 95),
+        'recall_at_k': sum(recalls) / len(recalls),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector storage profiles")
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--model', action='store_true', help="embed text with config.embedding_model")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    config = Config.load()
+    if args.model:
+        vectors = model_vectors(args.rows + args.queries, config.embedding_model)
+    else:
+        vectors = synthetic_vectors(args.rows + args.queries, 1024)
+
+    corpus, queries = vectors[:args.rows], vectors[args.rows:]
+    truth = exact_top_k(corpus, queries, args.k)
+
+    workdir = tempfile.mkdtemp(prefix="winter-vector-bench-")
+    try:
+        results = [
+            bench_profile(corpus, queries, truth, dims, dtype, index, args.k, workdir)
+            for dims, dtype, index in PROFILES
+            if dims <= corpus.shape[1]
+        ]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    baseline = results[0]
+    print(f"\n📊 Vector profiles - {args.rows} rows, {args.queries} queries, recall@{args.k}\n")
+    print(f"{'profile':<24}{'disk MB':>10}{'vs base':>9}{'p50 ms':>9}{'p95 ms':>9}{'recall':>9}")
+    for r in results:
+        ratio = r['disk_mb'] / baseline['disk_mb'] if baseline['disk_mb'] else 0
+        print(f"{r['profile']:<24}{r['disk_mb']:>10.2f}{ratio:>8.2f}x"
+              f"{r['scan_p50_ms']:>9.2f}{r['scan_p95_ms']:>9.2f}{r['recall_at_k']:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,77 @@
 from typing import List, Dict, Any, Iterator
 from core.errors import AIError
 from core.llm_ollama import OllamaLLM
-from core.integrations.memory_injector import Vessels, Router, Formatter
+from core.chat_transcript import ChatTranscript
+from core.context_packer import ContextPacker
+from core.integrations.memory_injector import MemoryRegistry
+from utils.spans import SPANS
+
+SYSTEM_PROMPT = """You are agentWinter, a friendly AI assistant helping Maddi.
+
+The earlier messages are your conversation with Maddi. When Maddi asks about THEMSELVES ("what do I like?", "what did I say?"), answer from what Maddi (the user) said in those messages, not from what you think."""
+
+SELF_QUESTION_NOTE = "(Maddi is asking about themselves - answer from what Maddi said earlier.)"
 
 class OllamaAI:
     """LFM2.5-based AI implementation compatible with Winter"""
-    def __init__(self, config):
-        self.model = OllamaLLM(config.model_name)
-        self.vessels = Vessels()
-        self.router = Router(self.vessels)
-        self.formatter = Formatter()
+    def __init__(self, config, memory: MemoryRegistry = None):
+        self.config = config
+        self.model = OllamaLLM(config.model_name, keep_alive=config.ollama_keep_alive,
+                               num_ctx=config.context_window)
+        self.memory = memory or MemoryRegistry()
+        self.packer = ContextPacker(config)
+        # Most of the budget goes to the running transcript, the rest to retrieved turns
+        self.transcript = ChatTranscript(
+            config.chat_history_max_turns,
+            max_tokens=self.packer.budget(SYSTEM_PROMPT) * 3 // 4
+        )
+        self.last_stats = {}
+
+    def _build_messages(self, user_input: str, context: List[Dict[str, Any]],
+                        asking_about_self: bool) -> List[Dict[str, str]]:
+        """Stable system message + append-only history + new user message
+
+        Retrieved turns that aren't part of the running transcript go into
+        the new user message so the cached prefix stays untouched.
+        Everything is packed into the context window minus num_predict.
+        """
+        # Known facts (hand-written + extracted vessels); only changes when memory.txt does
+        facts = self.memory.vessels.get_all_text()
+        system = f"{SYSTEM_PROMPT}\n\n{facts}" if facts else SYSTEM_PROMPT
+
+        budget = self.packer.budget(system, SELF_QUESTION_NOTE, user_input)
+        earlier = self.transcript.sync(context, clip=self.packer.clip)
+        if self.transcript.tokens() > budget:
+            # Unusually long input - give up the cached prefix rather than overflow
+            self.transcript.fit(budget)
+        earlier = self.packer.pack(earlier, budget - self.transcript.tokens())
+
+        parts = []
+        if earlier:
+            lines = ["Relevant earlier context:"]
+            for turn in earlier:
+                lines.append(f"User: {turn['user']}\nAssistant: {turn['assistant']}")
+            parts.append("\n".join(lines))
+        if asking_about_self:
+            parts.append(SELF_QUESTION_NOTE)
+        parts.append(user_input)
+
+        return (
+            [{"role": "system", "content": system}]
+            + self.transcript.messages()
+            + [{"role": "user", "content": "\n\n".join(parts)}]
+        )
     
     def generate(self, user_input: str, context: List[Dict[str, Any]]) -> Iterator[str]:
         """Generate streaming response with context"""
+        self.last_stats = {}
         try:
-            history_str = ""
-            if context:
-                for turn in context[-15:]:
-                    history_str += f"\nUser: {turn['user']}\nAssistant: {turn['assistant']}\n"
-            
             # Use Router for selective vessel injection
-            fact_key, fact_data = self.router.route(user_input)
+            fact_key, fact_data = self.memory.route(user_input)
             
             if fact_key and fact_data:
                 # Direct fact answer - bypass AI
-                answer = self.formatter.format_response(fact_key, fact_data)
+                answer = self.memory.format_response(fact_key, fact_data)
                 yield answer
                 return
             
@@ -34,6 +81,23 @@ class OllamaAI:
                 "do i", "did i", "what do i", "what did i", "my favorite", "i like"
             ])
             
+            if self.config.prompt_mode == "chat":
+                try:
+                    with SPANS.span('prompt.build'):
+                        messages = self._build_messages(user_input, context, asking_about_self)
+                    for chunk in self.model.stream_chat(messages, self.config.num_predict):
+                        yield chunk
+                finally:
+                    self.last_stats = self.model.last_stats
+                return
+
+            history_str = ""
+            with SPANS.span('prompt.build'):
+                budget = self.packer.budget(SYSTEM_PROMPT, SELF_QUESTION_NOTE, user_input)
+                if context:
+                    for turn in self.packer.pack(context, budget):
+                        history_str += f"\nUser: {turn['user']}\nAssistant: {turn['assistant']}\n"
+
             # Build prompt with emphasis on reading conversation history
             if asking_about_self:
                 prompt = f"""You are agentWinter, an AI assistant helping Maddi.
@@ -54,9 +118,11 @@ Conversation:{history_str}
 User: {user_input}
 Assistant:"""
             
-            output = self.model.generate(prompt)
-            for line in output.split("\n"):
-                yield line
+            try:
+                for chunk in self.model.stream(prompt, self.config.num_predict):
+                    yield chunk
+            finally:
+                self.last_stats = self.model.last_stats
                 
         except Exception as e:
             raise AIError(f"AI generation failed: {e}")
@@ -0,0 +1,67 @@
+"""Append-only chat transcript - keeps the prompt prefix stable across turns"""
+from typing import List, Dict, Any, Optional
+
+from core.context_packer import turn_key, turn_tokens
+
+class ChatTranscript:
+    """Conversation turns rendered as chat messages, only ever appended to
+
+    Ollama keeps the KV cache of the previous request and reuses the
+    longest matching prefix. Re-rendering a sliding window of history
+    changes the prefix every turn and forces a full re-prefill; appending
+    keeps everything before the new turn byte-identical.
+    """
+
+    def __init__(self, max_turns: int = 30, max_tokens: Optional[int] = None):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.turns = []
+        self.keys = set()
+
+    def tokens(self) -> int:
+        return sum(turn_tokens(t) for t in self.turns)
+
+    def fit(self, max_tokens: int) -> None:
+        """Drop the oldest half until the transcript fits in max_tokens"""
+        while self.turns and self.tokens() > max_tokens:
+            self.turns = self.turns[len(self.turns) // 2 or 1:]
+        self.keys = {turn_key(t) for t in self.turns}
+
+    def sync(self, context: List[Dict[str, Any]], clip=None) -> List[Dict[str, Any]]:
+        """Append context turns newer than the transcript tail
+
+        Returns the retrieved turns that are older than the tail and not
+        in the transcript (semantic hits) - those belong in the new user
+        message, not in the history, or they would break the prefix.
+        `clip` (if given) is applied to turns as they are appended.
+        """
+        tail = turn_key(self.turns[-1]) if self.turns else None
+        earlier = []
+
+        for turn in sorted(context, key=turn_key):
+            key = turn_key(turn)
+            if key in self.keys:
+                continue
+            if tail is None or key > tail:
+                self.turns.append(clip(turn) if clip else turn)
+                self.keys.add(key)
+            else:
+                earlier.append(turn)
+
+        if len(self.turns) > self.max_turns:
+            # Drop the oldest half in one go: one cache miss now instead
+            # of a shifted prefix (and a miss) on every following turn
+            self.turns = self.turns[-(self.max_turns // 2):]
+            self.keys = {turn_key(t) for t in self.turns}
+        if self.max_tokens is not None:
+            self.fit(self.max_tokens)
+
+        return earlier
+
+    def messages(self) -> List[Dict[str, str]]:
+        """History as alternating user/assistant messages"""
+        messages = []
+        for turn in self.turns:
+            messages.append({"role": "user", "content": turn['user']})
+            messages.append({"role": "assistant", "content": turn['assistant']})
+        return messages
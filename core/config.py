@@ -14,7 +14,49 @@ class Config:
     temperature: float = 0.7
     rag_recent_limit: int = 15
     rag_semantic_limit: int = 10
+    rag_weight_semantic: float = 0.6
+    rag_weight_recency: float = 0.3
+    rag_weight_keyword: float = 0.1
+    rag_recency_half_life: float = 4.0
+    rag_keep_recent: int = 2  # newest turns always kept, whatever their score
+    rag_recent_timeout: float = 1.0
+    rag_semantic_timeout: float = 1.5
     context_window: int = 4096
+    num_predict: int = 512
+    context_turn_max_tokens: int = 600
+    vector_dims: int = 1024
+    vector_dtype: str = "float32"
+    vector_index_threshold: int = 10000
+    vector_index_type: str = "IVF_PQ"
+    index_refresh_interval: int = 100
+    write_behind: bool = True
+    write_queue_size: int = 64
+    write_batch_size: int = 16
+    compaction_fragment_threshold: int = 64
+    version_retention_days: int = 7
+    maintenance_idle_seconds: int = 300
+    embedding_cache_size: int = 4096
+    embedding_cache_disk: bool = True
+    embedding_cache_disk_rows: int = 50000
+    embedding_cache_ttl_days: float = 30.0
+    migration_batch_size: int = 64
+    prompt_mode: str = "chat"
+    chat_history_max_turns: int = 30
+    ollama_keep_alive: str = "30m"
+    semantic_routing: bool = False
+    semantic_route_threshold: float = 0.75
+    semantic_route_margin: float = 0.05
+    fact_extraction: bool = False
+    fact_extraction_batch_size: int = 4
+    fact_extraction_concurrency: int = 1
+    fact_extraction_idle_seconds: float = 30.0
+    fact_extraction_max_tokens: int = 256
+    fact_staging_path: str = "memory/memory.staged.txt"
+    response_cache: bool = False
+    response_cache_threshold: float = 0.95
+    response_cache_ttl: int = 3600
+    response_cache_size: int = 256
+    instrumentation: bool = True
     
     @classmethod
     def load(cls, config_path: str = "config.json"):
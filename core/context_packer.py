@@ -0,0 +1,88 @@
+"""Token-budgeted context packing - keeps prompts inside config.context_window"""
+import math
+from typing import List, Dict, Any, Optional, Tuple
+
+CHARS_PER_TOKEN = 4
+TURN_OVERHEAD = 8          # role tags / "User:" "Assistant:" labels per turn
+SAFETY_MARGIN = 64         # estimate slack; the ~4 chars/token rule is approximate
+TRUNCATION_MARK = "\n[... truncated ...]\n"
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Cheap token estimate (~4 chars/token) - no tokenizer round-trip per turn"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+def count_turn_tokens(user: str, assistant: str) -> int:
+    """Token cost of one turn in the prompt (stored as context_tokens at save time)"""
+    return estimate_tokens(user) + estimate_tokens(assistant) + TURN_OVERHEAD
+
+def turn_key(turn: Dict[str, Any]) -> Tuple[float, int]:
+    """Identity of a stored turn (sorts oldest first) - shared by transcript, fusion and response cache"""
+    return (turn.get('timestamp', 0), turn.get('turn_number', 0))
+
+def turn_tokens(turn: Dict[str, Any]) -> int:
+    """Cached count if the turn has one, estimated otherwise (older rows)"""
+    cached = turn.get('context_tokens') or 0
+    if cached > 0:
+        return cached
+    return count_turn_tokens(turn.get('user', ''), turn.get('assistant', ''))
+
+def turn_score(turn: Dict[str, Any]) -> float:
+    """Retrieval score; recent-window turns (no distance) rank first"""
+    score = turn.get('score')
+    if score is not None:
+        return score
+    distance = turn.get('_distance')
+    if distance is None or distance != distance:  # NaN from pandas
+        return 1.0
+    return 1.0 - distance
+
+class ContextPacker:
+    """Fills a token budget with retrieved turns, best score first"""
+
+    def __init__(self, config):
+        self.context_window = config.context_window
+        self.num_predict = config.num_predict
+        self.max_turn_tokens = config.context_turn_max_tokens
+
+    def budget(self, *fixed: str) -> int:
+        """Tokens left for history after the reply reserve and fixed prompt parts"""
+        used = sum(estimate_tokens(text) for text in fixed)
+        return max(0, self.context_window - self.num_predict - used - SAFETY_MARGIN)
+
+    def clip(self, turn: Dict[str, Any]) -> Dict[str, Any]:
+        """Truncate an oversized assistant message, keeping its head and tail
+
+        Deterministic, so a clipped turn renders the same on every request.
+        """
+        if turn_tokens(turn) <= self.max_turn_tokens:
+            return turn
+
+        assistant = turn.get('assistant', '')
+        keep_chars = max(0, self.max_turn_tokens - estimate_tokens(turn.get('user', '')) - TURN_OVERHEAD) * CHARS_PER_TOKEN
+        keep_chars = max(0, keep_chars - len(TRUNCATION_MARK))
+        if len(assistant) <= keep_chars:
+            return turn
+
+        head = keep_chars * 2 // 3
+        tail = keep_chars - head
+        clipped = dict(turn)
+        clipped['assistant'] = assistant[:head] + TRUNCATION_MARK + (assistant[-tail:] if tail else '')
+        clipped['context_tokens'] = count_turn_tokens(clipped.get('user', ''), clipped['assistant'])
+        return clipped
+
+    def pack(self, turns: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
+        """Highest-scoring turns that fit in `budget`, returned in time order"""
+        ranked = sorted(turns, key=lambda t: (turn_score(t), t.get('timestamp', 0)), reverse=True)
+
+        packed = []
+        used = 0
+        for turn in ranked:
+            turn = self.clip(turn)
+            cost = turn_tokens(turn)
+            if used + cost > budget:
+                continue  # a smaller, lower-scored turn may still fit
+            packed.append(turn)
+            used += cost
+
+        packed.sort(key=lambda t: (t.get('timestamp', 0), t.get('turn_number', 0)))
+        return packed
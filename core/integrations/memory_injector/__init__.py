@@ -1,6 +1,8 @@
 """Memory Injector - Router system for instant fact retrieval"""
 from .vessels import Vessels
-from .router import Router
+from .router import Router, is_question
 from .formatter import Formatter
+from .registry import MemoryRegistry
+from .extractor import FactExtractor
 
-__all__ = ['Vessels', 'Router', 'Formatter']
+__all__ = ['Vessels', 'Router', 'is_question', 'Formatter', 'MemoryRegistry', 'FactExtractor']
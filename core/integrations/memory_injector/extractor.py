@@ -0,0 +1,168 @@
+"""Fact extractor - background worker that proposes new vessels from saved turns"""
+import json
+import queue
+import threading
+import time
+from typing import Dict, List, Callable, Iterator, Tuple
+
+PROMPT = """Extract durable facts the USER states about themselves (name, preferences,
+hardware, projects, places, people) from these conversation turns.
+
+Already known (do not repeat): {known}
+
+{turns}
+
+Answer with JSON only, keys in UPPER_SNAKE_CASE, one short value each:
+{{"facts": {{"FAVORITE_COLOR": "blue"}}}}
+Use {{"facts": {{}}}} if there is nothing new."""
+
+def parse_facts(text: str) -> Dict[str, str]:
+    """Pull the facts object out of an LLM reply (thinking blocks, code fences and all)"""
+    if "</think>" in text:
+        text = text.split("</think>")[-1]
+    if "...done thinking." in text:
+        text = text.split("...done thinking.")[-1]
+    text = text.replace('```json', '').replace('```', '')
+
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end <= start:
+        return {}
+    data = json.loads(text[start:end + 1])
+    facts = data.get('facts', data) if isinstance(data, dict) else {}
+    return {str(k): str(v) for k, v in facts.items() if isinstance(v, (str, int, float))}
+
+class FactExtractor:
+    """Queue of saved turns -> batched LLM extraction -> MemoryRegistry.stage_facts
+
+    Extraction shares the chat model, so it only runs once the chat has
+    been idle for `idle_seconds` (adapter brackets each turn with
+    pause()/resume()). A turn starting mid-extraction cancels the call
+    and its batch is retried at the next idle window. Facts go to the
+    registry's staging file for review, never into memory.txt.
+
+    submit() never blocks: if the queue is full the turn is dropped.
+    `stream` takes a prompt and yields reply chunks (OllamaLLM.stream_json).
+    """
+
+    def __init__(self, memory, stream: Callable[[str], Iterator[str]], batch_size: int = 4,
+                 concurrency: int = 1, queue_size: int = 64, idle_seconds: float = 30.0):
+        self.memory = memory
+        self.stream = stream
+        self.batch_size = max(1, batch_size)
+        self.idle_seconds = idle_seconds
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.added = 0
+        self.dropped = 0
+        self.failed = 0
+        self.interrupted = 0
+        self._active = 0  # chat turns in flight
+        self._last_activity = time.monotonic()
+        self._activity = threading.Condition()
+        self._stop = threading.Event()
+        self.workers = [
+            threading.Thread(target=self._run, daemon=True, name=f"fact-extractor-{i}")
+            for i in range(max(1, concurrency))
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, user_msg: str, ai_msg: str) -> None:
+        if self._stop.is_set():
+            return
+        try:
+            self.queue.put_nowait((user_msg, ai_msg))
+        except queue.Full:
+            self.dropped += 1
+
+    def pause(self) -> None:
+        """A chat turn started - in-flight extraction is cancelled"""
+        with self._activity:
+            self._active += 1
+            self._last_activity = time.monotonic()
+
+    def resume(self) -> None:
+        """A chat turn finished - the idle clock restarts now"""
+        with self._activity:
+            self._active = max(0, self._active - 1)
+            self._last_activity = time.monotonic()
+            self._activity.notify_all()
+
+    def _busy_since(self, started: float) -> bool:
+        return self._active > 0 or self._last_activity > started
+
+    def _wait_idle(self) -> bool:
+        """Block until no turn has run for idle_seconds; False if closing"""
+        with self._activity:
+            while not self._stop.is_set():
+                remaining = self.idle_seconds - (time.monotonic() - self._last_activity)
+                if self._active == 0 and remaining <= 0:
+                    return True
+                self._activity.wait(remaining if self._active == 0 else None)
+        return False
+
+    def _next_batch(self) -> List[Tuple[str, str]]:
+        """Up to batch_size queued turns (waits for the first one)"""
+        batch = []
+        while not batch and not self._stop.is_set():
+            try:
+                batch.append(self.queue.get(timeout=0.5))
+            except queue.Empty:
+                continue
+        while batch and len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            while batch and self._wait_idle():
+                if self._extract(batch):
+                    break
+                self.interrupted += 1  # Chat resumed mid-call - retry this batch when idle again
+
+    def _extract(self, batch: List[Tuple[str, str]]) -> bool:
+        """One extraction call; False if a chat turn or close() cut it short"""
+        turns = "\n\n".join(
+            f"User: {user[:500]}\nAssistant: {assistant[:300]}" for user, assistant in batch
+        )
+        known = ", ".join(sorted({**self.memory.vessels.vessels, **self.memory.staged_facts()})) or "nothing yet"
+        started = time.monotonic()
+        chunks = []
+        try:
+            stream = self.stream(PROMPT.format(known=known, turns=turns))
+            try:
+                for chunk in stream:
+                    if self._stop.is_set() or self._busy_since(started):
+                        return False
+                    chunks.append(chunk)
+            finally:
+                close = getattr(stream, 'close', None)
+                if close is not None:
+                    close()  # Stops generation in Ollama if we bailed out early
+            facts = parse_facts("".join(chunks))
+            if facts:
+                self.added += len(self.memory.stage_facts(facts))
+        except Exception:
+            self.failed += 1  # Bad JSON / Ollama hiccup - these turns are skipped
+        return True
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Stop now: queued turns are dropped and an in-flight call is cancelled"""
+        self._stop.set()
+        with self._activity:
+            self._activity.notify_all()
+        while True:
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                break
+        for worker in self.workers:
+            worker.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {'added': self.added, 'dropped': self.dropped, 'failed': self.failed,
+                'interrupted': self.interrupted, 'pending': self.queue.qsize()}
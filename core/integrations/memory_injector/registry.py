@@ -0,0 +1,182 @@
+"""Registry - one shared, hot-reloading Vessels + Router + Formatter"""
+import os
+import re
+import threading
+import time
+from typing import Optional, Dict, Tuple
+
+from .vessels import Vessels
+from .router import Router, is_question
+from .formatter import Formatter
+from .semantic_router import SemanticRouter
+
+STAGED_LINE = re.compile(r'^(\w+) = (.+)$')
+STAGING_HEADER = (
+    "# Facts proposed by the background extractor - unreviewed, not used for routing.\n"
+    "# Type 'accept KEY' in the chat (or move the line into memory.txt as: vessel N: KEY = value)\n"
+)
+
+def _append_lines(path: str, lines, header: str = "") -> None:
+    """Append lines to a text file, starting on a fresh line; header only for a new/empty file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a+b') as f:
+        if new_file:
+            f.write(header.encode('utf-8'))
+        elif f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+        for line in lines:
+            f.write(f"{line}\n".encode('utf-8'))
+
+class MemoryRegistry:
+    """Loads the fact files once and re-parses a file only when it changes
+
+    Shared by ConversationAdapter and OllamaAI. Every route() stats the
+    two files (at most once per check_interval); a changed mtime/size
+    reloads just that file and recompiles the router, so edits to
+    memory.txt / system.txt apply on the next turn.
+
+    With enable_semantic(), questions are matched by embedding first,
+    then by regex; anything else goes to the LLM.
+    """
+
+    def __init__(self, memory_path: str = "memory/memory.txt", system_path: str = "memory/system.txt",
+                 check_interval: float = 1.0, staging_path: str = "memory/memory.staged.txt"):
+        self.vessels = Vessels(memory_path, system_path)
+        self.staging_path = staging_path  # extracted facts wait here for review, never routed
+        self.router = Router(self.vessels)
+        self.formatter = Formatter()
+        self.semantic = None
+        self.last_route = {}
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.RLock()
+        self._checked_at = time.monotonic()
+        self._stamps = {prefix: self._stamp(path) for prefix, path in self.vessels.paths.items()}
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload fact files changed on disk; True if anything was reloaded"""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return False
+
+        with self._lock:
+            self._checked_at = now
+            changed = False
+            for prefix, path in self.vessels.paths.items():
+                stamp = self._stamp(path)
+                if stamp != self._stamps.get(prefix):
+                    self.vessels.reload(prefix)
+                    self._stamps[prefix] = stamp
+                    changed = True
+
+            if changed:
+                self.router.compile()
+                self.reloads += 1
+            return changed
+
+    def enable_semantic(self, encode, threshold: float = 0.75, margin: float = 0.05) -> None:
+        """Add the embedding tier (example embeddings are built in the background)"""
+        self.semantic = SemanticRouter(encode, threshold, margin)
+
+    def route(self, user_input: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """Semantic tier, then Router.route, against the current fact files"""
+        self.refresh()
+        self.last_route = {}
+
+        if self.semantic is not None and is_question(user_input):
+            try:
+                with self._lock:
+                    facts = {**self.vessels.system_facts, **self.vessels.vessels}
+                key, score = self.semantic.match(user_input, facts)
+                if key is not None:
+                    self.last_route = {'tier': 'semantic', 'score': score}
+                    return key, facts[key]
+            except Exception:
+                pass  # Embedding failed - the regex tier still works
+
+        with self._lock:
+            key, data = self.router.route(user_input)
+        if key is not None:
+            self.last_route = {'tier': 'regex'}
+        return key, data
+
+    def staged_facts(self) -> Dict[str, str]:
+        """KEY -> value lines waiting in the staging file"""
+        staged = {}
+        try:
+            with open(self.staging_path, encoding='utf-8') as f:
+                for line in f:
+                    match = STAGED_LINE.match(line.strip())
+                    if match:
+                        staged[match.group(1)] = match.group(2).strip()
+        except OSError:
+            pass
+        return staged
+
+    def stage_facts(self, facts: Dict[str, str]) -> Dict[str, str]:
+        """Append proposed facts to the staging file, skipping keys or values already known
+
+        memory.txt is only written by accept_fact(), once a fact has been
+        reviewed. Returns what was actually staged.
+        """
+        with self._lock:
+            self.refresh(force=True)
+            known = {key: data['value'] for key, data in {**self.vessels.system_facts, **self.vessels.vessels}.items()}
+            known.update(self.staged_facts())
+            values = {value.lower() for value in known.values()}
+
+            added = {}
+            for key, value in facts.items():
+                key = re.sub(r'\W+', '_', key.strip()).strip('_').upper()
+                value = " ".join(str(value).split())
+                if not key or not value or key in known or key in added or value.lower() in values:
+                    continue
+                added[key] = value
+                values.add(value.lower())
+
+            if added:
+                _append_lines(self.staging_path, [f"{key} = {value}" for key, value in added.items()],
+                              header=STAGING_HEADER)
+
+            return added
+
+    def accept_fact(self, key: str) -> Optional[str]:
+        """Promote a reviewed staged fact into memory.txt (next vessel number); its value, or None if not staged
+
+        The line is removed from the staging file and the router reloads,
+        so the fact routes from the next turn.
+        """
+        key = key.strip().upper()
+        with self._lock:
+            value = self.staged_facts().get(key)
+            if value is None:
+                return None
+
+            self.refresh(force=True)
+            number = max((int(data['number']) for data in self.vessels.vessels.values()), default=0) + 1
+            _append_lines(self.vessels.paths['vessel'], [f"vessel {number}: {key} = {value}"])
+
+            with open(self.staging_path, encoding='utf-8') as f:
+                lines = f.readlines()
+            with open(self.staging_path, 'w', encoding='utf-8') as f:
+                for line in lines:
+                    match = STAGED_LINE.match(line.strip())
+                    if not (match and match.group(1) == key):
+                        f.write(line)
+
+            self.refresh(force=True)
+            return value
+
+    def format_response(self, key: str, fact_data: dict) -> str:
+        return self.formatter.format_response(key, fact_data)
@@ -1,15 +1,75 @@
 """Router - pattern matching and question routing"""
 import re
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple, Set
+
+QUESTION_WORDS = frozenset(['what', 'where', 'who', 'when', 'why', 'how', 'which'])
+
+# "?"-terminated inputs that are remarks, not fact lookups
+NOT_A_QUESTION = re.compile(
+    r'you know|you have|thats? creepy|creeper|why do you|how do you know'
+)
+
+ZERO_WIDTH_OR_CLASS = set('bBAZsSwWdD')
+
+def is_question(text: str) -> bool:
+    """Check if input is actually a question (a fact lookup, not a remark)"""
+    text_lower = text.lower().strip()
+
+    if text.endswith('?'):
+        return NOT_A_QUESTION.search(text_lower) is None
+
+    words = text_lower.split()
+    return bool(words) and words[0] in QUESTION_WORDS
+
+def required_literal(pattern: str) -> Optional[str]:
+    """Longest literal substring every match of `pattern` must contain
+
+    None when the pattern uses constructs this doesn't reason about
+    (alternation, groups, classes, counted repeats) - such patterns are
+    always checked.
+    """
+    runs, current = [], ""
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\' and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            if nxt in ZERO_WIDTH_OR_CLASS:
+                runs.append(current)
+                current = ""
+            elif nxt.isalnum():
+                return None
+            else:
+                current += nxt
+            i += 2
+            continue
+        if ch in '|()[]{}':
+            return None
+        if ch in '*?':
+            # Previous character is optional (or this is a lazy modifier)
+            current = current[:-1]
+            runs.append(current)
+            current = ""
+        elif ch in '.^$+':
+            runs.append(current)
+            current = ""
+        else:
+            current += ch
+        i += 1
+    runs.append(current)
+
+    longest = max(runs, key=len)
+    return longest or None
 
 class Router:
     """Routes questions to direct facts or AI reasoning"""
-    
-    def __init__(self, vessels_obj):
+
+    def __init__(self, vessels_obj, patterns: Optional[Dict[str, List[str]]] = None):
         self.vessels = vessels_obj.vessels
         self.system_facts = vessels_obj.system_facts
-        self.patterns = self._build_patterns()
-    
+        self.patterns = patterns if patterns is not None else self._build_patterns()
+        self.compile()
+
     def _build_patterns(self) -> Dict:
         """Define patterns for routing questions to facts"""
         return {
@@ -23,46 +83,67 @@ class Router:
             'AI_STORAGE': [r'how.*store', r'what.*database'],
             'AI_EMBEDDING': [r'embedding model', r'what.*embeddings']
         }
-    
+
+    def compile(self) -> None:
+        """Precompile every routable key and index the literals its patterns require
+
+        targets are in priority order (vessels, then system facts, each in
+        pattern order). One scan of the input over the literal index picks
+        the few keys that could match; only those run their compiled
+        regex, lowest index first - same answer as trying every pattern of
+        every key in turn. Call again after vessels or patterns change.
+        """
+        self.targets = []
+        self.anchors: Dict[int, Dict[str, Set[int]]] = {}  # length -> literal -> target indexes
+        self.always: Set[int] = set()
+        self.anchor_count = 0
+
+        for source in (self.vessels, self.system_facts):
+            for key, patterns in self.patterns.items():
+                if key not in source or not patterns:
+                    continue
+                index = len(self.targets)
+                self.targets.append((key, source, re.compile("|".join(f"(?:{p})" for p in patterns))))
+
+                for pattern in patterns:
+                    literal = required_literal(pattern)
+                    if literal is None:
+                        self.always.add(index)
+                        continue
+                    table = self.anchors.setdefault(len(literal), {})
+                    if literal not in table:
+                        self.anchor_count += 1
+                    table.setdefault(literal, set()).add(index)
+
+    def _candidates(self, text: str) -> Set[int]:
+        """Targets whose required literals occur in text (plus unindexed ones)"""
+        candidates = set(self.always)
+        if len(text) * len(self.anchors) <= self.anchor_count * 8:
+            for length, table in self.anchors.items():
+                for start in range(len(text) - length + 1):
+                    hit = table.get(text[start:start + length])
+                    if hit:
+                        candidates |= hit
+        else:
+            # Long input, few literals: substring tests are cheaper than slicing
+            for table in self.anchors.values():
+                for literal, indexes in table.items():
+                    if literal in text:
+                        candidates |= indexes
+        return candidates
+
     def _is_question(self, text: str) -> bool:
-        """Check if input is actually a question"""
-        text_lower = text.lower().strip()
-        
-        if text.endswith('?'):
-            negative_patterns = [
-                r'you know',
-                r'you have',
-                r'thats? creepy',
-                r'creeper',
-                r'why do you',
-                r'how do you know'
-            ]
-            for pattern in negative_patterns:
-                if re.search(pattern, text_lower):
-                    return False
-            return True
-        
-        question_words = ['what', 'where', 'who', 'when', 'why', 'how', 'which']
-        first_word = text_lower.split()[0] if text_lower.split() else ''
-        return first_word in question_words
-    
+        return is_question(text)
+
     def route(self, user_input: str) -> Tuple[Optional[str], Optional[Dict]]:
         """Route question to fact or AI"""
-        if not self._is_question(user_input):
+        if not self.targets or not self._is_question(user_input):
             return None, None
-        
+
         user_lower = user_input.lower()
-        
-        for key, patterns in self.patterns.items():
-            if key in self.vessels:
-                for pattern in patterns:
-                    if re.search(pattern, user_lower):
-                        return key, self.vessels[key]
-        
-        for key, patterns in self.patterns.items():
-            if key in self.system_facts:
-                for pattern in patterns:
-                    if re.search(pattern, user_lower):
-                        return key, self.system_facts[key]
-        
+        for index in sorted(self._candidates(user_lower)):
+            key, source, matcher = self.targets[index]
+            if matcher.search(user_lower):
+                return key, source[key]
+
         return None, None
@@ -0,0 +1,99 @@
+"""Semantic router - match paraphrased questions to fact keys by embedding similarity"""
+import threading
+from typing import Optional, Dict, List, Tuple, Callable
+
+import numpy as np
+
+# Example phrasings per fact key; paraphrases land near these in embedding space
+EXAMPLES = {
+    'USER_NAME': ["what is my name", "what am I called", "who am I", "do you remember my name"],
+    'PROJECT': ["what project am I working on", "what am I building", "what is my current project",
+                "remind me what I'm developing"],
+    'GPU': ["what gpu do I have", "which graphics card am I running on", "how much vram do I have",
+            "what video card is in my machine"],
+    'LOCATION': ["where am I", "what city do I live in", "where am I located", "what's my location"],
+    'AI_NAME': ["what is your name", "who are you", "what should I call you"],
+    'AI_MODEL': ["what model are you", "which llm are you running on", "what language model powers you"],
+    'AI_PURPOSE': ["what do you do", "what is your purpose", "what are you for"],
+    'AI_STORAGE': ["how do you store memories", "what database do you use", "where is our conversation saved"],
+    'AI_EMBEDDING': ["what embedding model do you use", "how do you embed text", "which embeddings do you use"],
+}
+
+class SemanticRouter:
+    """Cosine similarity of a question against precomputed example embeddings
+
+    The example matrix is built on a background thread (the embedding
+    model may still be loading); until it is ready, match() returns
+    nothing and routing falls through to the regex tier.
+    """
+
+    def __init__(self, encode: Callable, threshold: float = 0.75, margin: float = 0.05,
+                 examples: Optional[Dict[str, List[str]]] = None):
+        self.encode = encode
+        self.threshold = threshold
+        self.margin = margin
+        self.examples = examples if examples is not None else EXAMPLES
+        self.matrix = None
+        self.labels: List[str] = []
+        self.error = None
+        self._thread = threading.Thread(target=self._build, daemon=True, name="semantic-router")
+        self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        return self.matrix is not None
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _build(self) -> None:
+        """Embed every example phrasing in one batch"""
+        try:
+            labels = [key for key, phrases in self.examples.items() for _ in phrases]
+            texts = [phrase for phrases in self.examples.values() for phrase in phrases]
+            if texts:
+                matrix = self._normalize(self.encode(texts))
+                self.labels = labels
+                self.matrix = matrix
+        except Exception as e:
+            self.error = e
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self._thread.join(timeout)
+        return self.ready
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Best example similarity per fact key"""
+        if self.matrix is None:
+            return {}
+        query = self._normalize(self.encode(text))
+        best: Dict[str, float] = {}
+        for label, score in zip(self.labels, (self.matrix @ query).tolist()):
+            if score > best.get(label, -1.0):
+                best[label] = score
+        return best
+
+    def match(self, text: str, allowed) -> Tuple[Optional[str], float]:
+        """Best fact key among `allowed`, with its score
+
+        Accepted only at or above threshold and at least `margin` above
+        the best *other* key (loaded or not) - a question that sits
+        between two facts is ambiguous and goes to the LLM instead.
+        """
+        return self.pick(self.scores(text), allowed, self.threshold, self.margin)
+
+    @staticmethod
+    def pick(best: Dict[str, float], allowed, threshold: float, margin: float) -> Tuple[Optional[str], float]:
+        """The acceptance rule behind match(), on precomputed scores() output"""
+        candidates = [(score, key) for key, score in best.items() if key in allowed]
+        if not candidates:
+            return None, 0.0
+
+        score, key = max(candidates)
+        runner_up = max((s for k, s in best.items() if k != key), default=-1.0)
+        if score < threshold or score - runner_up < margin:
+            return None, 0.0
+        return key, score
@@ -6,9 +6,17 @@ from typing import Dict
 class Vessels:
     """Load and manage user vessels and system facts"""
     
-    def __init__(self):
-        self.vessels = self._load_file("memory/memory.txt", "vessel")
-        self.system_facts = self._load_file("memory/system.txt", "system")
+    def __init__(self, memory_path: str = "memory/memory.txt", system_path: str = "memory/system.txt"):
+        self.paths = {'vessel': memory_path, 'system': system_path}
+        self.vessels = self._load_file(memory_path, "vessel")
+        self.system_facts = self._load_file(system_path, "system")
+
+    def reload(self, prefix: str) -> None:
+        """Re-parse one file, updating its dict in place (holders keep their reference)"""
+        facts = self.vessels if prefix == 'vessel' else self.system_facts
+        fresh = self._load_file(self.paths[prefix], prefix)
+        facts.clear()
+        facts.update(fresh)
     
     def _load_file(self, filepath: str, prefix: str) -> Dict:
         """Parse memory file into dictionary"""
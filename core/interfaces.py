@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 
 class StorageInterface(ABC):
     """Abstract storage interface - swap implementations freely"""
@@ -46,6 +46,6 @@ class AIInterface(ABC):
     """Abstract AI inference interface"""
     
     @abstractmethod
-    def generate(self, user_input: str, context: List[Dict[str, Any]]) -> str:
-        """Generate AI response given context"""
+    def generate(self, user_input: str, context: List[Dict[str, Any]]) -> Iterator[str]:
+        """Stream AI response chunks given context"""
         pass
@@ -1,9 +1,22 @@
+import time
+
 import ollama
 
+def warm_up(model_name, keep_alive=None, num_ctx=None):
+    """Load the model into Ollama's memory ahead of the first turn (empty prompt = load only)
+
+    num_ctx must match OllamaLLM's, or the first chat reloads the model.
+    """
+    options = {"num_ctx": num_ctx} if num_ctx else None
+    ollama.generate(model=model_name, prompt="", keep_alive=keep_alive, options=options)
+
 class OllamaLLM:
-    def __init__(self, model_name="deepseek-r1:8b"):
+    def __init__(self, model_name="deepseek-r1:8b", keep_alive=None, num_ctx=None):
         print(f"🤖 Connecting to Ollama with {model_name}...")
         self.model_name = model_name
+        self.keep_alive = keep_alive  # How long Ollama keeps the model (and its KV cache) loaded
+        self.num_ctx = num_ctx  # Context window; None = Ollama's default
+        self.last_stats = {}
         # Test connection
         try:
             ollama.list()
@@ -14,13 +27,93 @@ class OllamaLLM:
             raise
 
     def generate(self, prompt, max_tokens=512):
-        """Generate response using Ollama API"""
+        """Generate response using Ollama API (same options/keep_alive as chat, so no reload)"""
         response = ollama.chat(
             model=self.model_name,
             messages=[{"role": "user", "content": prompt}],
-            options={
-                "temperature": 0.7,
-                "num_predict": max_tokens,
-            }
+            options=self.options(max_tokens),
+            keep_alive=self.keep_alive
         )
         return response['message']['content']
+
+    def options(self, max_tokens=512, temperature=0.7):
+        """Request options; num_ctx must match on every call or Ollama reloads the model"""
+        options = {
+            "temperature": temperature,
+            "num_predict": max_tokens,
+        }
+        if self.num_ctx:
+            options["num_ctx"] = self.num_ctx
+        return options
+
+    def stream_json(self, prompt, max_tokens=256):
+        """Stream a JSON-only reply with thinking off (background extraction)
+
+        Same keep_alive/num_ctx as chat so it never triggers a reload;
+        leaves last_stats (the chat turn's) alone. Closing the generator
+        closes the HTTP stream and stops generation.
+        """
+        response = ollama.chat(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            options=self.options(max_tokens, temperature=0.0),
+            format="json",
+            think=False,
+            stream=True,
+            keep_alive=self.keep_alive
+        )
+        try:
+            for part in response:
+                content = part['message']['content']
+                if content:
+                    yield content
+        finally:
+            close = getattr(response, 'close', None)
+            if close is not None:
+                close()
+
+    def stream(self, prompt, max_tokens=512):
+        """Stream a single-prompt response"""
+        yield from self.stream_chat([{"role": "user", "content": prompt}], max_tokens)
+
+    def stream_chat(self, messages, max_tokens=512):
+        """Stream response chunks for a chat message list as Ollama produces them
+
+        Closing the generator (e.g. on Ctrl-C) closes the HTTP stream,
+        which makes Ollama stop generating. Timing for the finished (or
+        cancelled) call is left in self.last_stats.
+        """
+        self.last_stats = {}
+        start = time.time()
+        first_token_at = None
+        done = False
+        options = self.options(max_tokens)
+
+        try:
+            response = ollama.chat(
+                model=self.model_name,
+                messages=messages,
+                options=options,
+                stream=True,
+                keep_alive=self.keep_alive
+            )
+            for part in response:
+                content = part['message']['content']
+                if content:
+                    if first_token_at is None:
+                        first_token_at = time.time()
+                    yield content
+
+                if part.get('done'):
+                    done = True
+                    # Ollama reports durations in nanoseconds
+                    self.last_stats = {
+                        'eval_count': part.get('eval_count'),
+                        'eval_duration': (part.get('eval_duration') or 0) / 1e9,
+                        'prompt_eval_count': part.get('prompt_eval_count'),
+                        'prompt_eval_duration': (part.get('prompt_eval_duration') or 0) / 1e9,
+                        'load_duration': (part.get('load_duration') or 0) / 1e9,
+                    }
+        finally:
+            self.last_stats['ttft'] = (first_token_at or time.time()) - start
+            self.last_stats['cancelled'] = not done
@@ -0,0 +1,139 @@
+"""Semantic response cache - reuse answers to repeated questions over unchanged context"""
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterator, Optional, Callable, FrozenSet
+
+import numpy as np
+
+from core.interfaces import AIInterface
+from core.context_packer import turn_key
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+def context_keys(query: str, context: List[Dict[str, Any]]) -> FrozenSet[tuple]:
+    """Identity of the turns an answer was grounded in: (conversation_id, timestamp, turn_number)
+
+    Earlier asks of the same question are left out: asking twice shouldn't
+    by itself change the context.
+    """
+    asked = _normalize(query)
+    return frozenset(
+        (t.get('conversation_id') or '', *turn_key(t))
+        for t in context
+        if _normalize(t.get('user', '')) != asked
+    )
+
+def same_context(cached: FrozenSet[tuple], current: FrozenSet[tuple], created: float) -> bool:
+    """Does `current` still match the context an answer cached at `created` saw?
+
+    Turns saved after the answer are ignored - otherwise the recent window,
+    which gains a turn every exchange, would make every repeat a miss.
+    Older turns must all have been part of the cached context; ones that
+    have since slid out of the recent window don't matter.
+    """
+    return all(key in cached for key in current if key[1] <= created)
+
+class ResponseCache:
+    """Query-embedding keyed answers per grounding context, with TTL + LRU eviction"""
+
+    def __init__(self, encode: Callable[[str], np.ndarray], threshold: float = 0.95,
+                 ttl: float = 3600, capacity: int = 256):
+        self.encode = encode
+        self.threshold = threshold
+        self.ttl = ttl
+        self.capacity = capacity
+        self.entries = OrderedDict()  # id -> (context keys, unit vector, answer, created)
+        self.next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _vector(self, query: str) -> np.ndarray:
+        vector = np.asarray(self.encode(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _expire(self, now: float) -> None:
+        expired = [i for i, (_, _, _, created) in self.entries.items() if now - created > self.ttl]
+        for i in expired:
+            del self.entries[i]
+
+    def lookup(self, query: str, keys: FrozenSet[tuple]) -> Optional[str]:
+        """Cached answer for a similar enough query over the same context (see same_context)"""
+        vector = self._vector(query)
+        with self._lock:
+            self._expire(time.time())
+            best_id, best_sim = None, self.threshold
+            for i, (cached_keys, cached, _, created) in self.entries.items():
+                if not same_context(cached_keys, keys, created):
+                    continue
+                sim = float(np.dot(vector, cached))
+                if sim >= best_sim:
+                    best_id, best_sim = i, sim
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(best_id)
+            self.hits += 1
+            return self.entries[best_id][2]
+
+    def store(self, query: str, keys: FrozenSet[tuple], answer: str) -> None:
+        vector = self._vector(query)
+        with self._lock:
+            self.entries[self.next_id] = (keys, vector, answer, time.time())
+            self.next_id += 1
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+class CachedAI(AIInterface):
+    """Wraps an AI engine; repeated questions stream the stored answer instead"""
+
+    def __init__(self, ai: AIInterface, cache: ResponseCache):
+        self.ai = ai
+        self.cache = cache
+        self.last_stats = {}
+
+    def __getattr__(self, name):
+        return getattr(self.ai, name)
+
+    def generate(self, user_input: str, context: List[Dict[str, Any]]) -> Iterator[str]:
+        self.last_stats = {}
+        keys = context_keys(user_input, context)
+
+        try:
+            answer = self.cache.lookup(user_input, keys)
+        except Exception:
+            answer = None  # Embedding unavailable - just generate
+
+        if answer is not None:
+            self.last_stats = {'cache_hit': True}
+            yield answer
+            return
+
+        chunks = []
+        try:
+            for chunk in self.ai.generate(user_input, context):
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            self.last_stats = getattr(self.ai, 'last_stats', None) or {}
+
+        # Only cache complete LLM answers (not vessel facts or cancelled streams)
+        if self.last_stats.get('eval_count') and not self.last_stats.get('cancelled'):
+            try:
+                self.cache.store(user_input, keys, ''.join(chunks))
+            except Exception:
+                pass
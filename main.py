@@ -4,17 +4,60 @@ Winter Assistant - Modular AI Chat System
 Use first user message as conversation title for new conversations
 """
 import sys
+import time
+STARTED_AT = time.perf_counter()  # Before heavy imports, so startup timing includes them
 
 from core.config import Config
 from core.ai_engine import OllamaAI
+from core.llm_ollama import warm_up
+from core.response_cache import ResponseCache, CachedAI
+from core.integrations.memory_injector import MemoryRegistry, FactExtractor
 from storage.lancedb_storage import LanceDBStorage
 from storage.fallback_storage import JSONLStorage
+from storage.maintenance import run_maintenance
+from storage.migration import migrate_embeddings
 from retrieval.hybrid_rag import HybridRAG
 from retrieval.simple_rag import SimpleRAG
 from adapters.conversation_adapter import ConversationAdapter
 from ui.terminal import TerminalUI
 from ui.selection_menu import show_conversation_selector
 from core.errors import StorageError
+from utils.startup import Startup
+from utils.spans import SPANS
+
+def init_storage(config, model_loader=None):
+    """LanceDB, falling back to JSONL"""
+    try:
+        storage = LanceDBStorage(config, model_loader)
+        print("✅ LanceDB storage ready")
+        return storage
+    except StorageError as e:
+        print(f"⚠️  LanceDB failed: {e}")
+        print("📦 Falling back to JSONL storage")
+        return JSONLStorage(config)
+
+def confirm_storage(storage, config):
+    """LanceDB once its embedding model has loaded, falling back to JSONL if it failed"""
+    if not isinstance(storage, LanceDBStorage):
+        return storage
+    try:
+        storage.wait_for_model()
+        return storage
+    except StorageError as e:
+        print(f"⚠️  LanceDB failed: {e}")
+        print("📦 Falling back to JSONL storage")
+        return JSONLStorage(config)
+
+def init_rag(config):
+    """Hybrid RAG, falling back to simple (recency-only) RAG"""
+    try:
+        rag = HybridRAG(config)
+        print("✅ Hybrid RAG (recency + semantic) ready")
+        return rag
+    except Exception as e:
+        print(f"⚠️  Hybrid RAG failed: {e}")
+        print("🔍 Falling back to simple RAG")
+        return SimpleRAG(config)
 
 def main():
     """Main entry point with conversation selector"""
@@ -23,20 +66,47 @@ def main():
 
     # Load configuration
     config = Config.load()
+    SPANS.enabled = config.instrumentation
 
-    # Initialize storage (with fallback)
-    print("📦 Initializing storage...")
-    try:
-        storage = LanceDBStorage(config)
-        print("✅ LanceDB storage ready\n")
-    except StorageError as e:
-        print(f"⚠️  LanceDB failed: {e}")
-        print("📦 Falling back to JSONL storage\n")
-        storage = JSONLStorage(config)
+    # Offline storage maintenance: python main.py --maintain
+    if "--maintain" in sys.argv[1:]:
+        run_maintenance(config)
+        return
+
+    # Re-embed history after changing embedding_model / vector profile:
+    # python main.py --migrate-embeddings [batch_size]
+    if "--migrate-embeddings" in sys.argv[1:]:
+        args = sys.argv[sys.argv.index("--migrate-embeddings") + 1:]
+        batch_size = int(args[0]) if args and args[0].isdigit() else None
+        migrate_embeddings(config, batch_size)
+        return
+
+    # Storage, RAG, AI (+ Ollama warm-up) initialize concurrently; cold start
+    # is the slowest of them rather than their sum
+    print("📦 Initializing storage, RAG and AI...")
+    memory = MemoryRegistry(staging_path=config.fact_staging_path)
+    startup = Startup()
+    startup.start("storage", init_storage, config)
+    startup.start("rag", init_rag, config)
+    startup.start("ai", OllamaAI, config, memory=memory)
+    startup.start("warmup", warm_up, config.model_name, config.ollama_keep_alive, config.context_window)
+
+    # Init messages are buffered so they can't land inside the selector
+    storage = startup.result("storage")
+    print(startup.output("storage"), end="")
 
     # Show conversation selector
     print("🔍 Loading conversations...\n")
-    choice = show_conversation_selector(storage)
+    choice = show_conversation_selector(storage, started_at=STARTED_AT)
+
+    # The embedding model loads while the selector is up; if it failed, LanceDB
+    # can't be used, so choose again from the JSONL history
+    if choice is not None:
+        confirmed = confirm_storage(storage, config)
+        if confirmed is not storage:
+            storage = confirmed
+            if choice != "new":
+                choice = show_conversation_selector(storage)
 
     if choice is None:
         print("\n👋 Goodbye!\n")
@@ -54,37 +124,62 @@ def main():
             print(f"\n⚠️  Failed to load conversation: {e}")
             conversation_title = "Conversation"
 
-    # Initialize RAG (with fallback)
-    print("🔍 Initializing RAG...")
-    try:
-        rag = HybridRAG(config)
-        print("✅ Hybrid RAG (recency + semantic) ready\n")
-    except Exception as e:
-        print(f"⚠️  Hybrid RAG failed: {e}")
-        print("🔍 Falling back to simple RAG\n")
-        rag = SimpleRAG(config)
+    rag = startup.result("rag")
+    print(startup.release("rag", "ai"), end="")
+
+    # Semantic fact routing reuses the storage query embeddings
+    embedder = getattr(storage, 'embedder', None)
+    if config.semantic_routing and embedder is not None:
+        memory.enable_semantic(embedder.encode, config.semantic_route_threshold, config.semantic_route_margin)
 
-    # Initialize AI
-    print("🤖 Initializing AI...")
     try:
-        ai = OllamaAI(config)
+        ai = startup.result("ai")
         print("✅ AI engine ready\n")
+        # Opt-in: facts proposed from saved turns (while the chat is idle) are
+        # staged in config.fact_staging_path for review
+        extractor = None
+        if config.fact_extraction:
+            max_tokens = config.fact_extraction_max_tokens
+            extractor = FactExtractor(
+                memory, lambda prompt: ai.model.stream_json(prompt, max_tokens),
+                batch_size=config.fact_extraction_batch_size,
+                concurrency=config.fact_extraction_concurrency,
+                idle_seconds=config.fact_extraction_idle_seconds
+            )
+        # Opt-in: answers to repeated questions (reuses the storage query embeddings)
+        if config.response_cache and embedder is not None:
+            ai = CachedAI(ai, ResponseCache(
+                embedder.encode,
+                threshold=config.response_cache_threshold,
+                ttl=config.response_cache_ttl,
+                capacity=config.response_cache_size
+            ))
+            print("⚡ Response cache enabled\n")
     except Exception as e:
         print(f"❌ AI initialization failed: {e}")
         sys.exit(1)
 
+    print(f"⏱️  Startup: {startup.summary()}\n")
+
     # Wire everything together
-    adapter = ConversationAdapter(storage, rag, ai)
+    adapter = ConversationAdapter(storage, rag, ai, memory=memory, extractor=extractor)
 
     # Initialize UI with optional placeholder; title will update on first user input
     ui = TerminalUI(adapter, conversation_title or "")
 
-    # Run
+    # Run (always flush queued writes on the way out, including Ctrl-C)
     try:
         ui.run()
     except Exception as e:
         print(f"\n❌ Fatal error: {e}")
         sys.exit(1)
+    finally:
+        if extractor is not None:
+            extractor.close()
+        try:
+            storage.close()
+        except StorageError as e:
+            print(f"\n⚠️  {e}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,70 @@
+"""Score fusion for hybrid retrieval - similarity + recency decay + keyword overlap"""
+import re
+from typing import List, Dict, Any, Set
+
+from core.context_packer import turn_key
+
+STOPWORDS = {
+    'the', 'and', 'for', 'you', 'are', 'was', 'what', 'that', 'this', 'with',
+    'have', 'how', 'did', 'does', 'can', 'about', 'tell', 'from', 'your', 'its',
+}
+
+def terms(text: str) -> Set[str]:
+    return {w for w in re.findall(r"[a-z0-9']+", (text or '').lower()) if len(w) > 2 and w not in STOPWORDS}
+
+def similarity(turn: Dict[str, Any]) -> float:
+    """Cosine similarity from Lance's _distance (0 when the turn wasn't a semantic hit)"""
+    distance = turn.get('_distance')
+    if distance is None or distance != distance:  # missing / NaN
+        return 0.0
+    return min(1.0, max(0.0, 1.0 - distance))
+
+def fuse(query: str, recent: List[Dict[str, Any]], relevant: List[Dict[str, Any]],
+         config) -> List[Dict[str, Any]]:
+    """Merge both legs and attach a fused score to every turn, best first
+
+    score = w_sem * similarity + w_rec * 0.5^(turns_back / half_life) + w_kw * keyword overlap
+    """
+    merged = {}
+    for turn in recent + relevant:
+        key = turn_key(turn)
+        if key in merged:
+            # Keep the semantic leg's distance for turns both legs returned
+            if '_distance' in turn and similarity(turn) > similarity(merged[key]):
+                merged[key] = dict(merged[key], _distance=turn['_distance'])
+            continue
+        merged[key] = dict(turn)
+
+    if not merged:
+        return []
+
+    query_terms = terms(query)
+    latest = max(t.get('turn_number', 0) for t in merged.values())
+    half_life = max(config.rag_recency_half_life, 1e-6)
+
+    for turn in merged.values():
+        recency = 0.5 ** (max(0, latest - turn.get('turn_number', 0)) / half_life)
+        keyword = 0.0
+        if query_terms:
+            text_terms = terms(f"{turn.get('user', '')} {turn.get('assistant', '')}")
+            keyword = len(query_terms & text_terms) / len(query_terms)
+
+        turn['score'] = (
+            config.rag_weight_semantic * similarity(turn)
+            + config.rag_weight_recency * recency
+            + config.rag_weight_keyword * keyword
+        )
+
+    return sorted(merged.values(), key=lambda t: (t['score'], t.get('timestamp', 0)), reverse=True)
+
+def select(fused: List[Dict[str, Any]], recent: List[Dict[str, Any]], limit: int,
+           keep_recent: int) -> List[Dict[str, Any]]:
+    """Best `limit` fused turns, always including the newest `keep_recent` of the recent leg
+
+    Strong semantic hits must not push out the previous exchange - the chat
+    transcript is built from what retrieval returns.
+    """
+    keep = {turn_key(t) for t in sorted(recent, key=turn_key)[-keep_recent:]} if keep_recent > 0 else set()
+    kept = [t for t in fused if turn_key(t) in keep]
+    others = [t for t in fused if turn_key(t) not in keep]
+    return kept + others[:max(0, limit - len(kept))]
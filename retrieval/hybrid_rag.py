@@ -1,46 +1,77 @@
 """Hybrid RAG: Recency + Semantic search"""
-from typing import List, Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import List, Dict, Any, Callable, Tuple
 
 from retrieval.base import BaseRAG
+from retrieval.fusion import fuse, select
 from core.interfaces import StorageInterface
 from core.errors import RAGError
+from utils.spans import SPANS
+
+def _timed(leg: Callable[[], List[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], float]:
+    start = time.perf_counter()
+    return leg(), time.perf_counter() - start
 
 class HybridRAG(BaseRAG):
     """Combines recent context with semantic search"""
-    
+
+    def __init__(self, config):
+        super().__init__(config)
+        # Shared across calls; extra workers so a stalled search can't block the next turn
+        self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag")
+        self.last_timings = {}
+
+    def _collect(self, future, deadline: float, start: float, leg: str) -> List[Dict[str, Any]]:
+        """Result of one leg, or [] if it failed or missed its deadline (seconds from start)"""
+        try:
+            remaining = max(0.0, deadline - (time.perf_counter() - start))
+            results, elapsed = future.result(timeout=remaining)
+            self.last_timings[leg] = elapsed
+            return results
+        except FutureTimeout:
+            # Left running in the pool; its result is simply ignored
+            self.last_timings[leg] = time.perf_counter() - start
+            self.last_timings[f'{leg}_timed_out'] = True
+            return []
+        except Exception:
+            self.last_timings[f'{leg}_failed'] = True
+            return []
+
     def retrieve(self, query: str, storage: StorageInterface, limit: int) -> List[Dict[str, Any]]:
-        """Hybrid retrieval: recent + relevant"""
+        """Hybrid retrieval: top `limit` turns by fused score, returned in time order
+
+        The newest config.rag_keep_recent turns are always included.
+
+        The recency and semantic legs run concurrently; if the semantic leg
+        (query embedding + vector scan) misses its deadline, results
+        degrade to recency only.
+        """
         try:
-            # Get recent turns
-            recent = storage.get_recent(self.config.rag_recent_limit)
-            
-            # Get semantically relevant turns
-            try:
-                relevant = storage.search(query, self.config.rag_semantic_limit)
-            except:
-                # If semantic search fails, just use recent
-                return recent
-            
-            # Deduplicate by turn_number + timestamp
-            seen = set()
-            combined = []
-            
-            for turn in recent:
-                key = f"{turn.get('timestamp', 0)}_{turn.get('turn_number', 0)}"
-                if key not in seen:
-                    seen.add(key)
-                    combined.append(turn)
-            
-            for turn in relevant:
-                key = f"{turn.get('timestamp', 0)}_{turn.get('turn_number', 0)}"
-                if key not in seen:
-                    seen.add(key)
-                    combined.append(turn)
-            
-            # Sort by timestamp
-            combined.sort(key=lambda x: x.get('timestamp', 0))
-            
-            return combined[-limit:] if combined else []
-            
+            self.last_timings = {}
+            start = time.perf_counter()
+
+            recent_future = self.pool.submit(_timed, lambda: storage.get_recent(self.config.rag_recent_limit))
+            semantic_future = self.pool.submit(_timed, lambda: storage.search(query, self.config.rag_semantic_limit))
+
+            # Deadlines count from submission, so the legs overlap rather than add up
+            recent = self._collect(recent_future, self.config.rag_recent_timeout, start, 'recent')
+            relevant = self._collect(semantic_future, self.config.rag_semantic_timeout, start, 'semantic')
+
+            if self.last_timings.get('recent_failed'):
+                # Recent context comes straight from storage - surface real errors
+                recent = storage.get_recent(self.config.rag_recent_limit)
+
+            # Cut by score, not by timestamp, so strong semantic hits survive -
+            # but never at the cost of the last few turns
+            ranked = select(fuse(query, recent, relevant, self.config), recent, limit,
+                            min(self.config.rag_keep_recent, limit))
+            ranked.sort(key=lambda x: x.get('timestamp', 0))
+
+            self.last_timings['total'] = time.perf_counter() - start
+            SPANS.record('rag.recent', self.last_timings.get('recent'))
+            SPANS.record('rag.semantic', self.last_timings.get('semantic'))
+            return ranked
+
         except Exception as e:
             raise RAGError(f"Hybrid RAG failed: {e}")
@@ -19,6 +19,19 @@ class BaseStorage(StorageInterface):
         """Set current conversation"""
         self.conversation_id = conversation_id
     
+    @abstractmethod
+    def get_perf_metrics(self, all_history: bool = False):
+        """Per-turn timing columns (pyarrow.Table) for the perf command"""
+        pass
+
+    def flush(self) -> None:
+        """Wait for pending writes (no-op for synchronous backends)"""
+        pass
+
+    def close(self) -> None:
+        """Flush and release resources before exit"""
+        self.flush()
+
     @abstractmethod
     def list_all_conversations(self) -> List[Dict[str, Any]]:
         """List all conversations with metadata"""
@@ -0,0 +1,97 @@
+"""Conversation catalog - one summary row per conversation"""
+from typing import List, Dict, Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+CATALOG_TABLE = 'conversation_catalog'
+
+CATALOG_SCHEMA = pa.schema([
+    pa.field('conversation_id', pa.string()),
+    pa.field('title', pa.string()),
+    pa.field('project', pa.string()),
+    pa.field('turn_count', pa.int64()),
+    pa.field('first_timestamp', pa.float64()),
+    pa.field('last_timestamp', pa.float64()),
+])
+
+class ConversationCatalog:
+    """Incrementally maintained listing of conversations, kept beside the turns table"""
+
+    def __init__(self, db, turns_table):
+        try:
+            self.table = db.open_table(CATALOG_TABLE)
+        except Exception:
+            self.table = db.create_table(CATALOG_TABLE, self._backfill(turns_table), schema=CATALOG_SCHEMA)
+            return
+
+        # Turns and catalog are written by separate commits; a crash between
+        # them leaves the catalog behind, so re-derive it when counts disagree
+        if not self.is_consistent(turns_table):
+            print("🔧 Conversation catalog out of sync with history - rebuilding")
+            self.table = db.create_table(
+                CATALOG_TABLE, self._backfill(turns_table), schema=CATALOG_SCHEMA, mode='overwrite'
+            )
+
+    def is_consistent(self, turns_table) -> bool:
+        """Catalog turn counts add up to the (non-orphan) rows in the turns table"""
+        expected = turns_table.count_rows() - turns_table.count_rows("conversation_id = ''")
+        counts = self.table.to_arrow().column('turn_count')
+        recorded = pc.sum(counts).as_py() or 0
+        return recorded == expected
+
+    @staticmethod
+    def _backfill(turns_table) -> pa.Table:
+        """Build catalog rows from existing turns (one-time, scalar columns only)"""
+        count = turns_table.count_rows()
+        if count == 0:
+            return CATALOG_SCHEMA.empty_table()
+
+        turns = turns_table.search() \
+            .select(['conversation_id', 'title', 'project', 'timestamp', 'turn_number']) \
+            .limit(count).to_arrow()
+        turns = turns.filter(pc.not_equal(turns['conversation_id'], ''))
+        if turns.num_rows == 0:
+            return CATALOG_SCHEMA.empty_table()
+
+        # Same rule as record_turn: title from the first turn, project from the latest
+        turns = turns.sort_by([('conversation_id', 'ascending'), ('turn_number', 'ascending')])
+        grouped = turns.group_by('conversation_id', use_threads=False).aggregate([
+            ('title', 'first'),
+            ('project', 'last'),
+            ('timestamp', 'count'),
+            ('timestamp', 'min'),
+            ('timestamp', 'max'),
+        ])
+        return pa.table({
+            'conversation_id': grouped['conversation_id'],
+            'title': grouped['title_first'],
+            'project': grouped['project_last'],
+            'turn_count': grouped['timestamp_count'].cast(pa.int64()),
+            'first_timestamp': grouped['timestamp_min'],
+            'last_timestamp': grouped['timestamp_max'],
+        }, schema=CATALOG_SCHEMA)
+
+    def record_turn(self, conversation_id: str, title: str, project: str,
+                    turn_count: int, first_timestamp: float, last_timestamp: float) -> None:
+        """Upsert the summary row for a conversation in a single commit (project = latest turn's)"""
+        row = pa.Table.from_pylist([{
+            'conversation_id': conversation_id,
+            'title': title,
+            'project': project,
+            'turn_count': turn_count,
+            'first_timestamp': first_timestamp,
+            'last_timestamp': last_timestamp,
+        }], schema=CATALOG_SCHEMA)
+
+        self.table.merge_insert('conversation_id') \
+            .when_matched_update_all() \
+            .when_not_matched_insert_all() \
+            .execute(row)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """All catalog rows, newest activity first"""
+        rows = self.table.to_arrow()
+        if rows.num_rows == 0:
+            return []
+        return rows.sort_by([('last_timestamp', 'descending')]).to_pylist()
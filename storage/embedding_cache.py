@@ -0,0 +1,206 @@
+"""Embedding cache - memory LRU + Lance table, keyed by (model, text hash)"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+
+from storage.write_behind import WriteBehindQueue
+
+EMBEDDING_CACHE_TABLE = 'embedding_cache'
+CACHE_COLUMNS = {'key', 'model', 'created', 'vector'}
+PRUNE_EVERY = 256
+
+class EmbeddingCache:
+    """Drop-in wrapper around model.encode that never embeds the same query twice
+
+    Only repeatable texts (search queries, router phrases, cached
+    questions) go through the tiers; encode(..., cache=False) is for
+    one-off texts such as turns being saved. The disk tier is looked up
+    through the BTREE index on `key`, written in background batches and
+    pruned there: rows from another model, older than `ttl` or beyond
+    `max_rows` (oldest first) are deleted.
+    """
+
+    def __init__(self, model, model_name: str, db=None, capacity: int = 4096,
+                 on_table_created: Optional[Callable] = None, max_rows: int = 50000,
+                 ttl: float = 30 * 86400):
+        self.model = model
+        self.model_name = model_name
+        self.db = db
+        self.capacity = capacity
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.memory = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.on_table_created = on_table_created  # e.g. register with StorageMaintenance
+
+        self.table = None
+        self.writer = None
+        self._written = 0
+        self._next_prune = 0  # prune on the first write of a session, then every PRUNE_EVERY rows
+        if db is not None:
+            try:
+                table = db.open_table(EMBEDDING_CACHE_TABLE)
+                # Tables from before the model/created columns are rebuilt on first write
+                if CACHE_COLUMNS <= set(table.schema.names):
+                    self.table = table
+            except Exception:
+                pass
+            # New embeddings reach disk in background batches, never inside encode()
+            self.writer = WriteBehindQueue(self._save_batch, maxsize=1024, batch_size=256,
+                                          retries=0, keep_lost=False)
+
+    def _key(self, text: str) -> str:
+        """Hash of model name + whitespace-normalized text"""
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{self.model_name}\0{normalized}".encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self.memory[key] = vector
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def _load_from_disk(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Batch lookup in the on-disk tier (served by the key index)"""
+        table = self.table
+        if table is None or not keys:
+            return {}
+        key_list = ", ".join(f"'{k}'" for k in keys)
+        rows = table.search() \
+            .where(f"key IN ({key_list})") \
+            .select(['key', 'vector']) \
+            .limit(len(keys)).to_arrow()
+        return {
+            key: np.asarray(vector, dtype=np.float32)
+            for key, vector in zip(rows['key'].to_pylist(), rows['vector'].to_pylist())
+        }
+
+    def _save_batch(self, items: List[Tuple[str, np.ndarray]]) -> None:
+        """Write-behind callback: one table.add for everything queued, then prune"""
+        self._save_to_disk(dict(items))
+        self._written += len(items)
+        if self._written >= self._next_prune:
+            self._next_prune = self._written + PRUNE_EVERY
+            self.prune()
+
+    def _save_to_disk(self, entries: Dict[str, np.ndarray]) -> None:
+        """Persist new embeddings (table is created on first write, sized to the model)"""
+        if self.db is None or not entries:
+            return
+        dims = len(next(iter(entries.values())))
+        data = pa.table({
+            'key': pa.array(list(entries.keys()), pa.string()),
+            'model': pa.array([self.model_name] * len(entries), pa.string()),
+            'created': pa.array([time.time()] * len(entries), pa.float64()),
+            'vector': pa.array(
+                [v.tolist() for v in entries.values()],
+                pa.list_(pa.float32(), dims)
+            ),
+        })
+        if self.table is None:
+            table = self.db.create_table(EMBEDDING_CACHE_TABLE, data, mode='overwrite')
+            table.create_scalar_index('key', index_type='BTREE')
+            self.table = table
+            if self.on_table_created is not None:
+                self.on_table_created(table)
+        else:
+            self.table.add(data)
+
+    def prune(self) -> int:
+        """Delete other-model, expired and over-capacity rows; returns how many went"""
+        table = self.table
+        if table is None:
+            return 0
+        before = table.count_rows()
+        model = self.model_name.replace("'", "''")
+        stale = f"model != '{model}' OR created < {time.time() - self.ttl}"
+        if table.count_rows(stale):
+            table.delete(stale)
+
+        excess = table.count_rows() - self.max_rows
+        if excess > 0:
+            created = table.search().select(['created']).limit(table.count_rows()).to_arrow()['created']
+            cutoff = np.partition(created.to_numpy(), excess)[excess].item()
+            table.delete(f"created < {cutoff!r}")
+        return before - table.count_rows()
+
+    def encode(self, texts: Union[str, List[str]], cache: bool = True) -> np.ndarray:
+        """Same contract as SentenceTransformer.encode for a str or list of str
+
+        cache=False embeds straight through (texts that won't be seen again).
+        """
+        if not cache:
+            return np.asarray(self.model.encode(texts), dtype=np.float32)
+
+        single = isinstance(texts, str)
+        items = [texts] if single else list(texts)
+        keys = [self._key(t) for t in items]
+        found = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    found[key] = self.memory[key]
+                    self.memory_hits += 1
+
+        missing = [k for k in dict.fromkeys(keys) if k not in found]
+        if missing:
+            try:
+                from_disk = self._load_from_disk(missing)
+            except Exception:
+                from_disk = {}  # Disk tier is best-effort; fall through to encode
+            found.update(from_disk)
+            self.disk_hits += len(from_disk)
+
+            to_encode = {}
+            for key, text in zip(keys, items):
+                if key not in found and key not in to_encode:
+                    to_encode[key] = text
+
+            if to_encode:
+                vectors = self.model.encode(list(to_encode.values()))
+                fresh = {key: np.asarray(v, dtype=np.float32) for key, v in zip(to_encode, vectors)}
+                found.update(fresh)
+                self.misses += len(fresh)
+                if self.writer is not None:
+                    for item in fresh.items():
+                        # Best-effort tier: drop rather than stall the caller when backed up
+                        if not self.writer.offer(item):
+                            break
+
+            with self._lock:
+                for key in missing:
+                    self._remember(key, found[key])
+
+        vectors = np.stack([found[k] for k in keys])
+        return vectors[0] if single else vectors
+
+    def flush(self) -> None:
+        """Wait for queued embeddings to reach disk"""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        """Write out queued embeddings and stop the background writer"""
+        if self.writer is not None:
+            self.writer.close()
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Hit/miss counters"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else None,
+            'memory_entries': len(self.memory),
+        }
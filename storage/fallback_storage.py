@@ -1,5 +1,4 @@
 """Simple JSONL fallback storage - no embeddings required"""
-import json
 import os
 import time
 from datetime import datetime
@@ -7,6 +6,8 @@ from typing import List, Dict, Any
 import uuid
 
 from storage.base import BaseStorage
+from storage.jsonl_index import JSONLOffsetIndex
+from core.context_packer import count_turn_tokens
 from core.errors import StorageError
 
 class JSONLStorage(BaseStorage):
@@ -14,42 +15,19 @@ class JSONLStorage(BaseStorage):
     
     def __init__(self, config):
         super().__init__(config)
-        self.storage_dir = "./conversations_fallback"
+        self.storage_dir = config.conv_history_path
         os.makedirs(self.storage_dir, exist_ok=True)
         
         self.conversation_id = None
         self.session = int(time.time())
         self.turn_number = 0
         self.file_path = f"{self.storage_dir}/all_conversations.jsonl"
+        self.index = JSONLOffsetIndex(self.file_path, f"{self.storage_dir}/all_conversations.idx.jsonl")
     
     def list_all_conversations(self) -> List[Dict[str, Any]]:
         """List all conversations"""
         try:
-            if not os.path.exists(self.file_path):
-                return []
-            
-            with open(self.file_path, 'r') as f:
-                lines = f.readlines()
-            
-            turns = [json.loads(l) for l in lines if l.strip()]
-            
-            # Group by conversation_id
-            conversations = {}
-            for turn in turns:
-                conv_id = turn['conversation_id']
-                if conv_id not in conversations:
-                    conversations[conv_id] = {
-                        'conversation_id': conv_id,
-                        'title': turn.get('title', 'Untitled'),
-                        'turn_count': 0,
-                        'last_updated': turn['datetime'],
-                        'timestamp': turn['timestamp']
-                    }
-                conversations[conv_id]['turn_count'] += 1
-                if turn['timestamp'] > conversations[conv_id]['timestamp']:
-                    conversations[conv_id]['last_updated'] = turn['datetime']
-            
-            conv_list = list(conversations.values())
+            conv_list = self.index.conversations()
             conv_list.sort(key=lambda x: x['timestamp'], reverse=True)
             return conv_list
         except Exception as e:
@@ -76,8 +54,8 @@ class JSONLStorage(BaseStorage):
                 words = user_msg.split()[:3]
                 title = " ".join(words) if words else "Conversation"
             else:
-                turns = self.get_all_turns()
-                title = turns[0].get('title', 'Conversation') if turns else 'Conversation'
+                meta = self.index.meta.get(self.conversation_id)
+                title = meta['title'] if meta else 'Conversation'
             
             turn = {
                 "conversation_id": self.conversation_id,
@@ -89,31 +67,39 @@ class JSONLStorage(BaseStorage):
                 "turn_number": self.turn_number,
                 "user": user_msg,
                 "assistant": ai_msg,
-                "elapsed": metadata.get('elapsed', 0.0)
+                "elapsed": metadata.get('elapsed', 0.0),
+                "ttft": metadata.get('ttft', 0.0),
+                "generation_time": metadata.get('generation_time', 0.0),
+                "tokens": metadata.get('tokens', 0),
+                "tokens_per_sec": metadata.get('tokens_per_sec', 0.0),
+                "context_tokens": count_turn_tokens(user_msg, ai_msg)
             }
             
-            with open(self.file_path, 'a') as f:
-                f.write(json.dumps(turn) + '\n')
+            self.index.append(turn)
             
             self.turn_number += 1
         except Exception as e:
             raise StorageError(f"JSONL save failed: {e}")
     
+    def get_perf_metrics(self, all_history: bool = False):
+        """Per-turn timing columns as an Arrow table (current conversation or everything)"""
+        import pyarrow as pa
+
+        if all_history:
+            turns = [t for conv_id in self.index.offsets for t in self.index.read(conv_id)]
+        else:
+            turns = self.get_all_turns()
+
+        columns = ['conversation_id', 'elapsed', 'ttft', 'generation_time', 'tokens', 'tokens_per_sec']
+        return pa.table({c: [t.get(c, 0) for t in turns] for c in columns})
+
     def get_recent(self, limit: int) -> List[Dict[str, Any]]:
         """Get recent turns"""
         try:
             if self.conversation_id is None:
                 return []
             
-            if not os.path.exists(self.file_path):
-                return []
-            
-            with open(self.file_path, 'r') as f:
-                lines = f.readlines()
-            
-            turns = [json.loads(l) for l in lines if l.strip()]
-            conv_turns = [t for t in turns if t['conversation_id'] == self.conversation_id]
-            return conv_turns[-limit:]
+            return self.index.read(self.conversation_id, limit)
         except Exception as e:
             return []
     
@@ -0,0 +1,100 @@
+"""Index manager - scalar + ANN indexes for the conversations table"""
+import math
+import threading
+
+# Column -> scalar index type. project has few distinct values, so bitmap fits it.
+SCALAR_INDEXES = {
+    'conversation_id': 'BTREE',
+    'project': 'BITMAP',
+    'timestamp': 'BTREE',
+}
+
+class IndexManager:
+    """Creates indexes once and keeps them current as turns are added"""
+
+    def __init__(self, table, config):
+        self.table = table
+        self.config = config
+        self.row_count = table.count_rows()
+        self.pending = 0
+        self.lock = threading.Lock()
+        self._worker = None
+
+    def _indexed_columns(self) -> set:
+        """Columns that already have an index"""
+        columns = set()
+        for index in self.table.list_indices():
+            columns.update(index.columns)
+        return columns
+
+    def _needs_vector_index(self, indexed: set) -> bool:
+        """Brute-force scans are fine until the table crosses the threshold"""
+        return 'vector' not in indexed and self.row_count >= self.config.vector_index_threshold
+
+    def ensure_indexes(self) -> None:
+        """Create missing scalar indexes now; train the vector index in the background"""
+        indexed = self._indexed_columns()
+
+        for column, index_type in SCALAR_INDEXES.items():
+            if column not in indexed:
+                self.table.create_scalar_index(column, index_type=index_type, replace=False)
+
+        if self._needs_vector_index(indexed):
+            self._start_refresh()
+
+    def _build_vector_index(self) -> None:
+        """Train the ANN index (partitions scale with sqrt of row count)"""
+        dims = self.table.schema.field('vector').type.list_size
+        num_partitions = max(1, int(math.sqrt(self.row_count)))
+
+        if self.config.vector_index_type in ('IVF_SQ', 'IVF_HNSW_SQ'):
+            # int8 scalar quantization lives in the index; Lance can't
+            # vector-search a raw int8 column with float queries
+            self.table.create_index(
+                metric='cosine',
+                index_type=self.config.vector_index_type,
+                num_partitions=num_partitions,
+            )
+        else:
+            self.table.create_index(
+                metric='cosine',
+                index_type='IVF_PQ',
+                num_partitions=num_partitions,
+                num_sub_vectors=max(1, dims // 16),
+            )
+
+    def record_added(self, count: int = 1) -> None:
+        """Note new rows; refresh indexes in the background every few turns"""
+        self.row_count += count
+        self.pending += count
+
+        if self.pending >= self.config.index_refresh_interval:
+            self._start_refresh()
+
+    def _start_refresh(self) -> None:
+        """Run one refresh on a worker thread (no-op if one is already running)"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        self.pending = 0
+        self._worker = threading.Thread(target=self._refresh, daemon=True)
+        self._worker.start()
+
+    def _refresh(self) -> None:
+        """Train the vector index if due, otherwise fold new rows into existing indexes"""
+        with self.lock:
+            try:
+                indexed = self._indexed_columns()
+                if self._needs_vector_index(indexed):
+                    self._build_vector_index()
+                elif indexed:
+                    # optimize() appends new fragments to existing indexes
+                    # without retraining them
+                    self.table.optimize()
+            except Exception as e:
+                print(f"\n⚠️  Index refresh failed: {e}")
+
+    def wait(self) -> None:
+        """Block until a running refresh finishes"""
+        if self._worker is not None:
+            self._worker.join()
@@ -0,0 +1,142 @@
+"""Offset index for the JSONL fallback - conversation_id -> byte offsets"""
+import json
+import os
+from typing import List, Dict, Any, Optional, Tuple
+
+class JSONLOffsetIndex:
+    """Append-only sidecar mapping each conversation to its line offsets in the data file"""
+
+    def __init__(self, data_path: str, index_path: str):
+        self.data_path = data_path
+        self.index_path = index_path
+        self.offsets: Dict[str, List[Tuple[int, int]]] = {}
+        self.meta: Dict[str, Dict[str, Any]] = {}
+        self.indexed_size = 0
+        self._load()
+
+    def _reset(self):
+        self.offsets = {}
+        self.meta = {}
+        self.indexed_size = 0
+
+    def _add(self, turn: Dict[str, Any], offset: int, length: int) -> None:
+        """Index one data line in memory"""
+        conv_id = turn['conversation_id']
+        self.offsets.setdefault(conv_id, []).append((offset, length))
+
+        meta = self.meta.get(conv_id)
+        if meta is None:
+            meta = self.meta[conv_id] = {
+                'conversation_id': conv_id,
+                'title': turn.get('title', 'Untitled'),
+                'turn_count': 0,
+                'last_updated': turn.get('datetime', ''),
+                'timestamp': turn.get('timestamp', 0.0)
+            }
+        meta['turn_count'] += 1
+        if turn.get('timestamp', 0.0) >= meta['timestamp']:
+            meta['timestamp'] = turn.get('timestamp', 0.0)
+            meta['last_updated'] = turn.get('datetime', meta['last_updated'])
+
+        self.indexed_size = max(self.indexed_size, offset + length)
+
+    @staticmethod
+    def _entry(turn: Dict[str, Any], offset: int, length: int) -> str:
+        return json.dumps({
+            'conversation_id': turn['conversation_id'],
+            'title': turn.get('title', 'Untitled'),
+            'timestamp': turn.get('timestamp', 0.0),
+            'datetime': turn.get('datetime', ''),
+            'offset': offset,
+            'length': length
+        }) + '\n'
+
+    def _load(self) -> None:
+        """Read the sidecar, then reconcile it with the data file"""
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self._add(entry, entry['offset'], entry['length'])
+            except (OSError, ValueError, KeyError):
+                # Corrupt sidecar: discard it rather than appending to it
+                self.rebuild()
+                return
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Catch up on lines appended elsewhere; rebuild if the data file shrank"""
+        data_size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+
+        if data_size < self.indexed_size:
+            self.rebuild()
+        elif data_size > self.indexed_size:
+            self._scan_from(self.indexed_size)
+
+    def rebuild(self) -> None:
+        """Re-index the whole data file from scratch"""
+        self._reset()
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        self._scan_from(0)
+
+    def _scan_from(self, start: int) -> None:
+        """Index data lines from byte `start` to EOF and append them to the sidecar"""
+        if not os.path.exists(self.data_path):
+            return
+
+        entries = []
+        with open(self.data_path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for raw in f:
+                length = len(raw)
+                if raw.strip():
+                    try:
+                        turn = json.loads(raw)
+                        self._add(turn, offset, length)
+                        entries.append(self._entry(turn, offset, length))
+                    except ValueError:
+                        pass  # Torn line from an interrupted write - skip it
+                offset += length
+            self.indexed_size = offset
+
+        if entries:
+            with open(self.index_path, 'a') as f:
+                f.writelines(entries)
+
+    def append(self, turn: Dict[str, Any]) -> None:
+        """Append a turn to the data file and index it in the same step"""
+        self.refresh()
+        line = (json.dumps(turn) + '\n').encode('utf-8')
+
+        with open(self.data_path, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(line)
+
+        self._add(turn, offset, len(line))
+        with open(self.index_path, 'a') as f:
+            f.write(self._entry(turn, offset, len(line)))
+
+    def read(self, conversation_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Turns for one conversation (the last `limit` if given), seeking straight to each line"""
+        self.refresh()
+        offsets = self.offsets.get(conversation_id, [])
+        if limit is not None:
+            offsets = offsets[-limit:] if limit > 0 else []
+        if not offsets:
+            return []
+
+        turns = []
+        with open(self.data_path, 'rb') as f:
+            for offset, length in offsets:
+                f.seek(offset)
+                turns.append(json.loads(f.read(length)))
+        return turns
+
+    def conversations(self) -> List[Dict[str, Any]]:
+        """Per-conversation summaries, no data file reads"""
+        self.refresh()
+        return [dict(meta) for meta in self.meta.values()]
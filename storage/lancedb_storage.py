@@ -4,54 +4,165 @@ os.environ["HF_HUB_OFFLINE"] = "1"
 os.environ["TRANSFORMERS_OFFLINE"] = "1"
 
 import lancedb
+import importlib.util
+import pyarrow as pa
 import uuid
 import time
 import os
 from datetime import datetime
-from typing import List, Dict, Any
-from sentence_transformers import SentenceTransformer
+from typing import List, Dict, Any, Optional
 
 from storage.base import BaseStorage
+from storage.turn_cache import TurnCache
+from storage.conversation_catalog import ConversationCatalog
+from storage.index_manager import IndexManager
+from storage.write_behind import WriteBehindQueue
+from storage.maintenance import StorageMaintenance
+from storage.embedding_cache import EmbeddingCache
+from storage.lazy_model import LazyModel
+from storage.vector_profile import VectorProfile
+from storage.migration import read_active_table
+from core.context_packer import count_turn_tokens
 from core.errors import StorageError
+from utils.spans import SPANS
+
+def turn_schema(profile: VectorProfile) -> pa.Schema:
+    """Arrow schema of the conversations table"""
+    return pa.schema([
+        pa.field("conversation_id", pa.string()),
+        pa.field("title", pa.string()),
+        pa.field("timestamp", pa.float64()),
+        pa.field("datetime", pa.string()),
+        pa.field("session", pa.int64()),
+        pa.field("project", pa.string()),
+        pa.field("turn_number", pa.int64()),
+        pa.field("user", pa.string()),
+        pa.field("assistant", pa.string()),
+        pa.field("elapsed", pa.float64()),
+        pa.field("ttft", pa.float64()),
+        pa.field("generation_time", pa.float64()),
+        pa.field("tokens", pa.int64()),
+        pa.field("tokens_per_sec", pa.float64()),
+        pa.field("context_tokens", pa.int64()),
+        pa.field("vector", profile.arrow_type),
+    ])
+
+# SQL defaults used when adding columns to tables created before they existed
+COLUMN_DEFAULTS = {
+    pa.float64(): "CAST(0.0 AS DOUBLE)",
+    pa.int64(): "CAST(0 AS BIGINT)",
+}
+
+PERF_COLUMNS = ['conversation_id', 'elapsed', 'ttft', 'generation_time', 'tokens', 'tokens_per_sec']
 
 class LanceDBStorage(BaseStorage):
     """LanceDB vector storage with embeddings"""
 
-    def __init__(self, config):
+    def __init__(self, config, model_loader=None):
         super().__init__(config)
 
         try:
-            print("🔄 Loading embedding model...")
-            self.model = SentenceTransformer(config.embedding_model, local_files_only=True)
+            # model_loader: zero-arg callable returning an object with encode()
+            # (benchmarks pass a stub); default is config.embedding_model
+            if model_loader is None:
+                if importlib.util.find_spec("sentence_transformers") is None:
+                    raise StorageError("sentence-transformers is not installed")
+                model_loader = lambda: self._load_model(config.embedding_model)
+
+            # Import + load happen off the main thread; first encode() waits if needed
+            print("🔄 Loading embedding model in background...")
+            self.model = LazyModel(model_loader)
 
             os.makedirs(config.storage_path, exist_ok=True)
             self.db = lancedb.connect(config.storage_path)
 
+            self.profile = VectorProfile.from_config(config)
+            active = read_active_table(config.storage_path)
             try:
-                self.table = self.db.open_table('conversations')
+                self.table = self.db.open_table(active['table'])
             except:
-                schema = {
-                    "conversation_id": "",
-                    "title": "",
-                    "timestamp": 0.0,
-                    "datetime": "",
-                    "session": 0,
-                    "project": "",
-                    "turn_number": 0,
-                    "user": "",
-                    "assistant": "",
-                    "elapsed": 0.0,
-                    "vector": [0.0] * 1024
-                }
-                self.table = self.db.create_table('conversations', [schema])
+                self.table = self.db.create_table(active['table'], schema=turn_schema(self.profile))
+
+            # Older tables predate the per-turn perf / token-count columns
+            missing = {
+                f.name: COLUMN_DEFAULTS[f.type]
+                for f in turn_schema(self.profile)
+                if f.name not in self.table.schema.names and f.type in COLUMN_DEFAULTS
+            }
+            if missing:
+                self.table.add_columns(missing)
+
+            # An existing table keeps the model/profile it was written with until migrated
+            vector_field = self.table.schema.field('vector')
+            if not self.profile.matches(vector_field):
+                stored = VectorProfile.from_field(vector_field)
+                print(f"⚠️  Vector profile {self.profile} differs from stored {stored}; using stored")
+                print("💡 Run 'python main.py --migrate-embeddings' to re-embed history")
+                self.profile = stored
+            elif active.get('embedding_model', config.embedding_model) != config.embedding_model:
+                print(f"⚠️  History was embedded with {active['embedding_model']}, config uses {config.embedding_model}")
+                print("💡 Run 'python main.py --migrate-embeddings' to re-embed history")
+
+            self.catalog = ConversationCatalog(self.db, self.table)
+            self.embedder = EmbeddingCache(
+                self.model, config.embedding_model,
+                db=self.db if config.embedding_cache_disk else None,
+                capacity=config.embedding_cache_size,
+                max_rows=config.embedding_cache_disk_rows,
+                ttl=config.embedding_cache_ttl_days * 86400
+            )
+            self.indexes = IndexManager(self.table, config)
+            self.indexes.ensure_indexes()
+
+            # Shares the index lock so compaction never races an index refresh
+            self.maintenance = StorageMaintenance(
+                [self.table, self.catalog.table], config, lock=self.indexes.lock
+            )
+            if self.embedder.table is not None:
+                self.maintenance.add_table(self.embedder.table)
+            # The cache table is created lazily by its first background write
+            self.embedder.on_table_created = self.maintenance.add_table
+            self.maintenance.start_idle()
 
             self.conversation_id = None
             self.session = int(time.time())
             self.turn_number = 0
+            self.cache = TurnCache()
+
+            self.writer = None
+            if config.write_behind:
+                self.writer = WriteBehindQueue(
+                    self._write_turns,
+                    maxsize=config.write_queue_size,
+                    batch_size=config.write_batch_size
+                )
 
         except Exception as e:
             raise StorageError(f"LanceDB initialization failed: {e}")
 
+    @staticmethod
+    def _load_model(model_name: str):
+        """Import torch/sentence-transformers and load the embedding model"""
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name, local_files_only=True)
+
+    def _scan_conversation(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """Full scan of one conversation's turns (only runs on cache miss)"""
+        self._drain()
+        where = f"conversation_id = '{conversation_id}'"
+        count = self.table.count_rows(where)
+        if count == 0:
+            return []
+
+        result = self.table.search().where(where).limit(count).to_pandas()
+        return result.sort_values('turn_number').to_dict('records')
+
+    def _cached_turns(self) -> TurnCache:
+        """Turn cache for the active conversation, populated on first use"""
+        if not self.cache.holds(self.conversation_id):
+            self.cache.load(self.conversation_id, self._scan_conversation(self.conversation_id))
+        return self.cache
+
     def _format_date_for_display(self, timestamp: float) -> str:
         """Format timestamp for clean display in list"""
         dt = datetime.fromtimestamp(timestamp)
@@ -72,32 +183,18 @@ class LanceDBStorage(BaseStorage):
     def list_all_conversations(self) -> List[Dict[str, Any]]:
         """List all conversations with metadata"""
         try:
-            result = self.table.search().limit(10000).to_pandas()
-
-            if len(result) == 0:
-                return []
-
-            conversations = {}
-            for _, row in result.iterrows():
-                conv_id = row['conversation_id']
-                if conv_id not in conversations:
-                    conversations[conv_id] = {
-                        'conversation_id': conv_id,
-                        'title': row['title'],
-                        'project': row['project'],
-                        'turn_count': 0,
-                        'last_updated': '',
-                        'timestamp': row['timestamp']
-                    }
-                conversations[conv_id]['turn_count'] += 1
-                if row['timestamp'] > conversations[conv_id]['timestamp']:
-                    conversations[conv_id]['timestamp'] = row['timestamp']
-
-            for conv in conversations.values():
-                conv['last_updated'] = self._format_date_for_display(conv['timestamp'])
-
-            conv_list = list(conversations.values())
-            conv_list.sort(key=lambda x: x['timestamp'], reverse=True)
+            self._drain()
+
+            conv_list = []
+            for row in self.catalog.list():
+                conv_list.append({
+                    'conversation_id': row['conversation_id'],
+                    'title': row['title'],
+                    'project': row['project'],
+                    'turn_count': row['turn_count'],
+                    'last_updated': self._format_date_for_display(row['last_timestamp']),
+                    'timestamp': row['last_timestamp']
+                })
 
             return conv_list
         except Exception as e:
@@ -107,34 +204,27 @@ class LanceDBStorage(BaseStorage):
         """Load existing conversation by ID"""
         try:
             self.conversation_id = conversation_id
-
-            turns = self.get_all_turns()
-            if turns:
-                self.turn_number = max(t['turn_number'] for t in turns) + 1
-            else:
-                self.turn_number = 0
+            self.cache.load(conversation_id, self._scan_conversation(conversation_id))
+            self.turn_number = self.cache.next_turn_number
 
         except Exception as e:
             raise StorageError(f"Load conversation failed: {e}")
 
     def save_turn(self, user_msg: str, ai_msg: str, metadata: Dict[str, Any]) -> None:
-        """Save turn with embedding"""
+        """Save turn with embedding (StorageError afterwards if earlier queued turns were lost)"""
         try:
+            # Out of the cache first, so this turn's catalog count matches what is on disk
+            lost = self._take_lost_writes()
             if self.conversation_id is None:
                 self.conversation_id = str(uuid.uuid4())
                 self.turn_number = 0
+                self.cache.load(self.conversation_id, [])
 
             # Use first user message as title (no AI generation)
             if self.turn_number == 0:
                 title = user_msg[:50]  # First 50 chars of user input
             else:
-                result = self.table.search() \
-                    .where(f"conversation_id = '{self.conversation_id}'") \
-                    .limit(1).to_pandas()
-                title = result.iloc[0]['title'] if len(result) > 0 else "Conversation"
-
-            combined = f"user: {user_msg} | assistant: {ai_msg}"
-            vector = self.model.encode(combined).tolist()
+                title = self._cached_turns().title or "Conversation"
 
             turn = {
                 "conversation_id": self.conversation_id,
@@ -147,30 +237,128 @@ class LanceDBStorage(BaseStorage):
                 "user": user_msg,
                 "assistant": ai_msg,
                 "elapsed": metadata.get('elapsed', 0.0),
-                "vector": vector
+                "ttft": metadata.get('ttft', 0.0),
+                "generation_time": metadata.get('generation_time', 0.0),
+                "tokens": metadata.get('tokens', 0),
+                "tokens_per_sec": metadata.get('tokens_per_sec', 0.0),
+                "context_tokens": count_turn_tokens(user_msg, ai_msg)
             }
 
-            self.table.add([turn])
+            cache = self._cached_turns()
+            first_timestamp = cache.turns[0]['timestamp'] if cache.turns else turn['timestamp']
+            summary = {
+                "title": cache.title or title,
+                "turn_count": len(cache.turns) + 1,
+                "first_timestamp": first_timestamp
+            }
+
+            if self.writer is not None:
+                # Cache first so get_recent sees the turn before it hits disk
+                cache.append(turn)
+                self.writer.submit((turn, summary))
+            else:
+                self._write_turns([(turn, summary)])
+                cache.append(turn)
+
             self.turn_number += 1
+            if lost:
+                raise StorageError(lost)
 
         except Exception as e:
             raise StorageError(f"Save failed: {e}")
 
+    def _write_turns(self, items: List[tuple]) -> None:
+        """Embed and persist a batch of (turn, catalog summary) pairs with one table.add"""
+        texts = [f"user: {turn['user']} | assistant: {turn['assistant']}" for turn, _ in items]
+        with SPANS.span('embed.save'):
+            vectors = self.profile.apply(self.embedder.encode(texts, cache=False))
+
+        schema = self.table.schema
+        rows = pa.Table.from_pylist(
+            [turn for turn, _ in items],
+            schema=pa.schema([f for f in schema if f.name != 'vector'])
+        ).append_column(schema.field('vector'), self.profile.to_arrow(vectors))
+        with SPANS.span('lance.write'):
+            self.table.add(rows)
+        self.indexes.record_added(rows.num_rows)
+        self.maintenance.touch()
+
+        # One catalog upsert per conversation, using its latest turn in the batch
+        latest = {}
+        for turn, summary in items:
+            latest[turn['conversation_id']] = (turn, summary)
+        for conv_id, (turn, summary) in latest.items():
+            self.catalog.record_turn(
+                conv_id, summary['title'], turn['project'],
+                turn_count=summary['turn_count'],
+                first_timestamp=summary['first_timestamp'],
+                last_timestamp=turn['timestamp']
+            )
+
+    def _drain(self) -> None:
+        """Wait for queued turns to be written (read paths; losses surface in save_turn/flush/close)"""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def _take_lost_writes(self) -> Optional[str]:
+        """Drop turns the write-behind queue gave up on from the turn cache; error text if there were any"""
+        if self.writer is None:
+            return None
+        lost, error = self.writer.take_lost()
+        if not lost:
+            return None
+        self.cache.discard({(turn['conversation_id'], turn['turn_number']) for turn, _ in lost})
+        return f"{len(lost)} turn(s) could not be written and were not saved: {error}"
+
+    def _raise_lost_writes(self) -> None:
+        lost = self._take_lost_writes()
+        if lost:
+            raise StorageError(lost)
+
+    def flush(self) -> None:
+        """Wait for queued turns to reach disk; StorageError if any could not be written"""
+        self._drain()
+        self._raise_lost_writes()
+
+    def wait_for_model(self) -> None:
+        """Block until the embedding model has loaded; closes and raises StorageError if it failed"""
+        try:
+            self.model.get()
+        except Exception as e:
+            self.close()
+            raise StorageError(f"Embedding model failed to load: {e}")
+
+    def close(self) -> None:
+        """Flush pending writes and stop background threads; StorageError if writes were lost"""
+        if self.writer is not None:
+            self.writer.close()
+        self.embedder.close()
+        self.maintenance.stop()
+        self._raise_lost_writes()
+
+    def get_perf_metrics(self, all_history: bool = False):
+        """Per-turn timing columns as an Arrow table (current conversation or everything)"""
+        try:
+            self._drain()
+            if not all_history and self.conversation_id is None:
+                return pa.Table.from_pylist([], schema=pa.schema([self.table.schema.field(c) for c in PERF_COLUMNS]))
+
+            where = None if all_history else f"conversation_id = '{self.conversation_id}'"
+            count = self.table.count_rows(where)
+            query = self.table.search().select(PERF_COLUMNS).limit(max(count, 1))
+            if where:
+                query = query.where(where)
+            return query.to_arrow()
+        except Exception as e:
+            raise StorageError(f"Perf metrics failed: {e}")
+
     def get_recent(self, limit: int) -> List[Dict[str, Any]]:
         """Get recent turns from current conversation"""
         try:
             if self.conversation_id is None:
                 return []
 
-            result = self.table.search() \
-                .where(f"conversation_id = '{self.conversation_id}'") \
-                .limit(1000).to_pandas()
-
-            if len(result) == 0:
-                return []
-
-            turns = result.sort_values('turn_number').to_dict('records')
-            return turns[-limit:] if turns else []
+            return self._cached_turns().recent(limit)
         except Exception as e:
             raise StorageError(f"Get recent failed: {e}")
 
@@ -180,14 +368,7 @@ class LanceDBStorage(BaseStorage):
             if self.conversation_id is None:
                 return []
 
-            result = self.table.search() \
-                .where(f"conversation_id = '{self.conversation_id}'") \
-                .limit(1000).to_pandas()
-
-            if len(result) == 0:
-                return []
-
-            return result.sort_values('turn_number').to_dict('records')
+            return self._cached_turns().all()
         except Exception as e:
             return []
 
@@ -197,11 +378,13 @@ class LanceDBStorage(BaseStorage):
             if self.conversation_id is None:
                 return []
 
-            query_vector = self.model.encode(query).tolist()
-            search = self.table.search(query_vector).limit(limit)
+            with SPANS.span('embed.query'):
+                query_vector = self.profile.query(self.embedder.encode(query))
+            search = self.table.search(query_vector).distance_type('cosine').limit(limit)
             search = search.where(f"conversation_id = '{self.conversation_id}'")
 
-            results = search.to_pandas().to_dict('records')
+            with SPANS.span('lance.search'):
+                results = search.to_pandas().to_dict('records')
             return results
         except Exception as e:
             raise StorageError(f"Search failed: {e}")
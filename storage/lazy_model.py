@@ -0,0 +1,35 @@
+"""Lazy embedding model - loads on a background thread behind a future"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Any
+
+class LazyModel:
+    """Stand-in for the SentenceTransformer that only blocks on first real use"""
+
+    def __init__(self, loader: Callable[[], Any]):
+        self.load_seconds = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="winter-model")
+        self._future = self._executor.submit(self._load, loader)
+        self._executor.shutdown(wait=False)
+
+    def _load(self, loader: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        model = loader()
+        self.load_seconds = time.perf_counter() - start
+        return model
+
+    @property
+    def ready(self) -> bool:
+        """True once the model has finished loading (or failed to)"""
+        return self._future.done()
+
+    def get(self) -> Any:
+        """The loaded model; waits for the load and re-raises its error"""
+        return self._future.result()
+
+    def encode(self, *args, **kwargs):
+        return self.get().encode(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # Anything else (dimension lookups etc.) goes to the real model
+        return getattr(self.get(), name)
@@ -0,0 +1,142 @@
+"""Storage maintenance - compaction, version cleanup and fragment stats"""
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Any, List, Optional
+
+import lancedb
+
+from storage.conversation_catalog import CATALOG_TABLE
+from storage.embedding_cache import EMBEDDING_CACHE_TABLE
+from storage.migration import read_active_table
+
+class StorageMaintenance:
+    """Keeps Lance tables from accumulating one tiny fragment + version per turn"""
+
+    def __init__(self, tables: List, config, lock: Optional[threading.Lock] = None):
+        self.tables = tables
+        self.config = config
+        self.lock = lock or threading.Lock()
+        self.last_activity = time.time()
+        self.last_run = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_table(self, table) -> None:
+        """Start maintaining a table created after startup (e.g. the embedding cache)"""
+        with self.lock:
+            if table not in self.tables:
+                self.tables.append(table)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Row, byte, fragment and version counts per table"""
+        report = []
+        for table in self.tables:
+            table_stats = table.stats()
+            fragments = table_stats['fragment_stats']
+            report.append({
+                'table': table.name,
+                'rows': table_stats['num_rows'],
+                'bytes': table_stats['total_bytes'],
+                'fragments': fragments['num_fragments'],
+                'small_fragments': fragments['num_small_fragments'],
+                'versions': len(table.list_versions()),
+            })
+        return report
+
+    def run(self, force: bool = False) -> List[Dict[str, Any]]:
+        """Compact fragmented tables and prune versions past the retention window"""
+        retention = timedelta(days=self.config.version_retention_days)
+        report = []
+
+        with self.lock:
+            for table in self.tables:
+                before = table.stats()
+                versions_before = len(table.list_versions())
+                entry = {'table': table.name, 'compacted': False}
+
+                if force or before['fragment_stats']['num_fragments'] >= self.config.compaction_fragment_threshold:
+                    # optimize() = compact_files + cleanup_old_versions + index refresh,
+                    # and unlike those it needs no separate pylance install
+                    table.optimize(cleanup_older_than=retention)
+                    after = table.stats()
+                    entry['compacted'] = True
+                    entry['fragments_before'] = before['fragment_stats']['num_fragments']
+                    entry['fragments_after'] = after['fragment_stats']['num_fragments']
+                    entry['versions_removed'] = max(0, versions_before - len(table.list_versions()))
+                    entry['bytes_removed'] = max(0, before['total_bytes'] - after['total_bytes'])
+                report.append(entry)
+
+        self.last_run = time.time()
+        return report
+
+    def touch(self) -> None:
+        """Record user activity (maintenance waits until the session goes idle)"""
+        self.last_activity = time.time()
+
+    def start_idle(self) -> None:
+        """Run maintenance on a background thread whenever the session is idle"""
+        if self.config.maintenance_idle_seconds <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._idle_loop, name="winter-maintenance", daemon=True)
+        self._thread.start()
+
+    def _idle_loop(self):
+        idle = self.config.maintenance_idle_seconds
+        while not self._stop.wait(idle / 2):
+            if time.time() - self.last_activity < idle:
+                continue
+            if self.last_run > self.last_activity:
+                continue  # Nothing written since the last pass
+            try:
+                self.run()
+            except Exception as e:
+                print(f"\n⚠️  Storage maintenance failed: {e}")
+
+    def stop(self) -> None:
+        """Stop the idle thread (an in-flight pass finishes first)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+def _format_stats(stats: List[Dict[str, Any]]) -> str:
+    lines = []
+    for s in stats:
+        lines.append(
+            f"   {s['table']}: {s['rows']} rows, {s['bytes'] / 1024 / 1024:.1f} MB, "
+            f"{s['fragments']} fragments ({s['small_fragments']} small), {s['versions']} versions"
+        )
+    return "\n".join(lines)
+
+def run_maintenance(config) -> None:
+    """Entry point for `python main.py --maintain` (no embedding model load)"""
+    db = lancedb.connect(config.storage_path)
+    tables = []
+    turns_table = read_active_table(config.storage_path)['table']
+    for name in [turns_table, CATALOG_TABLE, EMBEDDING_CACHE_TABLE]:
+        try:
+            tables.append(db.open_table(name))
+        except Exception:
+            pass
+
+    if not tables:
+        print("📦 No LanceDB tables found - nothing to maintain")
+        return
+
+    maintenance = StorageMaintenance(tables, config)
+
+    print("📊 Before:")
+    print(_format_stats(maintenance.stats()))
+
+    print("\n🧹 Compacting and pruning old versions...")
+    start = time.time()
+    for entry in maintenance.run(force=True):
+        print(
+            f"   {entry['table']}: {entry['fragments_before']} → {entry['fragments_after']} fragments, "
+            f"{entry['versions_removed']} versions pruned, {entry['bytes_removed'] / 1024 / 1024:.1f} MB freed"
+        )
+    print(f"   ⏱️  {time.time() - start:.2f}s")
+
+    print("\n📊 After:")
+    print(_format_stats(maintenance.stats()))
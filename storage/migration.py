@@ -0,0 +1,148 @@
+"""Embedding migration - re-embed stored turns into a new table, then switch over"""
+import json
+import os
+import re
+import time
+from typing import Dict, Any, Optional
+
+import lancedb
+import pyarrow as pa
+
+from storage.vector_profile import VectorProfile
+
+DEFAULT_TURNS_TABLE = 'conversations'
+ACTIVE_TABLE_FILE = 'active_table.json'
+
+def _pointer_path(storage_path: str) -> str:
+    return os.path.join(storage_path, ACTIVE_TABLE_FILE)
+
+def read_active_table(storage_path: str) -> Dict[str, Any]:
+    """Which turns table is live, and what model/profile filled it"""
+    path = _pointer_path(storage_path)
+    if not os.path.exists(path):
+        return {'table': DEFAULT_TURNS_TABLE}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'table': DEFAULT_TURNS_TABLE}
+
+def write_active_table(storage_path: str, info: Dict[str, Any]) -> None:
+    """Atomically repoint LanceDBStorage at another turns table"""
+    path = _pointer_path(storage_path)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(info, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def target_table_name(model_name: str, profile: VectorProfile) -> str:
+    """Deterministic per (model, profile), so an interrupted run resumes into the same table"""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', model_name).strip('_').lower()
+    return f"{DEFAULT_TURNS_TABLE}__{slug}__{profile.dims}_{profile.dtype}"
+
+def migrate_embeddings(config, batch_size: Optional[int] = None, model_loader=None) -> None:
+    """Entry point for `python main.py --migrate-embeddings`
+
+    Streams turns out of the live table (scalar columns only), re-encodes
+    them with config.embedding_model in batches and appends them to a
+    new table. Turns already present in the target are skipped, so a
+    killed run picks up where it stopped. The switch is a single atomic
+    rename of the active-table pointer; the old table is left in place.
+
+    model_loader: zero-arg callable returning an object with encode();
+    default loads config.embedding_model.
+    """
+    from storage.lancedb_storage import turn_schema
+
+    batch_size = batch_size or config.migration_batch_size
+    db = lancedb.connect(config.storage_path)
+    active = read_active_table(config.storage_path)
+    profile = VectorProfile.from_config(config)
+    target_name = target_table_name(config.embedding_model, profile)
+
+    if active['table'] == target_name:
+        print(f"✅ Already on {target_name} - nothing to migrate")
+        return
+
+    source = db.open_table(active['table'])
+    schema = turn_schema(profile)
+    scalar_fields = [f for f in schema if f.name != 'vector']
+    scalar_names = [f.name for f in scalar_fields]
+
+    try:
+        target = db.open_table(target_name)
+    except Exception:
+        target = db.create_table(target_name, schema=schema)
+
+    # Resume: everything already copied is keyed by (conversation_id, turn_number)
+    done = set()
+    existing = target.count_rows()
+    if existing:
+        rows = target.search().select(['conversation_id', 'turn_number']).limit(existing).to_arrow()
+        done = set(zip(rows['conversation_id'].to_pylist(), rows['turn_number'].to_pylist()))
+
+    total = source.count_rows()
+    print(f"🔄 Migrating {total} turns: {active['table']} → {target_name}")
+    print(f"   model={config.embedding_model} profile={profile} batch_size={batch_size}")
+    if done:
+        print(f"   ↪️  Resuming - {len(done)} turns already migrated")
+
+    print("🔄 Loading embedding model...")
+    if model_loader is None:
+        from sentence_transformers import SentenceTransformer
+        model_loader = lambda: SentenceTransformer(config.embedding_model, local_files_only=True)
+    model = model_loader()
+
+    migrated = 0
+    skipped = 0
+    encode_seconds = 0.0
+    start = time.perf_counter()
+
+    def write_batch(rows):
+        nonlocal migrated, encode_seconds
+        texts = [f"user: {r['user']} | assistant: {r['assistant']}" for r in rows]
+        encode_start = time.perf_counter()
+        vectors = profile.apply(model.encode(texts, batch_size=batch_size))
+        encode_seconds += time.perf_counter() - encode_start
+
+        data = pa.Table.from_pylist(rows, schema=pa.schema(scalar_fields)) \
+            .append_column(schema.field('vector'), profile.to_arrow(vectors))
+        target.add(data)
+
+        migrated += len(rows)
+        elapsed = time.perf_counter() - start
+        print(f"   {migrated + skipped}/{total} turns | {migrated / elapsed:.1f} turns/sec", end='\r', flush=True)
+
+    # Lance yields one record batch per fragment (often a single turn),
+    # so regroup rows to batch_size before encoding and writing
+    pending = []
+    source_columns = [n for n in scalar_names if n in source.schema.names]
+    reader = source.search().select(source_columns).limit(max(total, 1)).to_batches(batch_size)
+    for batch in reader:
+        for row in batch.to_pylist():
+            if not row['conversation_id'] or (row['conversation_id'], row['turn_number']) in done:
+                skipped += 1
+                continue
+            pending.append(row)
+            if len(pending) >= batch_size:
+                write_batch(pending)
+                pending = []
+    if pending:
+        write_batch(pending)
+
+    elapsed = time.perf_counter() - start
+    print()
+    print(f"✅ Re-embedded {migrated} turns in {elapsed:.1f}s "
+          f"({migrated / elapsed if elapsed else 0:.1f} turns/sec, "
+          f"encode {migrated / encode_seconds if encode_seconds else 0:.1f} turns/sec, batch_size={batch_size})")
+
+    write_active_table(config.storage_path, {
+        'table': target_name,
+        'embedding_model': config.embedding_model,
+        'vector_profile': str(profile),
+        'migrated_from': active['table'],
+        'migrated_at': time.time(),
+    })
+    print(f"🔀 Switched to {target_name} (old table '{active['table']}' kept; drop it once you're happy)")
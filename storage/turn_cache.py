@@ -0,0 +1,51 @@
+"""Write-through turn cache - active conversation kept in memory"""
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+class TurnCache:
+    """In-process cache of the active conversation's turns (ordered by turn_number)"""
+
+    def __init__(self):
+        self.conversation_id = None
+        self.turns = []
+
+    def holds(self, conversation_id: Optional[str]) -> bool:
+        """True if the cache is populated for this conversation"""
+        return conversation_id is not None and self.conversation_id == conversation_id
+
+    def load(self, conversation_id: str, turns: List[Dict[str, Any]]) -> None:
+        """Replace cache contents with a freshly scanned conversation"""
+        self.conversation_id = conversation_id
+        self.turns = sorted((self._strip(t) for t in turns), key=lambda t: t.get('turn_number', 0))
+
+    def append(self, turn: Dict[str, Any]) -> None:
+        """Write-through: record a turn that was just persisted"""
+        self.turns.append(self._strip(turn))
+
+    def discard(self, keys: Set[Tuple[str, int]]) -> None:
+        """Forget turns that never reached disk, by (conversation_id, turn_number)"""
+        self.turns = [t for t in self.turns if (t.get('conversation_id'), t.get('turn_number')) not in keys]
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """Last `limit` turns"""
+        if limit <= 0:
+            return []
+        return self.turns[-limit:]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """All cached turns"""
+        return list(self.turns)
+
+    @property
+    def title(self) -> Optional[str]:
+        """Title of the cached conversation (from its first turn)"""
+        return self.turns[0].get('title') if self.turns else None
+
+    @property
+    def next_turn_number(self) -> int:
+        """Turn number the next saved turn should use"""
+        return max(t.get('turn_number', 0) for t in self.turns) + 1 if self.turns else 0
+
+    @staticmethod
+    def _strip(turn: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop the embedding - nothing reads it back and it dominates memory"""
+        return {k: v for k, v in turn.items() if k != 'vector'}
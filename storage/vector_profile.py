@@ -0,0 +1,68 @@
+"""Vector profile - Matryoshka truncation + storage precision for embeddings"""
+import numpy as np
+import pyarrow as pa
+
+DTYPES = {
+    'float32': (np.float32, pa.float32()),
+    'float16': (np.float16, pa.float16()),
+}
+
+class VectorProfile:
+    """How model embeddings are shaped before they are written to Lance"""
+
+    def __init__(self, dims: int = 1024, dtype: str = 'float32'):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported vector_dtype '{dtype}' (use {' | '.join(DTYPES)})")
+        self.dims = dims
+        self.dtype = dtype
+        self.np_type, self.arrow_value_type = DTYPES[dtype]
+
+    @classmethod
+    def from_config(cls, config) -> "VectorProfile":
+        return cls(config.vector_dims, config.vector_dtype)
+
+    @classmethod
+    def from_field(cls, field: pa.Field) -> "VectorProfile":
+        """Profile an existing vector column was written with"""
+        value_type = field.type.value_type
+        dtype = next((name for name, (_, t) in DTYPES.items() if t == value_type), 'float32')
+        return cls(field.type.list_size, dtype)
+
+    @property
+    def arrow_type(self) -> pa.DataType:
+        """Fixed-size list type of the vector column"""
+        return pa.list_(self.arrow_value_type, self.dims)
+
+    def matches(self, field: pa.Field) -> bool:
+        return field.type == self.arrow_type
+
+    def apply(self, vectors: np.ndarray) -> np.ndarray:
+        """Truncate to `dims`, re-normalize, cast to the storage dtype"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        single = vectors.ndim == 1
+        if single:
+            vectors = vectors[None, :]
+
+        if vectors.shape[1] > self.dims:
+            # Matryoshka embeddings keep most signal in the leading dims,
+            # but the prefix needs re-normalizing for cosine/L2 to behave
+            vectors = vectors[:, :self.dims]
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+        elif vectors.shape[1] < self.dims:
+            raise ValueError(f"Model returns {vectors.shape[1]} dims, profile expects {self.dims}")
+
+        vectors = vectors.astype(self.np_type)
+        return vectors[0] if single else vectors
+
+    def to_arrow(self, vectors: np.ndarray) -> pa.FixedSizeListArray:
+        """Vectors (already applied) as a fixed-size-list column"""
+        flat = pa.array(np.ascontiguousarray(vectors).ravel(), type=self.arrow_value_type)
+        return pa.FixedSizeListArray.from_arrays(flat, self.dims)
+
+    def query(self, vector: np.ndarray) -> list:
+        """Query vector in the same space as stored vectors (float32 list for LanceDB)"""
+        return self.apply(vector).astype(np.float32).tolist()
+
+    def __str__(self):
+        return f"{self.dims}d/{self.dtype}"
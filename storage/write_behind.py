@@ -0,0 +1,122 @@
+"""Write-behind queue - batches turn writes on a background thread"""
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+_STOP = object()
+
+class WriteBehindQueue:
+    """Bounded queue drained by one worker that writes items in batches
+
+    A failed batch is retried `retries` times with doubling delays; if it
+    still fails its items are kept (not dropped) until take_lost() hands
+    them to the owner, which decides how to surface the loss. keep_lost=False
+    is for best-effort writers (caches) that have nothing to report.
+    """
+
+    def __init__(self, write_batch: Callable[[List[Any]], None], maxsize: int = 64, batch_size: int = 16,
+                 retries: int = 3, retry_delay: float = 0.5, keep_lost: bool = True):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.keep_lost = keep_lost
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.failed = 0
+        self.lost: List[Any] = []
+        self.last_error: Optional[Exception] = None
+        self._lost_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="winter-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> None:
+        """Enqueue an item (blocks only when the queue is full)"""
+        if self._closed:
+            self.write_batch([item])
+            return
+        self.queue.put(item)
+
+    def offer(self, item: Any) -> bool:
+        """Enqueue without blocking; False if the queue is full (item not taken)"""
+        if self._closed:
+            return False
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def _run(self):
+        """Worker loop: take one item, drain whatever else is waiting, write once"""
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self.queue.task_done()
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    nxt = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            try:
+                self._write(batch)
+            finally:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self.queue.task_done()
+
+            if stop:
+                return
+
+    def _write(self, batch: List[Any]) -> None:
+        """write_batch with retries; a batch that never succeeds is kept in self.lost"""
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                self.write_batch(batch)
+                return
+            except Exception as e:
+                error = e
+            if attempt < self.retries:
+                time.sleep(delay)
+                delay *= 2
+
+        with self._lost_lock:
+            self.failed += len(batch)
+            self.last_error = error
+            if self.keep_lost:
+                self.lost.extend(batch)
+        print(f"\n⚠️  Background save failed after {self.retries + 1} attempts ({len(batch)} turns): {error}")
+
+    def take_lost(self) -> Tuple[List[Any], Optional[Exception]]:
+        """Items given up on since the last call, with the last error"""
+        with self._lost_lock:
+            lost, self.lost = self.lost, []
+            return lost, self.last_error
+
+    def pending(self) -> int:
+        """Approximate number of items not yet written"""
+        return self.queue.unfinished_tasks
+
+    def flush(self) -> None:
+        """Block until everything submitted so far is written"""
+        if self._thread.is_alive():
+            self.queue.join()
+
+    def close(self) -> None:
+        """Flush and stop the worker; later submits write synchronously"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join()
@@ -0,0 +1,42 @@
+"""Shared fixtures - repo root on sys.path, throwaway storage paths, stub embeddings"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import Config
+from benchmarks.corpus import StubEmbedder
+
+DIMS = 64
+
+@pytest.fixture
+def config(tmp_path):
+    """Default config writing everything under tmp_path"""
+    config = Config()
+    config.storage_path = str(tmp_path / "storage")
+    config.conv_history_path = str(tmp_path / "fallback")
+    config.vector_dims = DIMS
+    config.maintenance_idle_seconds = 3600
+    return config
+
+@pytest.fixture
+def embedder():
+    return StubEmbedder(DIMS)
+
+@pytest.fixture
+def lancedb_storage(config, embedder):
+    """Factory for LanceDBStorage on the stub embedder; everything opened is closed after the test"""
+    from storage.lancedb_storage import LanceDBStorage
+
+    opened = []
+
+    def open_storage():
+        storage = LanceDBStorage(config, model_loader=lambda: embedder)
+        opened.append(storage)
+        return storage
+
+    yield open_storage
+    for storage in opened:
+        storage.close()
@@ -0,0 +1,42 @@
+from core.context_packer import ContextPacker, TRUNCATION_MARK, turn_key, turn_tokens
+
+def turn(n, user="question", assistant="answer", **extra):
+    return {'conversation_id': 'c', 'timestamp': 100.0 + n, 'turn_number': n,
+            'user': user, 'assistant': assistant, **extra}
+
+def test_budget_reserves_reply_and_fixed_parts(config):
+    config.context_window, config.num_predict = 1000, 200
+    packer = ContextPacker(config)
+    assert packer.budget() == 1000 - 200 - 64
+    assert packer.budget("x" * 400) == packer.budget() - 100
+    config.context_window = 100
+    assert ContextPacker(config).budget() == 0
+
+def test_pack_keeps_best_turns_in_time_order(config):
+    packer = ContextPacker(config)
+    turns = [turn(0, score=0.9), turn(1, score=0.1), turn(2, score=0.5)]
+    budget = turn_tokens(turns[0]) * 2
+    assert [t['turn_number'] for t in packer.pack(turns, budget)] == [0, 2]
+
+def test_pack_skips_oversized_turn_for_smaller_one(config):
+    config.context_turn_max_tokens = 10_000
+    packer = ContextPacker(config)
+    big = turn(0, assistant="x" * 4000, score=0.9)
+    small = turn(1, score=0.1)
+    assert packer.pack([big, small], turn_tokens(small) + 5) == [small]
+
+def test_clip_is_deterministic_and_fits(config):
+    config.context_turn_max_tokens = 100
+    packer = ContextPacker(config)
+    long_turn = turn(0, assistant="head " + "y" * 2000 + " tail")
+    clipped = packer.clip(long_turn)
+    assert TRUNCATION_MARK in clipped['assistant']
+    assert clipped['assistant'].startswith("head") and clipped['assistant'].endswith("tail")
+    assert turn_tokens(clipped) <= 100
+    assert packer.clip(long_turn) == clipped
+    assert long_turn['assistant'].endswith("tail") and 'context_tokens' not in long_turn
+
+def test_turn_key_sorts_oldest_first():
+    turns = [turn(2), turn(0), dict(turn(0), turn_number=1)]
+    assert [t['turn_number'] for t in sorted(turns, key=turn_key)] == [0, 1, 2]
+    assert turn_key({}) == (0, 0)
@@ -0,0 +1,53 @@
+import lancedb
+
+from storage.conversation_catalog import ConversationCatalog, CATALOG_TABLE
+
+def save(storage, count, prefix="q"):
+    for n in range(count):
+        storage.save_turn(f"{prefix}{n}", f"answer {n}", {})
+
+def test_catalog_lists_conversations(lancedb_storage):
+    storage = lancedb_storage()
+    save(storage, 3, "first ")
+    storage.conversation_id = None
+    save(storage, 2, "second ")
+    listed = storage.list_all_conversations()
+    assert [c['turn_count'] for c in listed] == [2, 3]
+    assert listed[1]['title'] == "first 0"
+
+def test_catalog_behind_history_is_rebuilt(config, lancedb_storage, capsys):
+    storage = lancedb_storage()
+    save(storage, 4)
+    storage.close()
+
+    # Turns committed, catalog commit lost (crash between the two writes)
+    db = lancedb.connect(config.storage_path)
+    db.open_table(CATALOG_TABLE).update(values={'turn_count': 1})
+    stale = ConversationCatalog.__new__(ConversationCatalog)
+    stale.table = db.open_table(CATALOG_TABLE)
+    assert not stale.is_consistent(db.open_table('conversations'))
+
+    reopened = lancedb_storage()
+    assert "rebuilding" in capsys.readouterr().out
+    assert reopened.catalog.is_consistent(reopened.table)
+    assert reopened.list_all_conversations()[0]['turn_count'] == 4
+
+def test_consistent_catalog_is_left_alone(lancedb_storage, capsys):
+    storage = lancedb_storage()
+    save(storage, 2)
+    storage.close()
+    capsys.readouterr()
+    lancedb_storage()
+    assert "rebuilding" not in capsys.readouterr().out
+
+def test_rebuild_matches_live_writes(config, lancedb_storage):
+    storage = lancedb_storage()
+    save(storage, 2)
+    storage.set_project("winter")
+    save(storage, 2, "later ")
+    storage.flush()
+    live = storage.catalog.list()
+
+    rebuilt = ConversationCatalog._backfill(storage.table).to_pylist()
+    assert rebuilt == live
+    assert live[0]['project'] == "winter" and live[0]['title'] == "q0"
@@ -0,0 +1,134 @@
+import time
+
+import lancedb
+import numpy as np
+import pyarrow as pa
+
+from storage.embedding_cache import EmbeddingCache, EMBEDDING_CACHE_TABLE
+
+class CountingModel:
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self.texts = []
+
+    def encode(self, texts, **kwargs):
+        self.texts.extend(texts)
+        return self.embedder.encode(texts)
+
+def test_memory_tier_dedupes_and_normalizes_whitespace(embedder):
+    model = CountingModel(embedder)
+    cache = EmbeddingCache(model, "stub")
+    first = cache.encode(["hello world", "hello  world ", "other"])
+    assert model.texts == ["hello world", "other"]
+    np.testing.assert_allclose(first[0], first[1])
+
+    single = cache.encode("other")
+    assert single.shape == (embedder.dims,)
+    assert model.texts == ["hello world", "other"]
+    assert cache.stats()['memory_hits'] == 1
+
+def test_lru_capacity(embedder):
+    model = CountingModel(embedder)
+    cache = EmbeddingCache(model, "stub", capacity=2)
+    cache.encode(["a", "b", "c"])
+    assert cache.stats()['memory_entries'] == 2
+    cache.encode("a")
+    assert model.texts.count("a") == 2
+
+def test_disk_tier_survives_reopen(tmp_path, embedder):
+    db = lancedb.connect(str(tmp_path))
+    created = []
+    cache = EmbeddingCache(CountingModel(embedder), "stub", db=db, on_table_created=created.append)
+    cache.encode(["persist me", "and me"])
+    cache.flush()
+    assert len(created) == 1 and created[0].count_rows() == 2
+    cache.close()
+
+    model = CountingModel(embedder)
+    reopened = EmbeddingCache(model, "stub", db=lancedb.connect(str(tmp_path)))
+    reopened.encode(["persist me", "brand new"])
+    assert model.texts == ["brand new"]
+    assert reopened.stats()['disk_hits'] == 1
+    reopened.close()
+
+def test_model_change_invalidates_and_clears(tmp_path, embedder):
+    cache = EmbeddingCache(CountingModel(embedder), "model-a", db=lancedb.connect(str(tmp_path)))
+    cache.encode(["same text", "other text"])
+    cache.close()
+
+    model = CountingModel(embedder)
+    other = EmbeddingCache(model, "model-b", db=lancedb.connect(str(tmp_path)))
+    other.encode("same text")
+    other.close()
+    assert model.texts == ["same text"]
+    rows = other.table.to_arrow()
+    assert set(rows['model'].to_pylist()) == {"model-b"} and rows.num_rows == 1
+
+def test_uncached_encode_skips_both_tiers(tmp_path, embedder):
+    model = CountingModel(embedder)
+    cache = EmbeddingCache(model, "stub", db=lancedb.connect(str(tmp_path)))
+    vectors = cache.encode(["user: hi | assistant: hello"] * 2, cache=False)
+    cache.close()
+    assert vectors.shape == (2, embedder.dims) and len(model.texts) == 2
+    assert cache.table is None and cache.stats()['memory_entries'] == 0
+
+def test_disk_tier_is_pruned_by_size_and_age(tmp_path, embedder, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    cache = EmbeddingCache(CountingModel(embedder), "stub", db=lancedb.connect(str(tmp_path)),
+                           max_rows=3, ttl=100)
+    for i in range(5):
+        now[0] += 1
+        cache.encode(f"query {i}")
+        cache.flush()
+    assert cache.prune() == 2
+    assert cache.table.count_rows() == 3
+
+    now[0] += 200
+    assert cache.prune() == 3 and cache.table.count_rows() == 0
+    cache.close()
+
+def test_startup_does_not_scan_keys(tmp_path, embedder):
+    cache = EmbeddingCache(CountingModel(embedder), "stub", db=lancedb.connect(str(tmp_path)))
+    cache.encode([f"query {i}" for i in range(50)])
+    cache.close()
+
+    reopened = EmbeddingCache(CountingModel(embedder), "stub", db=lancedb.connect(str(tmp_path)))
+    assert reopened.stats()['memory_entries'] == 0 and not hasattr(reopened, 'disk_keys')
+    reopened.encode("query 7")
+    assert reopened.stats()['disk_hits'] == 1
+    reopened.close()
+
+def test_table_without_model_column_is_replaced(tmp_path, embedder):
+    db = lancedb.connect(str(tmp_path))
+    db.create_table(EMBEDDING_CACHE_TABLE, pa.table({
+        'key': ['old'], 'vector': pa.array([[0.0] * embedder.dims], pa.list_(pa.float32(), embedder.dims))
+    }))
+    cache = EmbeddingCache(CountingModel(embedder), "stub", db=db)
+    cache.encode("fresh")
+    cache.close()
+    assert set(cache.table.schema.names) >= {'model', 'created'}
+    assert cache.table.count_rows() == 1
+
+def test_saved_turns_stay_out_of_the_disk_tier(lancedb_storage):
+    storage = lancedb_storage()
+    storage.save_turn("hello", "hi", {})
+    storage.flush()
+    storage.embedder.flush()
+    assert storage.embedder.table is None
+    storage.search("hello", 5)
+    storage.embedder.flush()
+    assert storage.embedder.table.count_rows() == 1
+
+def test_disk_write_failure_does_not_reach_caller(embedder, capsys):
+    class BrokenDB:
+        def open_table(self, name):
+            raise FileNotFoundError(name)
+
+        def create_table(self, *args, **kwargs):
+            raise IOError("read-only")
+
+    cache = EmbeddingCache(CountingModel(embedder), "stub", db=BrokenDB())
+    assert cache.encode(["x", "y"]).shape == (2, embedder.dims)
+    cache.close()
+    assert cache.writer.failed == 2
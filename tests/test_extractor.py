@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from core.integrations.memory_injector.extractor import FactExtractor, parse_facts
+
+class Memory:
+    """Just what the extractor uses of MemoryRegistry"""
+
+    class vessels:
+        vessels = {'USER_NAME': {'value': 'Maddi'}}
+
+    def __init__(self):
+        self.staged = {}
+
+    def staged_facts(self):
+        return dict(self.staged)
+
+    def stage_facts(self, facts):
+        self.staged.update(facts)
+        return facts
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_parse_facts_handles_thinking_and_fences():
+    reply = '<think>{"not": "this"}</think>```json\n{"facts": {"PET": "cat", "AGE": 30}}\n```'
+    assert parse_facts(reply) == {'PET': 'cat', 'AGE': '30'}
+    assert parse_facts("no json here") == {}
+
+def test_extracts_only_after_idle_and_stages():
+    memory = Memory()
+    prompts = []
+
+    def stream(prompt):
+        prompts.append(prompt)
+        yield '{"facts": {"PET": "cat"}}'
+
+    extractor = FactExtractor(memory, stream, idle_seconds=0.3)
+    try:
+        extractor.pause()
+        extractor.submit("I have a cat", "Nice")
+        extractor.resume()
+        time.sleep(0.1)
+        assert prompts == []  # chat was active too recently
+        assert wait_for(lambda: memory.staged == {'PET': 'cat'})
+        assert "USER_NAME" in prompts[0]
+        assert extractor.stats()['added'] == 1
+    finally:
+        extractor.close()
+
+def test_turn_starting_mid_call_cancels_and_retries():
+    memory = Memory()
+    started = threading.Event()
+    closed = []
+    calls = []
+
+    class Stream:
+        def __init__(self):
+            calls.append(self)
+
+        def __iter__(self):
+            started.set()
+            for _ in range(50):
+                time.sleep(0.01)
+                yield ' '
+            yield '{"facts": {"PET": "dog"}}'
+
+        def close(self):
+            closed.append(self)
+
+    extractor = FactExtractor(memory, lambda prompt: Stream(), idle_seconds=0.05)
+    try:
+        extractor.submit("I have a dog", "Cool")
+        assert started.wait(5)
+        extractor.pause()
+        assert wait_for(lambda: extractor.stats()['interrupted'] == 1)
+        assert calls[0] in closed
+        extractor.resume()
+        assert wait_for(lambda: memory.staged == {'PET': 'dog'})
+        assert len(calls) == 2
+    finally:
+        extractor.close()
+
+def test_close_drops_pending_work():
+    extractor = FactExtractor(Memory(), lambda prompt: iter(()), idle_seconds=3600, queue_size=4)
+    for i in range(6):
+        extractor.submit(f"turn {i}", "ok")
+    start = time.monotonic()
+    extractor.close(timeout=2.0)
+    assert time.monotonic() - start < 2.0
+    assert not any(worker.is_alive() for worker in extractor.workers)
+    stats = extractor.stats()
+    assert stats['pending'] == 0 and stats['dropped'] >= 2
+    extractor.submit("after close", "ignored")
+    assert extractor.stats()['pending'] == 0
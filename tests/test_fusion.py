@@ -0,0 +1,53 @@
+from retrieval.fusion import fuse, select
+
+def turn(n, user="question", assistant="answer", **extra):
+    return {'conversation_id': 'c', 'timestamp': 100.0 + n, 'turn_number': n,
+            'user': user, 'assistant': assistant, **extra}
+
+def test_fuse_merges_legs(config):
+    recent = [turn(3, "gpu question"), turn(4, "latest")]
+    relevant = [turn(3, "gpu question", _distance=0.2), turn(0, "old gpu talk", _distance=0.1)]
+    fused = fuse("gpu", recent, relevant, config)
+    assert sorted(t['turn_number'] for t in fused) == [0, 3, 4]
+    assert next(t for t in fused if t['turn_number'] == 3)['_distance'] == 0.2
+    assert fused == sorted(fused, key=lambda t: (t['score'], t['timestamp']), reverse=True)
+
+def test_keyword_overlap_breaks_ties(config):
+    config.rag_weight_semantic, config.rag_weight_recency, config.rag_weight_keyword = 0.0, 0.0, 1.0
+    fused = fuse("lance storage", [turn(0, "about lance storage"), turn(1, "about the weather")], [], config)
+    assert fused[0]['turn_number'] == 0 and fused[0]['score'] == 1.0
+
+def test_same_turn_number_in_other_conversation_is_kept(config):
+    a = turn(1, "from a")
+    b = dict(turn(1, "from b"), conversation_id='other', timestamp=500.0, _distance=0.3)
+    assert len(fuse("q", [a], [b], config)) == 2
+
+class FakeStorage:
+    """Twelve turns; every older one is a perfect semantic hit, the last exchange is not"""
+
+    def __init__(self):
+        self.turns = [turn(n, f"lance storage detail {n}", "notes") for n in range(11)]
+        self.turns.append(turn(11, "thanks, my name is Maddi", "nice to meet you"))
+
+    def get_recent(self, limit):
+        return self.turns[-limit:]
+
+    def search(self, query, limit):
+        return [dict(t, _distance=0.0) for t in self.turns[:-1]][:limit]
+
+def test_previous_turn_always_reaches_the_messages(config, monkeypatch):
+    import ollama
+    from core.ai_engine import OllamaAI
+    from retrieval.hybrid_rag import HybridRAG
+
+    monkeypatch.setattr(ollama, 'list', lambda: {'models': []})
+    context = HybridRAG(config).retrieve("lance storage", FakeStorage(), limit=6)
+    assert len(context) == 6 and context[-1]['turn_number'] == 11
+
+    messages = OllamaAI(config)._build_messages("lance storage", context, False)
+    assert {"role": "user", "content": "thanks, my name is Maddi"} in messages
+
+def test_select_without_keep_is_plain_cut(config):
+    recent = [turn(n) for n in range(4)]
+    fused = fuse("q", recent, [], config)
+    assert select(fused, recent, 2, 0) == fused[:2]
@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+
+from storage.jsonl_index import JSONLOffsetIndex
+
+def turn(conv, n, ts):
+    return {'conversation_id': conv, 'title': f"{conv} title", 'timestamp': ts,
+            'datetime': str(ts), 'turn_number': n, 'user': f"q{n}", 'assistant': f"a{n}"}
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "data.jsonl"), str(tmp_path / "data.idx.jsonl")
+
+def sidecar_lines(path):
+    with open(path) as f:
+        return [line for line in f if line.strip()]
+
+def test_append_and_read(paths):
+    index = JSONLOffsetIndex(*paths)
+    for n in range(3):
+        index.append(turn('a', n, 10.0 + n))
+    index.append(turn('b', 0, 20.0))
+
+    assert [t['turn_number'] for t in index.read('a')] == [0, 1, 2]
+    assert [t['turn_number'] for t in index.read('a', limit=2)] == [1, 2]
+    assert index.read('a', limit=0) == []
+    meta = {m['conversation_id']: m for m in index.conversations()}
+    assert meta['a']['turn_count'] == 3 and meta['b']['turn_count'] == 1
+
+def test_reopen_uses_sidecar(paths):
+    index = JSONLOffsetIndex(*paths)
+    index.append(turn('a', 0, 1.0))
+    index.append(turn('a', 1, 2.0))
+
+    reopened = JSONLOffsetIndex(*paths)
+    assert reopened.offsets == index.offsets
+    assert len(sidecar_lines(paths[1])) == 2
+
+def test_catches_up_on_external_appends(paths):
+    index = JSONLOffsetIndex(*paths)
+    index.append(turn('a', 0, 1.0))
+    with open(paths[0], 'a') as f:
+        f.write(json.dumps(turn('a', 1, 2.0)) + '\n')
+    assert len(index.read('a')) == 2
+
+def test_corrupt_sidecar_is_rebuilt_not_appended(paths):
+    index = JSONLOffsetIndex(*paths)
+    for n in range(3):
+        index.append(turn('a', n, float(n)))
+
+    with open(paths[1], 'a') as f:
+        f.write('{"conversation_id": "a", "offs\n')
+
+    for _ in range(3):
+        reopened = JSONLOffsetIndex(*paths)
+        assert [t['turn_number'] for t in reopened.read('a')] == [0, 1, 2]
+        assert len(sidecar_lines(paths[1])) == 3  # rewritten, never grows
+
+def test_truncated_data_file_triggers_rebuild(paths):
+    index = JSONLOffsetIndex(*paths)
+    for n in range(3):
+        index.append(turn('a', n, float(n)))
+
+    with open(paths[0], 'rb') as f:
+        lines = f.readlines()
+    with open(paths[0], 'wb') as f:
+        f.writelines(lines[:1])
+
+    assert [t['turn_number'] for t in index.read('a')] == [0]
+    assert index.conversations()[0]['turn_count'] == 1
+
+def test_torn_last_line_is_skipped(paths):
+    with open(paths[0], 'w') as f:
+        f.write(json.dumps(turn('a', 0, 1.0)) + '\n')
+        f.write('{"conversation_id": "a", "turn')
+    index = JSONLOffsetIndex(*paths)
+    assert len(index.read('a')) == 1
+    assert index.indexed_size == os.path.getsize(paths[0])
@@ -0,0 +1,15 @@
+"""OllamaLLM request options - every call sends the same num_ctx/keep_alive so Ollama never reloads"""
+import ollama
+
+from core.llm_ollama import OllamaLLM
+
+def test_generate_uses_chat_options(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ollama, 'list', lambda: {'models': []})
+    monkeypatch.setattr(ollama, 'chat', lambda **kwargs: calls.append(kwargs) or {'message': {'content': "ok"}})
+
+    llm = OllamaLLM("mock", keep_alive="30m", num_ctx=8192)
+    assert llm.generate("hello", max_tokens=64) == "ok"
+    assert calls[0]['options'] == llm.options(64)
+    assert calls[0]['options']['num_ctx'] == 8192
+    assert calls[0]['keep_alive'] == "30m"
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pytest
+
+from core.integrations.memory_injector import MemoryRegistry
+from core.integrations.memory_injector.semantic_router import SemanticRouter
+
+@pytest.fixture
+def files(tmp_path):
+    memory = tmp_path / "memory.txt"
+    system = tmp_path / "system.txt"
+    memory.write_text("vessel 1: USER_NAME = Maddi\nvessel 2: GPU = RTX 3050\n")
+    system.write_text("system 1: AI_NAME = Winter\n")
+    return memory, system, tmp_path / "memory.staged.txt"
+
+@pytest.fixture
+def registry(files):
+    memory, system, staged = files
+    return MemoryRegistry(str(memory), str(system), check_interval=0, staging_path=str(staged))
+
+def rewrite(path, text):
+    stat = os.stat(path)
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+def test_routes_facts(registry):
+    assert registry.route("what is my name?")[1]['value'] == "Maddi"
+    assert registry.route("what is your name?")[0] == "AI_NAME"
+    assert registry.route("my name is bob") == (None, None)
+
+def test_hot_reload_on_edit(registry, files):
+    memory = files[0]
+    rewrite(memory, "vessel 1: USER_NAME = Sam\nvessel 2: LOCATION = Oslo\n")
+    key, data = registry.route("where am i?")
+    assert key == "LOCATION" and data['value'] == "Oslo"
+    assert registry.route("what is my name?")[1]['value'] == "Sam"
+    assert registry.route("what gpu do I have?") == (None, None)
+    assert registry.reloads == 1
+
+def test_unchanged_files_are_not_reparsed(registry):
+    assert registry.refresh(force=True) is False
+    assert registry.reloads == 0
+
+def test_staged_facts_never_touch_memory(registry, files):
+    memory, _, staged = files
+    before = memory.read_text()
+    added = registry.stage_facts({"favorite color": "blue", "USER_NAME": "Other", "alias": "maddi"})
+    assert added == {"FAVORITE_COLOR": "blue"}
+    assert memory.read_text() == before
+    assert registry.staged_facts() == {"FAVORITE_COLOR": "blue"}
+    assert registry.stage_facts({"FAVORITE_COLOR": "green"}) == {}
+    assert staged.read_text().count("FAVORITE_COLOR") == 1
+
+def test_accepted_fact_is_promoted_and_routed(registry, files):
+    memory, _, staged = files
+    registry.stage_facts({"location": "Oslo", "pet": "a cat named Miso"})
+    assert registry.route("where am i?") == (None, None)
+
+    assert registry.accept_fact("location") == "Oslo"
+    assert memory.read_text().splitlines()[-1] == "vessel 3: LOCATION = Oslo"
+    assert registry.staged_facts() == {"PET": "a cat named Miso"}
+    assert staged.read_text().startswith("#")
+    assert registry.route("where am i?")[1]['value'] == "Oslo"
+    assert "LOCATION = Oslo" in registry.vessels.get_all_text()
+
+    assert registry.accept_fact("LOCATION") is None
+    assert registry.stage_facts({"location": "Bergen"}) == {}
+    assert registry.route("what is my favorite color?") == (None, None)
+
+def test_semantic_pick_needs_threshold_and_margin():
+    assert SemanticRouter.pick({'A': 0.9, 'B': 0.5}, {'A', 'B'}, 0.75, 0.05) == ('A', 0.9)
+    assert SemanticRouter.pick({'A': 0.7, 'B': 0.5}, {'A', 'B'}, 0.75, 0.05)[0] is None
+    assert SemanticRouter.pick({'A': 0.9, 'B': 0.88}, {'A', 'B'}, 0.75, 0.05)[0] is None
+    # A close key that isn't loaded still makes the match ambiguous
+    assert SemanticRouter.pick({'A': 0.9, 'B': 0.88}, {'A'}, 0.75, 0.05)[0] is None
+    assert SemanticRouter.pick({'A': 0.9}, {'B'}, 0.75, 0.0) == (None, 0.0)
+
+def test_semantic_tier_routes_paraphrase(registry):
+    examples = {'USER_NAME': ["what is my name"], 'GPU': ["what gpu do I have"]}
+
+    def encode(texts):
+        vocab = ["name", "gpu", "called"]
+        def one(text):
+            return np.array([float(w in text) for w in vocab]) + np.array([0.0, 0.0, float("name" in text)])
+        return np.stack([one(t) for t in texts]) if isinstance(texts, list) else one(texts)
+
+    registry.semantic = SemanticRouter(encode, threshold=0.7, margin=0.05, examples=examples)
+    assert registry.semantic.wait(5)
+    key, data = registry.route("remind me what name I gave?")
+    assert key == "USER_NAME" and registry.last_route['tier'] == 'semantic'
@@ -0,0 +1,78 @@
+import lancedb
+import pyarrow as pa
+import pytest
+
+from storage.lancedb_storage import turn_schema
+from storage.migration import migrate_embeddings, read_active_table, target_table_name
+from storage.vector_profile import VectorProfile
+
+class Interrupted(Exception):
+    pass
+
+class FlakyModel:
+    """Encodes like the test embedder, but dies after `fail_after` batches (a killed run)"""
+
+    def __init__(self, embedder, fail_after=None):
+        self.embedder = embedder
+        self.fail_after = fail_after
+        self.batches = 0
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        if self.fail_after is not None and self.batches >= self.fail_after:
+            raise Interrupted()
+        self.batches += 1
+        self.encoded += len(texts)
+        return self.embedder.encode(texts)
+
+@pytest.fixture
+def seeded(config, embedder):
+    """20 turns in the default table, embedded with another model than the config's"""
+    profile = VectorProfile.from_config(config)
+    schema = turn_schema(profile)
+    rows = [
+        {'conversation_id': f"conv-{c}", 'title': f"conversation {c}", 'timestamp': 1000.0 + 10 * c + n,
+         'turn_number': n, 'user': f"question {c} {n}", 'assistant': f"answer {c} {n}"}
+        for c in range(4) for n in range(5)
+    ]
+    vectors = profile.apply(embedder.encode([f"user: {r['user']} | assistant: {r['assistant']}" for r in rows]))
+    data = pa.Table.from_pylist(rows, schema=pa.schema([f for f in schema if f.name != 'vector'])) \
+        .append_column(schema.field('vector'), profile.to_arrow(vectors))
+    lancedb.connect(config.storage_path).create_table(read_active_table(config.storage_path)['table'], data)
+    config.embedding_model = "stub/other-model"
+    return config
+
+def target_rows(config):
+    name = target_table_name(config.embedding_model, VectorProfile.from_config(config))
+    table = lancedb.connect(config.storage_path).open_table(name)
+    rows = table.search().select(['conversation_id', 'turn_number']).limit(1000).to_arrow().to_pylist()
+    return [(r['conversation_id'], r['turn_number']) for r in rows]
+
+def test_migration_switches_pointer(seeded, embedder):
+    model = FlakyModel(embedder)
+    migrate_embeddings(seeded, batch_size=4, model_loader=lambda: model)
+
+    active = read_active_table(seeded.storage_path)
+    assert active['table'] == target_table_name(seeded.embedding_model, VectorProfile.from_config(seeded))
+    assert active['migrated_from'] == 'conversations'
+    assert len(target_rows(seeded)) == 20
+
+def test_interrupted_migration_resumes_without_duplicates(seeded, embedder):
+    with pytest.raises(Interrupted):
+        migrate_embeddings(seeded, batch_size=4, model_loader=lambda: FlakyModel(embedder, fail_after=2))
+
+    assert read_active_table(seeded.storage_path)['table'] == 'conversations'  # not switched
+    assert len(target_rows(seeded)) == 8
+
+    resumed = FlakyModel(embedder)
+    migrate_embeddings(seeded, batch_size=4, model_loader=lambda: resumed)
+    assert resumed.encoded == 12  # only what the first run didn't copy
+    rows = target_rows(seeded)
+    assert len(rows) == len(set(rows)) == 20
+
+def test_rerun_after_switch_is_a_no_op(seeded, embedder, capsys):
+    migrate_embeddings(seeded, batch_size=4, model_loader=lambda: FlakyModel(embedder))
+    again = FlakyModel(embedder)
+    migrate_embeddings(seeded, batch_size=4, model_loader=lambda: again)
+    assert again.encoded == 0
+    assert "nothing to migrate" in capsys.readouterr().out
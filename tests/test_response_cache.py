@@ -0,0 +1,95 @@
+import time
+
+from core.response_cache import ResponseCache, CachedAI, context_keys, same_context
+from core.interfaces import AIInterface
+from core.integrations.memory_injector import MemoryRegistry
+from adapters.conversation_adapter import ConversationAdapter
+from retrieval.hybrid_rag import HybridRAG
+
+def turn(n, user, conv='c1'):
+    return {'conversation_id': conv, 'timestamp': 100.0 + n, 'turn_number': n, 'user': user, 'assistant': f"a{n}"}
+
+WINDOW = [turn(0, "hello there"), turn(1, "what gpu do I have")]
+FP = frozenset()
+
+def test_context_keys_ignore_order_and_earlier_asks():
+    base = context_keys("Tell me a joke", WINDOW)
+    assert context_keys("tell me a joke", list(reversed(WINDOW))) == base
+    assert context_keys("tell me  a joke", WINDOW + [turn(2, "tell me a joke")]) == base
+    assert context_keys("tell me a joke", [turn(0, "hello there", conv='c2'), WINDOW[1]]) != base
+
+def test_same_context_ignores_turns_newer_than_the_answer():
+    cached = context_keys("q", WINDOW)
+    created = 105.0
+    assert same_context(cached, context_keys("q", WINDOW + [turn(6, "later turn")]), created)
+    assert same_context(cached, context_keys("q", WINDOW[1:]), created)  # slid out of the window
+    assert not same_context(cached, context_keys("q", WINDOW + [turn(2, "older, unseen")]), created)
+
+def test_lookup_hits_only_for_same_fingerprint(embedder):
+    cache = ResponseCache(embedder.encode, threshold=0.95)
+    cache.store("what is lance", context_keys("q", WINDOW), "a vector db")
+    assert cache.lookup("what is lance", context_keys("q", WINDOW)) == "a vector db"
+    assert cache.lookup("what is lance", context_keys("q", WINDOW + [turn(2, "unseen")])) is None
+    assert cache.lookup("something else entirely", context_keys("q", WINDOW)) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+def test_ttl_expires_entries(embedder, monkeypatch):
+    cache = ResponseCache(embedder.encode, ttl=10)
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    cache.store("q", FP, "answer")
+    now[0] += 5
+    assert cache.lookup("q", FP) == "answer"
+    now[0] += 6
+    assert cache.lookup("q", FP) is None
+    assert cache.stats()['entries'] == 0
+
+def test_lru_evicts_least_recently_used(embedder):
+    cache = ResponseCache(embedder.encode, capacity=2)
+    cache.store("first question", FP, "1")
+    cache.store("second question", FP, "2")
+    assert cache.lookup("first question", FP) == "1"  # refresh
+    cache.store("third question", FP, "3")
+    assert cache.lookup("second question", FP) is None
+    assert cache.lookup("first question", FP) == "1"
+
+class FakeAI(AIInterface):
+    def __init__(self, stats):
+        self.calls = 0
+        self.stats = stats
+        self.last_stats = {}
+
+    def generate(self, user_input, context):
+        self.calls += 1
+        self.last_stats = dict(self.stats)
+        yield "fresh "
+        yield "answer"
+
+def test_cached_ai_reuses_complete_answers_until_context_changes(embedder):
+    ai = CachedAI(FakeAI({'eval_count': 2}), ResponseCache(embedder.encode))
+    assert "".join(ai.generate("what is lance", WINDOW)) == "fresh answer"
+    assert "".join(ai.generate("what is lance", WINDOW)) == "fresh answer"
+    assert ai.ai.calls == 1 and ai.last_stats == {'cache_hit': True}
+
+    list(ai.generate("what is lance", WINDOW + [turn(2, "new")]))
+    assert ai.ai.calls == 2
+
+def test_cached_ai_skips_cancelled_and_fact_answers(embedder):
+    for stats in ({'eval_count': 2, 'cancelled': True}, {}):
+        ai = CachedAI(FakeAI(stats), ResponseCache(embedder.encode))
+        list(ai.generate("q", WINDOW))
+        list(ai.generate("q", WINDOW))
+        assert ai.ai.calls == 2
+
+def test_repeated_question_hits_through_the_adapter(lancedb_storage, config, embedder, tmp_path):
+    (tmp_path / "memory.txt").write_text("")
+    (tmp_path / "system.txt").write_text("")
+    memory = MemoryRegistry(str(tmp_path / "memory.txt"), str(tmp_path / "system.txt"), check_interval=0)
+    ai = CachedAI(FakeAI({'eval_count': 2}), ResponseCache(embedder.encode))
+    adapter = ConversationAdapter(lancedb_storage(), HybridRAG(config), ai, memory=memory)
+
+    for question in ["what is lance", "and what about parquet", "what is lance"]:
+        "".join(adapter.chat(question))
+
+    assert ai.ai.calls == 2
+    assert ai.cache.stats()['hits'] == 1
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from core.integrations.memory_injector.router import Router, required_literal, is_question
+from benchmarks.router import SyntheticVessels, legacy_route, queries
+
+@pytest.mark.parametrize("pattern, literal", [
+    (r'\bmy name\b', "my name"),
+    (r'what.*i called', "i called"),
+    (r"what's my name", "what's my name"),
+    (r'how much vram', "how much vram"),
+    (r'gpu.*have', "have"),
+    (r'colou?r', "colo"),
+    (r'(a|b)c', None),
+    (r'[abc]d', None),
+    (r'\d+', None),
+])
+def test_required_literal(pattern, literal):
+    assert required_literal(pattern) == literal
+
+def test_is_question():
+    assert is_question("what is my name")
+    assert is_question("is it raining?")
+    assert not is_question("you know my name?")
+    assert not is_question("tell me a story")
+    assert not is_question("")
+
+def test_literal_index_matches_legacy_loop():
+    for count in (3, 40):
+        router = Router(SyntheticVessels(count), SyntheticVessels(count).patterns)
+        inputs = queries(count, 400, seed=count)
+        for text in inputs:
+            assert router.route(text) == legacy_route(router, text), text
+
+def test_default_patterns_match_legacy_loop():
+    class Facts:
+        vessels = {k: {'value': k} for k in ['USER_NAME', 'PROJECT', 'GPU', 'LOCATION']}
+        system_facts = {k: {'value': k} for k in ['AI_NAME', 'AI_MODEL', 'AI_PURPOSE', 'AI_STORAGE', 'AI_EMBEDDING']}
+
+    router = Router(Facts())
+    words = "what where who how which is my your name gpu vram project city model embedding store database " \
+            "building working called location purpose llm graphics video memory you do have am i".split()
+    rnd = random.Random(0)
+    for _ in range(2000):
+        text = " ".join(rnd.choices(words, k=rnd.randint(2, 8))) + rnd.choice(["", "?"])
+        assert router.route(text) == legacy_route(router, text), text
+
+def test_semantic_routing_calibration_runs_on_stub(embedder):
+    from benchmarks.semantic_routing import run, PARAPHRASES, NEAR_MISSES
+
+    first, second = run(embedder.encode), run(embedder.encode)
+    assert first == second  # deterministic, so CI can compare runs
+    assert first['paraphrases'] == sum(map(len, PARAPHRASES.values()))
+    assert first['near_misses'] == len(NEAR_MISSES)
+    assert len(first['grid']) == 40
@@ -0,0 +1,37 @@
+import sys
+import time
+
+import pytest
+
+from utils.startup import Startup
+
+def test_results_timings_and_failures():
+    startup = Startup()
+    startup.start("ok", lambda x: x * 2, 21)
+    startup.start("bad", lambda: 1 / 0)
+    assert startup.result("ok") == 42
+    with pytest.raises(ZeroDivisionError):
+        startup.result("bad")
+    summary = startup.summary()
+    assert "ok 0." in summary and "bad failed" in summary
+    startup.release()
+
+def test_init_output_is_held_until_released(capsys):
+    real = sys.stdout
+    startup = Startup()
+
+    def noisy(name, delay):
+        print(f"{name} starting")
+        time.sleep(delay)
+        print(f"{name} ready")
+
+    startup.start("fast", noisy, "fast", 0)
+    startup.start("slow", noisy, "slow", 0.2)
+    startup.result("fast")
+    print("selector frame")
+    assert startup.output("fast") == "fast starting\nfast ready\n"
+    assert startup.output("fast") == ""
+
+    assert startup.release("slow") == "slow starting\nslow ready\n"
+    assert sys.stdout is real
+    assert capsys.readouterr().out == "selector frame\n"
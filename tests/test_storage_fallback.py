@@ -0,0 +1,21 @@
+"""Startup storage choice - a LanceDB whose embedding model fails to load falls back to JSONL"""
+from main import init_storage, confirm_storage
+from storage.lancedb_storage import LanceDBStorage
+from storage.fallback_storage import JSONLStorage
+
+def broken_loader():
+    raise OSError("model download failed")
+
+def test_model_load_failure_falls_back_to_jsonl(config):
+    storage = init_storage(config, model_loader=broken_loader)
+    assert isinstance(storage, LanceDBStorage)
+
+    confirmed = confirm_storage(storage, config)
+    assert isinstance(confirmed, JSONLStorage)
+    confirmed.save_turn("hello", "hi", {})
+    assert confirmed.get_recent(1)[0]['user'] == "hello"
+
+def test_loaded_model_keeps_lancedb(config, embedder):
+    storage = init_storage(config, model_loader=lambda: embedder)
+    assert confirm_storage(storage, config) is storage
+    storage.close()
@@ -0,0 +1,32 @@
+from storage.turn_cache import TurnCache
+
+def test_cache_orders_and_strips_vectors():
+    cache = TurnCache()
+    cache.load('c1', [{'turn_number': 1, 'title': 't', 'vector': [0.1]}, {'turn_number': 0, 'title': 'first'}])
+    assert cache.holds('c1') and not cache.holds('c2') and not cache.holds(None)
+    assert [t['turn_number'] for t in cache.all()] == [0, 1]
+    assert all('vector' not in t for t in cache.all())
+    assert cache.title == 'first'
+    assert cache.next_turn_number == 2
+    assert cache.recent(1) == [{'turn_number': 1, 'title': 't'}]
+    assert cache.recent(0) == []
+
+def test_storage_serves_recent_turns_before_they_reach_disk(lancedb_storage):
+    storage = lancedb_storage()
+    storage.save_turn("hi", "hello", {})
+    storage.save_turn("again", "hello again", {})
+    assert [t['user'] for t in storage.get_recent(5)] == ["hi", "again"]
+
+def test_reload_continues_turn_numbering(lancedb_storage):
+    storage = lancedb_storage()
+    for n in range(3):
+        storage.save_turn(f"q{n}", f"a{n}", {})
+    conversation_id = storage.conversation_id
+    storage.close()
+
+    reopened = lancedb_storage()
+    reopened.load_conversation(conversation_id)
+    assert [t['turn_number'] for t in reopened.get_all_turns()] == [0, 1, 2]
+    reopened.save_turn("q3", "a3", {})
+    assert reopened.get_recent(1)[0]['turn_number'] == 3
+    assert reopened.get_recent(1)[0]['title'] == "q0"
@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+from core.errors import StorageError
+from storage.write_behind import WriteBehindQueue
+
+def test_flush_waits_for_every_item():
+    written = []
+    queue = WriteBehindQueue(written.extend, maxsize=8, batch_size=3)
+    for i in range(20):
+        queue.submit(i)
+    queue.flush()
+    assert written == list(range(20))
+    assert queue.pending() == 0
+    queue.close()
+
+def test_items_are_batched():
+    batches = []
+    gate = threading.Event()
+
+    def write(batch):
+        gate.wait(5)
+        batches.append(list(batch))
+
+    queue = WriteBehindQueue(write, maxsize=16, batch_size=4)
+    for i in range(9):
+        queue.submit(i)
+    gate.set()
+    queue.close()
+    assert [i for batch in batches for i in batch] == list(range(9))
+    assert all(len(batch) <= 4 for batch in batches)
+    assert len(batches) < 9
+
+def test_close_drains_then_writes_synchronously():
+    written = []
+    queue = WriteBehindQueue(written.extend)
+    queue.submit('queued')
+    queue.close()
+    assert written == ['queued']
+
+    queue.submit('after close')
+    assert written == ['queued', 'after close']
+    queue.close()  # idempotent
+
+def test_transient_failure_is_retried():
+    written = []
+    attempts = []
+
+    def write(batch):
+        attempts.append(list(batch))
+        if len(attempts) < 3:
+            raise IOError("busy")
+        written.extend(batch)
+
+    queue = WriteBehindQueue(write, retries=3, retry_delay=0)
+    queue.submit('turn')
+    queue.close()
+    assert written == ['turn'] and len(attempts) == 3
+    assert queue.take_lost() == ([], None)
+
+def test_persistent_failure_keeps_items_and_worker_survives(capsys):
+    written = []
+
+    def write(batch):
+        if 'bad' in batch:
+            raise IOError("disk full")
+        written.extend(batch)
+
+    queue = WriteBehindQueue(write, batch_size=1, retries=2, retry_delay=0)
+    queue.submit('bad')
+    queue.submit('good')
+    queue.close()
+    assert queue.failed == 1
+    assert written == ['good']
+    lost, error = queue.take_lost()
+    assert lost == ['bad'] and isinstance(error, IOError)
+    assert queue.take_lost()[0] == []
+    assert "Background save failed after 3 attempts" in capsys.readouterr().out
+
+def test_offer_never_blocks():
+    gate = threading.Event()
+    queue = WriteBehindQueue(lambda batch: gate.wait(5), maxsize=1, batch_size=1)
+    results = [queue.offer(i) for i in range(5)]
+    assert results[0] is True
+    assert False in results
+    gate.set()
+    queue.close()
+    assert queue.offer('late') is False
+
+def test_storage_reports_and_uncaches_turns_that_never_reached_disk(lancedb_storage, monkeypatch):
+    storage = lancedb_storage()
+    storage.writer.retry_delay = 0
+    storage.save_turn("kept", "ok", {})
+    storage.flush()
+
+    def broken_add(data):
+        raise IOError("disk full")
+
+    monkeypatch.setattr(storage.table, 'add', broken_add)
+    storage.save_turn("lost", "never written", {})
+    with pytest.raises(StorageError, match="1 turn"):
+        storage.flush()
+    assert [t['user'] for t in storage.get_recent(5)] == ["kept"]
+    assert storage.table.count_rows() == 1
+
+    monkeypatch.undo()
+    storage.save_turn("next", "ok", {})
+    storage.flush()
+    assert [t['user'] for t in storage.get_recent(5)] == ["kept", "next"]
+    assert storage.list_all_conversations()[0]['turn_count'] == 2
+
+def test_loss_surfaces_on_next_save(lancedb_storage, monkeypatch):
+    storage = lancedb_storage()
+    storage.writer.retry_delay = 0
+    monkeypatch.setattr(storage.table, 'add', lambda data: (_ for _ in ()).throw(IOError("disk full")))
+    storage.save_turn("lost", "never written", {})
+    storage.writer.flush()
+    monkeypatch.undo()
+    with pytest.raises(StorageError, match="not saved"):
+        storage.save_turn("after", "ok", {})
+    storage.flush()
+    assert [t['user'] for t in storage.get_recent(5)] == ["after"]
+    assert storage.list_all_conversations()[0]['turn_count'] == 1
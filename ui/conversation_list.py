@@ -2,12 +2,13 @@
 from typing import List, Dict, Any, Optional
 from ui.components import get_key, clear_screen
 
-def show_conversation_list(conversations: List[Dict[str, Any]]) -> Optional[str]:
+def show_conversation_list(conversations: List[Dict[str, Any]], footer: str = "") -> Optional[str]:
     """
     Show paginated conversation list
     
     Args:
         conversations: List of conversations (already sorted newest first)
+        footer: Optional status line shown under the controls
     
     Returns:
         None: User quit
@@ -72,6 +73,8 @@ def show_conversation_list(conversations: List[Dict[str, Any]]) -> Optional[str]
                 print(f"Page {current_page + 1}/{total_pages} | W/S navigate | N/P page | Enter select | Q quit")
             else:
                 print("W/S navigate | Enter select | Q quit")
+            if footer:
+                print(footer)
             
             key = get_key()
             
@@ -1,12 +1,17 @@
 """Conversation selection menu - startup UI component"""
+import time
 from typing import Optional
 from core.interfaces import StorageInterface
 from ui.conversation_list import show_conversation_list
 
-def show_conversation_selector(storage: StorageInterface) -> Optional[str]:
+def show_conversation_selector(storage: StorageInterface, started_at: Optional[float] = None) -> Optional[str]:
     """
     Show conversation selection menu
     
+    Args:
+        storage: Storage backend to list conversations from
+        started_at: time.perf_counter() at process start, to report startup time
+    
     Returns:
         None: User quit
         "new": Start new conversation
@@ -20,5 +25,10 @@ def show_conversation_selector(storage: StorageInterface) -> Optional[str]:
         print(f"⚠️  Error loading conversations: {e}")
         conversations = []
     
+    # Time to first selector frame
+    footer = ""
+    if started_at is not None:
+        footer = f"⏱️  Ready in {time.perf_counter() - started_at:.2f}s"
+    
     # Show paginated list
-    return show_conversation_list(conversations)
+    return show_conversation_list(conversations, footer=footer)
@@ -41,15 +41,36 @@ class TerminalUI:
                     self.show_history()
                     continue
 
+                if user_input.lower() in ['perf', 'perf all']:
+                    self.show_perf(all_history=user_input.lower() == 'perf all')
+                    continue
+
+                if user_input.lower() == 'stats':
+                    self.show_stats()
+                    continue
+
+                if user_input.lower() == 'facts':
+                    self.show_staged_facts()
+                    continue
+
+                if user_input.lower().startswith('accept ') and len(user_input.split()) == 2:
+                    self.accept_fact(user_input.split()[1])
+                    continue
+
                 if user_input.lower().startswith('search '):
                     query = user_input[7:].strip()
                     self.show_search_results(query)
                     continue
 
-                # Chat
+                # Chat (Ctrl-C while streaming cancels the reply, not the app)
                 print("\n🤖 ", end='', flush=True)
-                for chunk in self.adapter.chat(user_input):
-                    print(chunk, end='', flush=True)
+                stream = self.adapter.chat(user_input)
+                try:
+                    for chunk in stream:
+                        print(chunk, end='', flush=True)
+                except KeyboardInterrupt:
+                    stream.close()
+                    print("\n\n⏹️  Cancelled")
                 print()
 
             except KeyboardInterrupt:
@@ -64,7 +85,7 @@ class TerminalUI:
         title_display = self.conversation_title if self.conversation_title else "WINTER ASSISTANT"
         print(f"🚀 WINTER ASSISTANT - {title_display}")
         print("="*60)
-        print("\nCommands: history | search <query> | quit\n")
+        print("\nCommands: history | search <query> | facts | accept <KEY> | perf [all] | stats | quit\n")
 
     def show_history(self):
         """Display recent conversation history"""
@@ -97,3 +118,63 @@ class TerminalUI:
             print(f"   You: {r.get('user', '')[:60]}...")
             print(f"   AI: {r.get('assistant', '')[:80]}...")
             print()
+
+    def show_staged_facts(self):
+        """Display extracted facts waiting for review"""
+        staged = self.adapter.get_staged_facts()
+
+        if not staged:
+            print("\n🧠 No staged facts\n")
+            return
+
+        print("\n🧠 STAGED FACTS - 'accept <KEY>' adds one to memory.txt\n")
+        for key, value in staged.items():
+            print(f"   {key} = {value}")
+        print()
+
+    def accept_fact(self, key: str):
+        """Promote one staged fact into memory.txt"""
+        value = self.adapter.accept_fact(key)
+        if value is None:
+            print(f"\n⚠️  No staged fact named {key.upper()} (see 'facts')\n")
+        else:
+            print(f"\n✅ Remembered {key.upper()} = {value}\n")
+
+    def show_perf(self, all_history: bool = False):
+        """Display p50/p95/p99 turn timings"""
+        scope = "ALL HISTORY" if all_history else "THIS CONVERSATION"
+        stats = self.adapter.get_perf_stats(all_history)
+
+        if not stats or all(s['count'] == 0 for s in stats):
+            print(f"\n📊 No timing data yet ({scope.lower()})\n")
+            return
+
+        labels = {
+            'elapsed': 'total (s)',
+            'ttft': 'first token (s)',
+            'generation_time': 'generation (s)',
+            'tokens_per_sec': 'tokens/sec',
+        }
+        print(f"\n📊 PERF - {scope}\n")
+        print(f"{'metric':<18}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}")
+        for s in stats:
+            if s['count'] == 0:
+                continue
+            label = labels.get(s['metric'], s['metric'])
+            print(f"{label:<18}{s['count']:>6}{s['p50']:>10.2f}{s['p95']:>10.2f}{s['p99']:>10.2f}")
+        print()
+
+    def show_stats(self):
+        """Display per-stage latency histograms for this session"""
+        spans = self.adapter.get_span_stats()
+
+        if not spans:
+            print("\n⏱️  No stage timings yet (or instrumentation is off)\n")
+            return
+
+        print("\n⏱️  STAGE LATENCY - THIS SESSION (ms)\n")
+        print(f"{'stage':<20}{'n':>6}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+        for s in spans:
+            print(f"{s['span']:<20}{s['count']:>6}{s['mean'] * 1000:>10.1f}{s['p50'] * 1000:>10.1f}"
+                  f"{s['p95'] * 1000:>10.1f}{s['p99'] * 1000:>10.1f}{s['max'] * 1000:>10.1f}")
+        print()
@@ -0,0 +1,43 @@
+"""Percentile summaries of per-turn timing columns (Arrow compute, no row loops)"""
+from typing import Dict, Any, List
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+PERCENTILES = [0.5, 0.95, 0.99]
+
+# metric column -> only count rows where this column is > 0
+# (vessel answers never reach the LLM, so they have no TTFT/token stats)
+METRICS = {
+    'elapsed': 'elapsed',
+    'ttft': 'generation_time',
+    'generation_time': 'generation_time',
+    'tokens_per_sec': 'generation_time',
+}
+
+def summarize(table: pa.Table) -> List[Dict[str, Any]]:
+    """p50/p95/p99/mean per metric column"""
+    rows = []
+    for metric, gate in METRICS.items():
+        if metric not in table.column_names:
+            continue
+
+        column = table[metric]
+        if gate in table.column_names:
+            column = pc.filter(column, pc.greater(table[gate], 0))
+        column = pc.drop_null(column)
+
+        if len(column) == 0:
+            rows.append({'metric': metric, 'count': 0})
+            continue
+
+        p50, p95, p99 = pc.quantile(column, q=PERCENTILES).to_pylist()
+        rows.append({
+            'metric': metric,
+            'count': len(column),
+            'p50': p50,
+            'p95': p95,
+            'p99': p99,
+            'mean': pc.mean(column).as_py(),
+        })
+    return rows
@@ -0,0 +1,97 @@
+"""Span timers - per-stage latency histograms for the chat pipeline (in-process)"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+# Log-spaced bucket upper bounds in seconds: 0.1ms .. ~100s, 4 buckets per decade
+BOUNDS = [1e-4 * 10 ** (i / 4) for i in range(25)]
+
+class Histogram:
+    """Bucketed latency histogram with exact count/sum/min/max"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.buckets[bisect.bisect_left(BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th sample (clamped to the observed max)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(BOUNDS[i] if i < len(BOUNDS) else self.max, self.max)
+        return self.max
+
+class Spans:
+    """Named span timers; span() costs one flag check when disabled"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: Optional[float]) -> None:
+        if not self.enabled or seconds is None:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(seconds)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def span(self, name: str):
+        """with SPANS.span('rag.retrieve'): ..."""
+        return self._timed(name) if self.enabled else _NOOP
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms = {}
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """count / mean / p50 / p95 / p99 / max per span, in first-seen order"""
+        with self._lock:
+            items = list(self.histograms.items())
+        return [{
+            'span': name,
+            'count': h.count,
+            'mean': h.total / h.count if h.count else 0.0,
+            'p50': h.quantile(0.5),
+            'p95': h.quantile(0.95),
+            'p99': h.quantile(0.99),
+            'max': h.max,
+        } for name, h in items]
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _NoopSpan()
+
+# Process-wide instance shared by storage, retrieval, engine and adapter
+SPANS = Spans()
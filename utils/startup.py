@@ -0,0 +1,99 @@
+"""Startup orchestrator - initialize independent components concurrently, timing each"""
+import io
+import sys
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Callable, Dict, Any
+
+class _ThreadOutput:
+    """sys.stdout stand-in: prints from startup threads are buffered, everything else passes through"""
+
+    def __init__(self, real):
+        self.real = real
+        self.buffers: Dict[int, io.StringIO] = {}
+
+    def write(self, text: str) -> int:
+        buffer = self.buffers.get(threading.get_ident())
+        return (buffer or self.real).write(text)
+
+    def flush(self) -> None:
+        self.real.flush()
+
+    def __getattr__(self, name):
+        # isatty(), encoding etc. come from the real stream
+        return getattr(self.real, name)
+
+class Startup:
+    """Runs each component initializer on its own thread and records how long it took
+
+    Daemon threads rather than an executor: quitting at the selector must
+    not wait for e.g. a slow Ollama warm-up to finish.
+
+    Whatever an initializer prints is held back (it would otherwise land
+    in the middle of the conversation selector); output(name) and
+    release() hand it over for printing at a safe point.
+    """
+
+    def __init__(self):
+        self.futures: Dict[str, Future] = {}
+        self.timings: Dict[str, float] = {}
+        self.outputs: Dict[str, io.StringIO] = {}
+        self._stdout = None
+
+    def start(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> None:
+        future = Future()
+        self.futures[name] = future
+        buffer = self.outputs[name] = io.StringIO()
+        if self._stdout is None:
+            self._stdout = sys.stdout = _ThreadOutput(sys.stdout)
+        stdout = self._stdout
+
+        def run():
+            stdout.buffers[threading.get_ident()] = buffer
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+                self.timings[name] = time.perf_counter() - start
+                future.set_result(result)
+            except BaseException as e:
+                self.timings[name] = time.perf_counter() - start
+                future.set_exception(e)
+            finally:
+                stdout.buffers.pop(threading.get_ident(), None)
+
+        threading.Thread(target=run, daemon=True, name=f"startup-{name}").start()
+
+    def result(self, name: str) -> Any:
+        """Wait for one component (re-raises its exception)"""
+        return self.futures[name].result()
+
+    def output(self, name: str) -> str:
+        """What one component has printed so far (taken, so it is only shown once)"""
+        buffer = self.outputs[name]
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    def release(self, *names: str) -> str:
+        """Wait for `names`, stop buffering and return everything still held, in start order
+
+        Components still running after this print straight to stdout.
+        """
+        wait([self.futures[name] for name in names])
+        if self._stdout is not None and sys.stdout is self._stdout:
+            sys.stdout = self._stdout.real
+        return "".join(self.output(name) for name in self.outputs)
+
+    def summary(self) -> str:
+        """e.g. 'storage 1.20s | rag 0.00s | ai 0.31s | warmup …'"""
+        parts = []
+        for name, future in self.futures.items():
+            if not future.done():
+                parts.append(f"{name} …")
+            elif future.exception() is not None:
+                parts.append(f"{name} failed")
+            else:
+                parts.append(f"{name} {self.timings.get(name, 0.0):.2f}s")
+        return " | ".join(parts)